@@ -0,0 +1,119 @@
+"""
+Benchmark de las consultas analíticas de main.ipynb en la base de datos configurada (MySQL)
+y en los motores embebidos de src/db/analytics.py (DuckDB y SQLite).
+
+Carga data/*.csv (con sales.csv multiplicado por factor, ver benchmarks/synthetic.py) en cada motor
+embebido y ejecuta sobre todos los backends las mismas consultas: el producto más vendido por categoría
+(CTE + dense_rank), el porcentaje de facturación por categoría, sp_porcentaje_producto_total,
+la vista vw_resumen_ventas_producto y el top de tickets. Se informa el mejor tiempo de repeat
+ejecuciones, las filas devueltas y el tiempo de carga de cada motor. Si la base de datos configurada
+no está disponible, se mide solo sobre los motores embebidos.
+
+Uso:
+    python -m benchmarks.bench_backends --factor 20 --repeat 5
+    python -m benchmarks.bench_backends --snapshot snapshots --backends duckdb mysql
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from benchmarks.synthetic import write_synthetic_sales_csv
+from src.db.analytics import AnalyticsBackend
+from src.db.compat import parse_call
+from src.db.queries import REPORT_QUERIES
+
+QUERIES = {
+    "top_producto_categoria": REPORT_QUERIES["top_producto_categoria"],
+    "porcentaje_categoria": REPORT_QUERIES["porcentaje_categoria"],
+    "sp_porcentaje_producto_total": "CALL sp_porcentaje_producto_total(1)",
+    "vw_resumen_ventas_producto": "SELECT * FROM vw_resumen_ventas_producto",
+    "top_tickets": """
+        select * from vw_resumen_ventas_producto
+        order by TicketPromedio desc
+        limit 10;
+    """,
+}
+
+
+def _run_query(db, sql):
+    call = parse_call(sql)
+    if call is not None:
+        return db.call_procedure(*call)
+    return db.execute_query(sql)
+
+
+def _time(db, sql, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = _run_query(db, sql)
+        best = min(best, time.perf_counter() - start)
+    return best, len(df)
+
+
+def _prepare_data_dir(tmp, factor, data_dir="data"):
+    """
+    Copia las dimensiones de data_dir y genera un sales.csv factor veces más grande.
+    """
+    for name in os.listdir(data_dir):
+        if name.endswith(".csv") and name != "sales.csv":
+            shutil.copy(os.path.join(data_dir, name), tmp)
+    write_synthetic_sales_csv(os.path.join(tmp, "sales.csv"), factor=factor,
+                              source=os.path.join(data_dir, "sales.csv"))
+    return tmp
+
+
+def run(backends=("mysql", "duckdb", "sqlite"), factor=1, repeat=3, snapshot=None) -> pd.DataFrame:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        source = snapshot or _prepare_data_dir(tmp, factor)
+        for name in backends:
+            load_seconds = 0.0
+            if name == "mysql":
+                try:
+                    from src.db.database import DBConnection
+
+                    db = DBConnection()
+                    db.use_analytics_backend(None)
+                    db.execute_query("SELECT 1")
+                except RuntimeError as e:
+                    print(f"[omitido] mysql: {e}")
+                    continue
+            else:
+                start = time.perf_counter()
+                db = AnalyticsBackend.from_source(source, name)
+                load_seconds = time.perf_counter() - start
+
+            for query, sql in QUERIES.items():
+                try:
+                    seconds, rows = _time(db, sql, repeat)
+                    error = None
+                except RuntimeError as e:
+                    seconds, rows, error = None, None, str(e).splitlines()[0]
+                results.append({
+                    "backend": name,
+                    "query": query,
+                    "seconds": seconds,
+                    "rows": rows,
+                    "load_seconds": load_seconds,
+                    "error": error,
+                })
+            if name != "mysql":
+                db.close()
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de las consultas del notebook por backend.")
+    parser.add_argument("--backends", nargs="+", default=["mysql", "duckdb", "sqlite"])
+    parser.add_argument("--factor", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--snapshot", default=None, help="Snapshot de SnapshotStore en lugar de data/*.csv.")
+    args = parser.parse_args()
+    results = run(args.backends, args.factor, args.repeat, args.snapshot)
+    print(results.to_string(index=False))
+    print()
+    print(results.pivot(index="query", columns="backend", values="seconds").to_string())
@@ -0,0 +1,40 @@
+"""
+Benchmark del cargador masivo (src/db/loader.py) sobre la tabla sales.
+
+Carga data/sales.csv (~2.9 MB) y un CSV sintético factor veces más grande, informando filas/s.
+Las tablas de dimensiones deben estar cargadas previamente (las claves foráneas se desactivan
+durante la carga, pero los SalesID sintéticos se generan a partir de sales.csv).
+
+Uso:
+    python -m benchmarks.bench_loader --factor 100 --batch-size 10000
+"""
+
+import argparse
+import os
+import tempfile
+import pandas as pd
+from benchmarks.synthetic import write_synthetic_sales_csv
+from src.db.loader import BulkLoader
+
+
+def run(factor: int = 100, batch_size: int = 5000, chunk_size: int = 50000) -> pd.DataFrame:
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_synthetic_sales_csv(os.path.join(tmp, "sales.csv"), factor=factor)
+        for dataset, data_dir in [("sales.csv", "data"), (f"sales x{factor}", tmp)]:
+            loader = BulkLoader(data_dir=data_dir, batch_size=batch_size, chunk_size=chunk_size)
+            stats = loader.load_all(tables=["sales"], truncate=True).iloc[0].to_dict()
+            size_mb = os.path.getsize(os.path.join(data_dir, "sales.csv")) / 1e6
+            results.append({"dataset": dataset, "size_mb": size_mb, **stats})
+
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga masiva de sales.")
+    parser.add_argument("--factor", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+    print(run(args.factor, args.batch_size, args.chunk_size).to_string(index=False))
@@ -0,0 +1,69 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+def write_synthetic_sales_csv(dest: str, factor: int = 100, source: str = "data/sales.csv") -> str:
+    """
+    Genera un CSV de ventas sintético con el mismo formato que data/sales.csv y factor veces su tamaño.
+    Cada copia desplaza los SalesID para que sigan siendo únicos.
+
+    Args:
+        dest (str): Ruta del CSV a generar.
+        factor (int): Cantidad de copias de sales.csv. Por defecto 100.
+        source (str): CSV de ventas de origen. Por defecto "data/sales.csv".
+
+    Returns:
+        str: La ruta del archivo generado.
+    """
+    base = pd.read_csv(source, dtype=str, keep_default_na=False)
+    ids = base["SalesID"].astype("int64")
+    offset = int(ids.max())
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    for i in range(factor):
+        copy = base.copy()
+        copy["SalesID"] = (ids + i * offset).astype(str)
+        copy.to_csv(dest, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return dest
+
+
+def make_sales_frame(rows: int, seed: int = 0, employees: int = 23, customers: int = 98759, products: int = 452) -> pd.DataFrame:
+    """
+    Genera un DataFrame de ventas sintético con la forma de la consulta de ventas del notebook
+    (sales unida a products, customers y employees), con la misma cardinalidad que data/*.csv.
+
+    Args:
+        rows (int): Cantidad de ventas a generar.
+        seed (int): Semilla del generador aleatorio. Por defecto 0.
+
+    Returns:
+        pd.DataFrame: Columnas SalesID, ProductID, ProductName, Quantity, Discount, TotalPrice,
+        CustomerID, CustomerName, EmployeeID, EmployeeName, TransactionNumber.
+    """
+    rng = np.random.default_rng(seed)
+    employee_id = rng.integers(1, employees + 1, rows)
+    product_id = rng.integers(1, products + 1, rows)
+    customer_id = rng.integers(1, customers + 1, rows)
+    quantity = rng.integers(1, 26, rows)
+    discount = rng.choice([0.0, 0.1, 0.2], rows, p=[0.8, 0.1, 0.1])
+    unit_price = (product_id % 100) + 1.0
+    total_price = np.round(quantity * unit_price * (1 - discount), 2)
+
+    employee_names = np.array([f"Apellido{i}, Nombre{i} E." for i in range(employees + 1)], dtype=object)
+    product_names = np.array([f"Producto {i}" for i in range(products + 1)], dtype=object)
+
+    return pd.DataFrame(
+        {
+            "SalesID": np.arange(1, rows + 1),
+            "ProductID": product_id,
+            "ProductName": product_names[product_id],
+            "Quantity": quantity,
+            "Discount": discount,
+            "TotalPrice": total_price,
+            "CustomerID": customer_id,
+            "CustomerName": pd.Series(customer_id).map("Cliente {}".format).to_numpy(),
+            "EmployeeID": employee_id,
+            "EmployeeName": employee_names[employee_id],
+            "TransactionNumber": pd.Series(rng.integers(0, 2**62, rows)).map("{:020X}".format).to_numpy(),
+        }
+    )
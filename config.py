@@ -9,4 +9,37 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
\ No newline at end of file
+# DATABASE_URL / ASYNC_DATABASE_URL pueden definirse directamente en el .env
+# (por ejemplo sqlite:///ventas.db para pruebas locales o benchmarks)
+DATABASE_URL = os.getenv("DATABASE_URL") or (
+    f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Configuración del pool de conexiones (ver DBConnection.pool_status para las métricas)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# Perfilado de consultas (ver DBConnection.enable_profiling)
+DB_PROFILE = _env_bool("DB_PROFILE", False)
+DB_SLOW_QUERY_SECONDS = float(os.getenv("DB_SLOW_QUERY_SECONDS", "1.0"))
+
+# Motor analítico embebido (ver DBConnection.use_analytics_backend): "duckdb" o "sqlite".
+# DB_ANALYTICS_SOURCE es la carpeta de CSV o el snapshot desde el que se cargan las tablas.
+DB_ANALYTICS_BACKEND = os.getenv("DB_ANALYTICS_BACKEND") or None
+DB_ANALYTICS_SOURCE = os.getenv("DB_ANALYTICS_SOURCE", "data")
+
+# Escritura masiva con el ORM (ver src.db.writer.BulkWriter)
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "5000"))
+DB_WRITE_TRANSACTION_SIZE = int(os.getenv("DB_WRITE_TRANSACTION_SIZE", "50000"))
+DB_WRITE_MAX_RETRIES = int(os.getenv("DB_WRITE_MAX_RETRIES", "3"))
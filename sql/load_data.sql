@@ -76,11 +76,17 @@ CREATE TABLE IF NOT EXISTS sales (
     TotalPrice DECIMAL(10,2),
     SalesDate TIME,
     TransactionNumber VARCHAR(20),
+    -- SalesDate normalizada y su bucket (python -m src.db.loader --sales-base-date ...)
+    SalesTimestamp DATETIME,
+    SalesBucket DATETIME,
     FOREIGN KEY (SalesPersonID) REFERENCES employees(EmployeeID),
     FOREIGN KEY (CustomerID) REFERENCES customers(CustomerID),
     FOREIGN KEY (ProductID) REFERENCES products(ProductID)
 );
 
+-- Alternativa sin rutas absolutas: crear las tablas con este script y cargar los .csv con
+-- python -m src.db.loader --truncate
+
 -- activar la propiedad local infile para cargar archivos
 SET GLOBAL local_infile = 1;
 SHOW GLOBAL VARIABLES LIKE 'local_infile';
@@ -0,0 +1,393 @@
+import os
+import threading
+import time
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from src.db.cache import referenced_tables
+from src.db.compat import DIALECTS, VIEWS, call_procedure, parse_call, to_embedded_sql
+from src.db.dtypes import build_dataframe, model_dtypes, to_arrow_table
+from src.db.loader import LOAD_ORDER
+from src.db.snapshot import MANIFEST
+from src.utils.logger import logger
+
+# Tipo de columna de DuckDB para cada tipo lógico de src.db.dtypes (al leer los CSV).
+DUCKDB_TYPES = {
+    "int32": "INTEGER",
+    "int64": "BIGINT",
+    "float64": "DOUBLE",
+    "bool": "BOOLEAN",
+    "string": "VARCHAR",
+    "datetime": "TIMESTAMP",
+}
+
+# dtype de pandas para cada tipo lógico al leer los CSV para SQLite (las fechas quedan como texto).
+PANDAS_CSV_TYPES = {
+    "int32": "Int32",
+    "int64": "Int64",
+    "float64": "float64",
+    "bool": "boolean",
+    "string": "object",
+}
+
+
+class AnalyticsBackend:
+    """
+    Motor SQL embebido (DuckDB o SQLite, en el mismo proceso) para las consultas analíticas del proyecto:
+    las CTE y funciones de ventana de main.ipynb, la vista vw_resumen_ventas_producto y
+    sp_porcentaje_producto_total.
+
+    Las tablas se cargan desde data/*.csv (load_csv) o desde un snapshot de SnapshotStore (load_snapshot),
+    con los tipos de los modelos ORM. Tiene la misma interfaz de consulta que DBConnection
+    (execute_query, execute_query_chunks, execute_query_arrow, query_view y call_procedure), y
+    DBConnection puede derivarle esas consultas con use_analytics_backend. El SQL de MySQL se traduce
+    con src.db.compat.to_embedded_sql (concat, literales entre comillas dobles, backticks, JOIN sin ON)
+    y los stored procedures se resuelven con sus implementaciones en Python (src.db.compat.PROCEDURES).
+
+    DuckDB ejecuta las consultas de forma vectorizada y en varios hilos; SQLite sirve como alternativa
+    sin dependencias adicionales.
+
+    Args:
+        dialect (str): "duckdb" o "sqlite". Por defecto "duckdb".
+        path (str): Archivo de la base embebida, o ":memory:". Por defecto ":memory:".
+        threads (int, opcional): Hilos de DuckDB. Por defecto todos los núcleos.
+
+    Raises:
+        ValueError: Si dialect no es "duckdb" ni "sqlite".
+
+    Ejemplo:
+        >>> backend = AnalyticsBackend.from_csv("data")
+        >>> backend.call_procedure("sp_porcentaje_producto_total", [1])
+        >>> db = DBConnection()
+        >>> db.use_analytics_backend(backend)
+        >>> db.query_view("vw_resumen_ventas_producto")  # se resuelve en DuckDB
+    """
+
+    def __init__(self, dialect="duckdb", path=":memory:", threads=None):
+        if dialect not in DIALECTS:
+            raise ValueError(f"dialect debe ser uno de {DIALECTS}.")
+        self.dialect = dialect
+        self.path = path
+        self.views = {}
+        self._lock = threading.RLock()
+        if dialect == "duckdb":
+            import duckdb
+
+            self.connection = duckdb.connect(path)
+            if threads:
+                self.connection.execute(f"SET threads = {int(threads)}")
+            self.engine = None
+        else:
+            self.connection = None
+            self.engine = create_engine(
+                "sqlite://" if path == ":memory:" else f"sqlite:///{path}",
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False},
+            )
+
+    @classmethod
+    def from_csv(cls, data_dir="data", dialect="duckdb", **kwargs) -> "AnalyticsBackend":
+        """
+        Crea un motor embebido y carga las tablas de data_dir/*.csv.
+        """
+        backend = cls(dialect, **kwargs)
+        backend.load_csv(data_dir)
+        return backend
+
+    @classmethod
+    def from_snapshot(cls, root="snapshots", dialect="duckdb", **kwargs) -> "AnalyticsBackend":
+        """
+        Crea un motor embebido y carga las tablas de un snapshot de SnapshotStore.
+        """
+        backend = cls(dialect, **kwargs)
+        backend.load_snapshot(root)
+        return backend
+
+    @classmethod
+    def from_source(cls, source="data", dialect="duckdb", **kwargs) -> "AnalyticsBackend":
+        """
+        Crea un motor embebido desde un snapshot (si source contiene _snapshot.json) o desde una carpeta de CSV.
+        """
+        if os.path.exists(os.path.join(source, MANIFEST)):
+            return cls.from_snapshot(source, dialect, **kwargs)
+        return cls.from_csv(source, dialect, **kwargs)
+
+    def tables(self) -> list:
+        """
+        Devuelve las tablas y vistas cargadas en el motor.
+        """
+        if self.dialect == "duckdb":
+            sql = "SELECT table_name FROM information_schema.tables ORDER BY table_name"
+        else:
+            sql = "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') ORDER BY name"
+        return self.execute_query(sql).iloc[:, 0].tolist()
+
+    def load_csv(self, data_dir="data", tables: list = None) -> pd.DataFrame:
+        """
+        Carga (reemplazando) las tablas de data_dir/<tabla>.csv, en orden de dependencias.
+        Las columnas toman el tipo de los modelos ORM (DECIMAL como DOUBLE, enteros como INTEGER);
+        las que no están en los modelos se infieren. Luego crea las vistas de src.db.compat.VIEWS.
+
+        Returns:
+            pd.DataFrame: Una fila por tabla con "table", "rows", "seconds" y "rows_per_sec".
+        """
+        available = [f[: -len(".csv")] for f in os.listdir(data_dir) if f.endswith(".csv")]
+        stats = []
+        for table in _ordered(tables or available):
+            start = time.perf_counter()
+            path = os.path.join(data_dir, f"{table}.csv")
+            columns = pd.read_csv(path, nrows=0).columns
+            kinds = {c: k for c, k in model_dtypes().items() if c in columns}
+            with self._lock:
+                if self.dialect == "duckdb":
+                    types = ", ".join(
+                        f"{_literal(c)}: {_literal(DUCKDB_TYPES[k])}" for c, k in kinds.items()
+                    )
+                    self.connection.execute(
+                        f"CREATE OR REPLACE TABLE {_quote(table)} AS SELECT * FROM read_csv("
+                        f"{_literal(path)}, header = true, nullstr = '', types = {{{types}}})"
+                    )
+                else:
+                    dtype = {c: PANDAS_CSV_TYPES[k] for c, k in kinds.items() if k in PANDAS_CSV_TYPES}
+                    chunks = pd.read_csv(
+                        path, dtype=dtype, keep_default_na=False, na_values=[""], chunksize=100_000
+                    )
+                    self._write_frames(table, chunks)
+            stats.append(self._stats(table, start))
+        self._create_views()
+        return pd.DataFrame(stats, columns=["table", "rows", "seconds", "rows_per_sec"])
+
+    def load_snapshot(self, root="snapshots", tables: list = None, materialize: bool = True) -> pd.DataFrame:
+        """
+        Carga las tablas de un snapshot de SnapshotStore. En DuckDB, con materialize=False las tablas
+        quedan como vistas sobre los archivos Parquet (sin copiarlos a memoria).
+
+        Returns:
+            pd.DataFrame: Una fila por tabla con "table", "rows", "seconds" y "rows_per_sec".
+        """
+        import pyarrow.dataset as ds
+
+        available = [
+            name
+            for name in os.listdir(root)
+            if os.path.isdir(os.path.join(root, name)) and not name.startswith((".", "_"))
+        ]
+        stats = []
+        for table in _ordered(tables or available):
+            start = time.perf_counter()
+            directory = os.path.join(root, table)
+            with self._lock:
+                if self.dialect == "duckdb":
+                    kind = "TABLE" if materialize else "VIEW"
+                    files = _literal(os.path.join(directory, "**", "*.parquet"))
+                    self.connection.execute(
+                        f"CREATE OR REPLACE {kind} {_quote(table)} AS "
+                        f"SELECT * FROM read_parquet({files}, hive_partitioning = false, union_by_name = true)"
+                    )
+                else:
+                    dataset = ds.dataset(directory, format="parquet")
+                    self._write_frames(
+                        table, (batch.to_pandas() for batch in dataset.to_batches(batch_size=100_000))
+                    )
+            stats.append(self._stats(table, start))
+        self._create_views()
+        return pd.DataFrame(stats, columns=["table", "rows", "seconds", "rows_per_sec"])
+
+    def create_view(self, name: str, sql: str):
+        """
+        Crea (o reemplaza) una vista; sql puede estar escrito para MySQL.
+        """
+        sql = to_embedded_sql(sql, self.dialect)
+        with self._lock:
+            if self.dialect == "duckdb":
+                self.connection.execute(f"CREATE OR REPLACE VIEW {_quote(name)} AS {sql}")
+            else:
+                with self.engine.begin() as connection:
+                    connection.execute(text(f"DROP VIEW IF EXISTS {_quote(name)}"))
+                    connection.execute(text(f"CREATE VIEW {_quote(name)} AS {sql}"))
+            self.views[name.lower()] = sql
+        return self
+
+    def execute_query(
+        self, query: str, params: dict = None, typed: str = None
+    ) -> pd.DataFrame:
+        """
+        Ejecuta una consulta SQL (de MySQL, ver src.db.compat.to_embedded_sql) y devuelve un DataFrame,
+        como DBConnection.execute_query. Un CALL sp(...) se resuelve con call_procedure.
+
+        Raises:
+            RuntimeError: Si ocurre un error durante la ejecución de la consulta.
+        """
+        call = parse_call(query)
+        if call is not None:
+            return self.call_procedure(*call)
+        with self._lock:
+            try:
+                if self.dialect == "duckdb":
+                    cursor = self._execute(query, params)
+                    if typed == "arrow":
+                        return cursor.arrow().to_pandas(types_mapper=pd.ArrowDtype)
+                    return cursor.df()
+                with self.engine.connect() as connection:
+                    result = connection.execute(text(to_embedded_sql(query, "sqlite")), params)
+                    if typed is None:
+                        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+                    return build_dataframe(result.fetchall(), result.keys(), backend=typed)
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+    def execute_query_arrow(self, query: str, params: dict = None):
+        """
+        Ejecuta una consulta SQL y devuelve una tabla de pyarrow.
+        """
+        with self._lock:
+            try:
+                if self.dialect == "duckdb":
+                    return self._execute(query, params).arrow()
+                with self.engine.connect() as connection:
+                    result = connection.execute(text(to_embedded_sql(query, "sqlite")), params)
+                    return to_arrow_table(result.fetchall(), result.keys())
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+    def execute_query_chunks(
+        self,
+        query: str,
+        params: dict = None,
+        chunk_size: int = 10000,
+        typed: str = None,
+    ):
+        """
+        Ejecuta una consulta SQL y devuelve los resultados en bloques de DataFrames.
+
+        En DuckDB cada lectura usa su propio cursor: el lector de fetch_record_batch queda atado a la
+        conexión, y cualquier otra consulta sobre la conexión compartida lo cortaría sin error.
+        En SQLite la conexión es única (StaticPool), así que las filas se leen completas dentro del lock
+        y se entregan en bloques después de liberarlo, para no bloquear a otros hilos mientras se consumen.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser un entero positivo.")
+        if self.dialect == "duckdb":
+            with self._lock:
+                cursor = self.connection.cursor()
+            try:
+                try:
+                    batches = self._execute(query, params, cursor).fetch_record_batch(chunk_size)
+                except Exception as e:
+                    raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+                types_mapper = pd.ArrowDtype if typed == "arrow" else None
+                for batch in batches:
+                    yield batch.to_pandas(types_mapper=types_mapper)
+            finally:
+                cursor.close()
+            return
+
+        with self._lock:
+            try:
+                with self.engine.connect() as connection:
+                    result = connection.execute(text(to_embedded_sql(query, "sqlite")), params)
+                    columns = list(result.keys())
+                    rows = result.fetchall()
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+        for start in range(0, len(rows), chunk_size):
+            if typed is None:
+                yield pd.DataFrame(rows[start : start + chunk_size], columns=columns)
+            else:
+                yield build_dataframe(rows[start : start + chunk_size], columns, backend=typed)
+
+    def query_view(
+        self,
+        view_name: str,
+        where: str = None,
+        params: dict = None,
+        typed: str = None,
+    ) -> pd.DataFrame:
+        """
+        Hace un SELECT * desde una vista o tabla, opcionalmente filtrando.
+        """
+        sql = f"SELECT * FROM {view_name}"
+        if where:
+            sql += f" WHERE {where}"
+        return self.execute_query(sql, params, typed)
+
+    def call_procedure(self, name: str, args: list = None) -> pd.DataFrame:
+        """
+        Ejecuta la implementación en Python de un stored procedure de MySQL (ver src.db.compat.PROCEDURES).
+
+        Raises:
+            RuntimeError: Si el procedimiento no tiene implementación registrada o falla.
+        """
+        return call_procedure(self, name, args)
+
+    def execute_ddl(self, query: str):
+        """
+        Ejecuta una sentencia DDL (o DML) en el motor embebido.
+        """
+        sql = to_embedded_sql(query, self.dialect)
+        with self._lock:
+            try:
+                if self.dialect == "duckdb":
+                    self.connection.execute(sql)
+                else:
+                    with self.engine.begin() as connection:
+                        connection.execute(text(sql))
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar DDL: {e}")
+
+    def close(self):
+        """
+        Cierra el motor embebido.
+        """
+        if self.connection is not None:
+            self.connection.close()
+        if self.engine is not None:
+            self.engine.dispose()
+
+    def _execute(self, query, params, cursor=None):
+        """
+        Metodo privado que traduce y ejecuta la consulta en DuckDB (en la conexión compartida o en cursor).
+        Los parámetros :nombre se traducen a $nombre.
+        """
+        sql = to_embedded_sql(query, "duckdb", named_params=True)
+        return (cursor or self.connection).execute(sql, params or None)
+
+    def _write_frames(self, table, frames):
+        """
+        Metodo privado que reemplaza una tabla de SQLite con los DataFrames recibidos.
+        """
+        with self.engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {_quote(table)}"))
+            for frame in frames:
+                frame.to_sql(table, connection, if_exists="append", index=False)
+
+    def _create_views(self):
+        """
+        Metodo privado que crea las vistas de src.db.compat.VIEWS cuyas tablas están cargadas.
+        """
+        loaded = {t.lower() for t in self.tables()}
+        for name, sql in VIEWS.items():
+            if referenced_tables(sql) & set(LOAD_ORDER) <= loaded:
+                self.create_view(name, sql)
+
+    def _stats(self, table, start) -> dict:
+        rows = int(self.execute_query(f"SELECT COUNT(*) FROM {_quote(table)}").iloc[0, 0])
+        seconds = time.perf_counter() - start
+        rate = rows / seconds if seconds > 0 else float("inf")
+        logger.info(f"Motor {self.dialect}: {table} cargada, {rows} filas en {seconds:.2f}s ({rate:,.0f} filas/s)")
+        return {"table": table, "rows": rows, "seconds": seconds, "rows_per_sec": rate}
+
+
+def _ordered(tables) -> list:
+    """
+    Ordena las tablas según LOAD_ORDER (las desconocidas al final).
+    """
+    return [t for t in LOAD_ORDER if t in tables] + sorted(t for t in tables if t not in LOAD_ORDER)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
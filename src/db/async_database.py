@@ -0,0 +1,147 @@
+import asyncio
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from config import (
+    ASYNC_DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
+from src.utils.logger import logger
+
+
+class AsyncDBConnection:
+    """
+    Contraparte asíncrona de DBConnection, sobre el engine async de SQLAlchemy (aiomysql para MySQL).
+    Permite ejecutar varias consultas de reporte en forma concurrente sobre el pool de conexiones.
+
+    Implementa el patrón Singleton por URL: todas las instancias creadas con la misma URL comparten
+    el mismo engine. Por defecto usa ASYNC_DATABASE_URL de config.py; para pruebas locales puede
+    usarse SQLite (por ejemplo "sqlite+aiosqlite:///ventas.db").
+
+    Ejemplo:
+        >>> db = AsyncDBConnection()
+        >>> resultados = await db.gather_queries({
+        ...     "ventas": query_sales,
+        ...     "clientes": query_customer_location,
+        ... })
+        >>> resultados["ventas"].head()
+    """
+
+    _instances = {}
+
+    def __new__(cls, url: str = None):
+        url = url or ASYNC_DATABASE_URL
+        if url not in cls._instances:
+            instance = super().__new__(cls)
+            try:
+                pool_options = {}
+                if make_url(url).get_backend_name() == "mysql":
+                    pool_options = dict(
+                        pool_size=DB_POOL_SIZE,
+                        max_overflow=DB_MAX_OVERFLOW,
+                        pool_timeout=DB_POOL_TIMEOUT,
+                        pool_recycle=DB_POOL_RECYCLE,
+                        pool_pre_ping=DB_POOL_PRE_PING,
+                    )
+                instance.engine = create_async_engine(url, echo=False, **pool_options)
+            except Exception as e:
+                raise RuntimeError(f"Error al conectar a la base de datos: {str(e)}")
+            cls._instances[url] = instance
+        return cls._instances[url]
+
+    async def execute_query(self, query: str, params: dict = None) -> pd.DataFrame:
+        """
+        Ejecuta una consulta SQL de forma asíncrona y devuelve los resultados como DataFrame de pandas.
+
+        Args:
+            query (str): Consulta SQL a ejecutar.
+            params (dict, opcional): Diccionario de parámetros para la consulta SQL. Por defecto es None.
+
+        Returns:
+            pd.DataFrame: Un DataFrame con los resultados de la consulta.
+
+        Raises:
+            RuntimeError: Si ocurre un error durante la ejecución de la consulta.
+
+        Ejemplo:
+            >>> df = await db.execute_query("SELECT * FROM employees WHERE EmployeeID = :id", {"id": 1})
+        """
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.execute(text(query), params)
+                return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        except Exception as e:
+            raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+    async def query_view(
+        self, view_name: str, where: str = None, params: dict = None
+    ) -> pd.DataFrame:
+        """
+        Hace un SELECT * desde una vista (o tabla), opcionalmente filtrando.
+        """
+        sql = f"SELECT * FROM {view_name}"
+        if where:
+            sql += f" WHERE {where}"
+        return await self.execute_query(sql, params)
+
+    async def call_procedure(self, name: str, args: list = None) -> pd.DataFrame:
+        """
+        Ejecuta un stored procedure y devuelve el último result set como DataFrame.
+        """
+        try:
+            async with self.engine.connect() as connection:
+                raw = await connection.get_raw_connection()
+                cursor = await raw.driver_connection.cursor()
+                try:
+                    await cursor.callproc(name, args or [])
+                    rows, cols = [], []
+                    while True:
+                        if cursor.description:
+                            rows = await cursor.fetchall()
+                            cols = [column[0] for column in cursor.description]
+                        if not await cursor.nextset():
+                            break
+                    return pd.DataFrame(list(rows), columns=cols)
+                finally:
+                    await cursor.close()
+        except Exception as e:
+            raise RuntimeError(f"Error al ejecutar el stored procedure: {str(e)}")
+
+    async def gather_queries(self, queries, concurrency: int = None):
+        """
+        Ejecuta consultas independientes en forma concurrente y devuelve sus DataFrames.
+
+        Args:
+            queries (dict | list): Consultas a ejecutar. Cada valor puede ser un SQL (str)
+                o una tupla (sql, params). Si es un diccionario, el resultado usa las mismas claves.
+            concurrency (int, opcional): Máximo de consultas simultáneas. Por defecto DB_POOL_SIZE.
+
+        Returns:
+            dict | list: Los DataFrames en el mismo formato que queries.
+
+        Ejemplo:
+            >>> dfs = await db.gather_queries({"top": (query_top, {"n": 10}), "vista": "SELECT * FROM vw_resumen_ventas_producto"})
+        """
+        semaphore = asyncio.Semaphore(concurrency or DB_POOL_SIZE)
+
+        async def run(spec):
+            query, params = (spec, None) if isinstance(spec, str) else spec
+            async with semaphore:
+                return await self.execute_query(query, params)
+
+        if isinstance(queries, dict):
+            results = await asyncio.gather(*(run(spec) for spec in queries.values()))
+            return dict(zip(queries.keys(), results))
+        return list(await asyncio.gather(*(run(spec) for spec in queries)))
+
+    async def dispose(self):
+        """
+        Cierra todas las conexiones del pool.
+        """
+        logger.info("Cerrando conexiones asíncronas de la base de datos...")
+        await self.engine.dispose()
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+import pandas as pd
+from src.utils.logger import logger
+
+_TABLE_PATTERN = re.compile(
+    r"\b(?:from|join|into|update|table|view|on)\s+"
+    r"(?:if\s+(?:not\s+)?exists\s+)?`?(?:\w+`?\.`?)?(\w+)`?",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normaliza el texto de una consulta SQL para usarlo como clave de caché:
+    colapsa espacios y saltos de línea y elimina el punto y coma final.
+    """
+    return " ".join(query.split()).rstrip(";").strip()
+
+
+def referenced_tables(query: str) -> set:
+    """
+    Devuelve los nombres (en minúsculas) de las tablas o vistas referenciadas por una consulta o DDL.
+    La detección es por expresiones regulares y puede incluir nombres de más (alias o CTEs),
+    lo cual solo provoca invalidaciones conservadoras.
+    """
+    return {name.lower() for name in _TABLE_PATTERN.findall(query)}
+
+
+class QueryCache:
+    """
+    Caché de resultados de consultas con dos niveles y con invalidación por tabla.
+
+    - Nivel en memoria: LRU con un presupuesto máximo de bytes (según DataFrame.memory_usage).
+    - Nivel en disco (opcional): archivos Parquet en disk_dir que sobreviven a reinicios del kernel.
+
+    Cada entrada guarda las tablas que referencia la consulta y, si se provee version_provider,
+    la versión de cada tabla al momento de guardarla (por ejemplo, UPDATE_TIME de MySQL).
+    Una entrada deja de ser válida si vence su TTL, si cambia la versión de alguna de sus tablas
+    o si se invalidan explícitamente sus tablas (por ejemplo, al ejecutar un DDL).
+
+    Args:
+        max_bytes (int): Presupuesto del nivel en memoria. Por defecto 256 MB.
+        ttl (float, opcional): Segundos de validez de cada entrada. Por defecto None (sin vencimiento).
+        disk_dir (str, opcional): Directorio del nivel en disco. Por defecto None (sin nivel en disco).
+        version_provider (callable, opcional): Función que recibe un conjunto de tablas y devuelve
+            un diccionario {tabla: versión}.
+
+    Ejemplo:
+        >>> cache = QueryCache(max_bytes=64 * 1024**2, ttl=3600, disk_dir=".cache/queries")
+        >>> key = cache.make_key("SELECT * FROM sales")
+        >>> df = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024**2,
+        ttl: float = None,
+        disk_dir: str = None,
+        version_provider=None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.version_provider = version_provider
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(query: str, params=None, variant=None) -> str:
+        """
+        Genera la clave de caché a partir del SQL normalizado y de los parámetros.
+        variant distingue resultados de la misma consulta construidos de otra forma (por ejemplo, tipados).
+        """
+        key = [normalize_sql(query), params]
+        if variant is not None:
+            key.append(variant)
+        payload = json.dumps(key, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Devuelve una copia del DataFrame cacheado para la clave, o None si no existe o ya no es válido.
+        Busca primero en memoria y luego en disco; lo encontrado en disco se promueve a memoria,
+        salvo las entradas que superan max_bytes, que se siguen sirviendo desde disco.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self._store_in_memory(key, entry)
+
+        if entry is None or not self._is_valid(entry):
+            if entry is not None:
+                self._evict(key)
+            self.misses += 1
+            return None
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["df"].copy()
+
+    def put(self, key: str, df: pd.DataFrame, tables: set):
+        """
+        Guarda un resultado en la caché junto con las tablas que referencia.
+        """
+        tables = sorted(tables)
+        entry = {
+            "df": df.copy(),
+            "tables": tables,
+            "versions": self._versions(tables),
+            "created_at": time.time(),
+            "nbytes": int(df.memory_usage(deep=True).sum()),
+        }
+        self._evict(key)
+        self._store_in_memory(key, entry)
+        self._save_to_disk(key, entry)
+
+    def invalidate_tables(self, tables: set):
+        """
+        Elimina de ambos niveles todas las entradas que referencian alguna de las tablas indicadas.
+        """
+        tables = {table.lower() for table in tables}
+        keys = [k for k, e in self._entries.items() if tables & set(e["tables"])]
+        if self.disk_dir:
+            for filename in os.listdir(self.disk_dir):
+                if filename.endswith(".json"):
+                    meta = self._read_meta(filename[: -len(".json")])
+                    if meta and tables & set(meta["tables"]):
+                        keys.append(filename[: -len(".json")])
+        for key in set(keys):
+            self._evict(key)
+        if keys:
+            logger.info(f"Caché invalidada para {sorted(tables)}: {len(set(keys))} entradas.")
+
+    def clear(self):
+        """
+        Vacía ambos niveles de la caché.
+        """
+        keys = list(self._entries)
+        if self.disk_dir:
+            keys += [f[: -len(".json")] for f in os.listdir(self.disk_dir) if f.endswith(".json")]
+        for key in set(keys):
+            self._evict(key)
+
+    def _versions(self, tables):
+        """
+        Metodo privado que obtiene las versiones actuales de las tablas mediante version_provider.
+        """
+        if not self.version_provider or not tables:
+            return {}
+        versions = self.version_provider(set(tables))
+        return {table: str(version) for table, version in versions.items()}
+
+    def _is_valid(self, entry) -> bool:
+        """
+        Metodo privado que verifica el TTL y las versiones de las tablas de una entrada.
+        """
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            return False
+        if entry["versions"] or self.version_provider:
+            return self._versions(entry["tables"]) == entry["versions"]
+        return True
+
+    def _store_in_memory(self, key, entry):
+        """
+        Metodo privado que agrega una entrada al nivel en memoria respetando el presupuesto de bytes (LRU).
+        """
+        if entry["nbytes"] > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.current_bytes += entry["nbytes"]
+        while self.current_bytes > self.max_bytes:
+            _, oldest = self._entries.popitem(last=False)
+            self.current_bytes -= oldest["nbytes"]
+
+    def _evict(self, key):
+        """
+        Metodo privado que elimina una entrada de ambos niveles.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry["nbytes"]
+        if self.disk_dir:
+            for ext in (".parquet", ".json"):
+                path = os.path.join(self.disk_dir, key + ext)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _save_to_disk(self, key, entry):
+        """
+        Metodo privado que persiste una entrada como Parquet más un archivo JSON de metadatos.
+        """
+        if not self.disk_dir:
+            return
+        try:
+            entry["df"].to_parquet(os.path.join(self.disk_dir, key + ".parquet"))
+            meta = {k: entry[k] for k in ("tables", "versions", "created_at", "nbytes")}
+            with open(os.path.join(self.disk_dir, key + ".json"), "w") as f:
+                json.dump(meta, f)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar la consulta en la caché en disco: {str(e)}")
+
+    def _read_meta(self, key):
+        """
+        Metodo privado que lee los metadatos de una entrada en disco.
+        """
+        try:
+            with open(os.path.join(self.disk_dir, key + ".json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_from_disk(self, key):
+        """
+        Metodo privado que carga una entrada desde el nivel en disco, si existe.
+        """
+        if not self.disk_dir:
+            return None
+        meta = self._read_meta(key)
+        path = os.path.join(self.disk_dir, key + ".parquet")
+        if meta is None or not os.path.exists(path):
+            return None
+        try:
+            meta["df"] = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"No se pudo leer la consulta desde la caché en disco: {str(e)}")
+            return None
+        return meta
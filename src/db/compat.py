@@ -0,0 +1,232 @@
+import ast
+import re
+
+# Capa de compatibilidad entre el SQL de MySQL del proyecto (main.ipynb, README) y los motores
+# embebidos (DuckDB / SQLite) de src.db.analytics y src.db.snapshot.
+
+DIALECTS = ("duckdb", "sqlite")
+
+# Stored procedures de MySQL reimplementados en Python: {nombre: función(db, *args) -> DataFrame}.
+PROCEDURES = {}
+
+# Vistas de MySQL que se crean en los motores embebidos al cargar los datos.
+VIEWS = {
+    "vw_resumen_ventas_producto": """
+        select
+            p.ProductID,
+            p.ProductName,
+            c.CategoryName,
+            ROUND(AVG(s.TotalPrice / NULLIF(s.Quantity, 0)), 2) AS PrecioUnitarioPromedio,
+            SUM(s.Quantity) AS TotalUnidadesVendidas,
+            SUM(s.TotalPrice) AS TotalFacturado,
+            ROUND(SUM(s.TotalPrice) / NULLIF(SUM(s.Quantity), 0), 2) AS TicketPromedio
+        from sales s
+        join products p ON s.ProductID = p.ProductID
+        join categories c ON p.CategoryID = c.CategoryID
+        group by p.ProductID, p.ProductName, c.CategoryName
+    """,
+}
+
+_LITERAL = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`""")
+_PLACEHOLDER = re.compile(r"\x00(\d+)\x00")
+# Parámetros con nombre de SQLAlchemy (:nombre); no toma los casts de PostgreSQL/DuckDB (valor::tipo).
+_NAMED_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+_CONCAT = re.compile(r"\bconcat\s*\(", re.IGNORECASE)
+_CALL = re.compile(r"^\s*call\s+(\w+)\s*(?:\((.*)\))?\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+# JOIN sin ON/USING (en MySQL equivale a un CROSS JOIN; DuckDB exige la condición).
+_BARE_JOIN = re.compile(
+    r"(?<![\w])(?P<prefix>(?:inner\s+|cross\s+|natural\s+)?)join\s+(?P<table>\w+)(?:\s+(?:as\s+)?(?P<alias>\w+))?"
+    r"(?=\s*(?:$|;|\)|\b(?:where|group|order|having|limit|join|inner|left|right|cross|union)\b))",
+    re.IGNORECASE,
+)
+_KEYWORDS = {"on", "using", "where", "group", "order", "having", "limit", "join",
+             "inner", "left", "right", "cross", "union"}
+
+
+def procedure(name: str):
+    """
+    Decorador que registra una función de Python como reemplazo de un stored procedure de MySQL.
+    La función recibe la conexión (DBConnection, AnalyticsBackend o SnapshotReader) y los argumentos del CALL.
+
+    Ejemplo:
+        >>> @procedure("sp_ventas_empleado")
+        ... def sp_ventas_empleado(db, employee_id):
+        ...     return db.execute_query("SELECT ... WHERE SalesPersonID = :id", {"id": employee_id})
+    """
+
+    def register(fn):
+        PROCEDURES[name.lower()] = fn
+        return fn
+
+    return register
+
+
+def call_procedure(db, name: str, args: list = None):
+    """
+    Ejecuta la implementación en Python de un stored procedure registrado con @procedure.
+
+    Raises:
+        RuntimeError: Si el procedimiento no tiene implementación registrada o falla.
+    """
+    fn = PROCEDURES.get(name.lower())
+    if fn is None:
+        raise RuntimeError(f"El stored procedure {name} no tiene una implementación para este motor.")
+    return fn(db, *(args or []))
+
+
+def parse_call(sql: str):
+    """
+    Reconoce una sentencia CALL nombre(arg1, arg2, ...) con argumentos literales.
+
+    Returns:
+        tuple: (nombre, [argumentos]) o None si la sentencia no es un CALL.
+
+    Ejemplo:
+        >>> parse_call("CALL sp_porcentaje_producto_total(1);")
+        ('sp_porcentaje_producto_total', [1])
+    """
+    match = _CALL.match(sql)
+    if match is None:
+        return None
+    name, body = match.groups()
+    args = [] if not body or not body.strip() else list(ast.literal_eval(f"({body},)"))
+    return name, args
+
+
+def to_embedded_sql(sql: str, dialect: str = "duckdb", named_params: bool = False) -> str:
+    """
+    Traduce las construcciones propias de MySQL que usan las consultas del proyecto a SQL estándar
+    que entienden DuckDB y SQLite:
+        - literales entre comillas dobles ("Sin nombre") a comillas simples;
+        - identificadores entre backticks a comillas dobles;
+        - concat(a, b, ...) a (a || b || ...), que también devuelve NULL si algún argumento es NULL;
+        - JOIN sin condición a CROSS JOIN;
+        - el punto y coma final se elimina;
+        - con named_params=True, los parámetros :nombre a $nombre (la sintaxis de DuckDB).
+    Los literales de texto no se modifican: se enmascaran antes de traducir.
+    coalesce, ifnull, nullif, round y las funciones de ventana se escriben igual en los tres motores.
+
+    Args:
+        sql (str): Consulta escrita para MySQL.
+        dialect (str): "duckdb" o "sqlite". Por defecto "duckdb".
+        named_params (bool): Traducir los parámetros :nombre a $nombre. Por defecto False.
+
+    Returns:
+        str: La consulta traducida.
+
+    Raises:
+        ValueError: Si dialect no es "duckdb" ni "sqlite".
+
+    Ejemplo:
+        >>> to_embedded_sql('select coalesce(concat(LastName, ", ", FirstName), "Sin nombre") from customers;')
+        "select coalesce((LastName || ', ' || FirstName), 'Sin nombre') from customers"
+    """
+    if dialect not in DIALECTS:
+        raise ValueError(f"dialect debe ser uno de {DIALECTS}.")
+    literals = []
+
+    def mask(match):
+        literals.append(_convert_literal(match.group(0)))
+        return f"\x00{len(literals) - 1}\x00"
+
+    masked = _LITERAL.sub(mask, sql)
+    masked = _replace_concat(masked)
+    masked = _BARE_JOIN.sub(_cross_join, masked)
+    masked = masked.strip().rstrip(";").rstrip()
+    if named_params:
+        masked = _NAMED_PARAM.sub(r"$\1", masked)
+    return _PLACEHOLDER.sub(lambda m: literals[int(m.group(1))], masked)
+
+
+def _convert_literal(literal: str) -> str:
+    """
+    Convierte un literal de MySQL: "texto" -> 'texto' y `columna` -> "columna".
+    """
+    quote, body = literal[0], literal[1:-1]
+    if quote == "`":
+        return '"' + body.replace('"', '""') + '"'
+    if quote == '"':
+        body = body.replace('""', '"').replace('\\"', '"')
+        return "'" + body.replace("'", "''") + "'"
+    return literal
+
+
+def _replace_concat(sql: str) -> str:
+    """
+    Reemplaza cada concat(...) (incluso anidados) por la concatenación con ||.
+    """
+    match = _CONCAT.search(sql)
+    while match is not None:
+        start, depth = match.end(), 1
+        end = start
+        while depth and end < len(sql):
+            depth += {"(": 1, ")": -1}.get(sql[end], 0)
+            end += 1
+        if depth:
+            raise ValueError("Paréntesis sin cerrar en concat(...).")
+        args = [_replace_concat(arg).strip() for arg in _split_args(sql[start:end - 1])]
+        sql = sql[: match.start()] + "(" + " || ".join(args) + ")" + sql[end:]
+        match = _CONCAT.search(sql, match.start() + 1)
+    return sql
+
+
+def _split_args(body: str) -> list:
+    """
+    Separa los argumentos de una llamada por las comas de primer nivel.
+    """
+    args, depth, current = [], 0, []
+    for char in body:
+        if char == "," and depth == 0:
+            args.append("".join(current))
+            current = []
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current.append(char)
+    args.append("".join(current))
+    return args
+
+
+def _cross_join(match) -> str:
+    if match.group("prefix").strip() or (match.group("alias") or "").lower() in _KEYWORDS:
+        return match.group(0)
+    alias = f" {match.group('alias')}" if match.group("alias") else ""
+    return f"cross join {match.group('table')}{alias}"
+
+
+@procedure("sp_porcentaje_producto_total")
+def sp_porcentaje_producto_total(db, v_cat_id):
+    """
+    Implementación de sp_porcentaje_producto_total (ver main.ipynb): por cada producto de la categoría
+    v_cat_id, el total facturado y su porcentaje dentro de la categoría y del total general.
+    """
+    query = """
+        with ventas_todas_categorias as (
+            select
+                c.CategoryID, c.CategoryName, p.ProductID, p.ProductName, SUM(s.TotalPrice) AS TotalFacturado
+            from sales s
+            join products p ON s.ProductID = p.ProductID
+            join categories c ON p.CategoryID = c.CategoryID
+            group by c.CategoryID, c.CategoryName, p.ProductID, p.ProductName
+        ),
+        totales_por_categoria as (
+            select * from ventas_todas_categorias
+            where CategoryID = :v_cat_id
+        ),
+        totales_categoria as (
+            select CategoryID, SUM(TotalFacturado) as TotalCategoria
+            from totales_por_categoria
+            group by CategoryID
+        ),
+        total_general_ventas as (
+            select SUM(TotalFacturado) AS GranTotal from ventas_todas_categorias
+        )
+        select
+            v.CategoryID, v.CategoryName, v.ProductName, v.TotalFacturado, t.TotalCategoria, g.GranTotal,
+            ROUND(100 * v.TotalFacturado / t.TotalCategoria, 2) AS PorcentajeEnCategoria,
+            ROUND(100 * v.TotalFacturado / g.GranTotal, 2) AS PorcentajeEnTotal
+        from totales_por_categoria v
+        join totales_categoria t ON v.CategoryID = t.CategoryID
+        join total_general_ventas g
+        order by v.CategoryName, PorcentajeEnCategoria DESC
+    """
+    return db.execute_query(query, {"v_cat_id": v_cat_id})
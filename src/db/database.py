@@ -1,7 +1,25 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam
 from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL,
+    DB_ANALYTICS_BACKEND,
+    DB_ANALYTICS_SOURCE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PROFILE,
+    DB_SLOW_QUERY_SECONDS,
+)
+import time
+from contextlib import nullcontext
+from typing import Iterator
 import pandas as pd
+from src.db.cache import QueryCache, referenced_tables
+from src.db.dtypes import build_dataframe, to_arrow_table
+from src.db.pool_metrics import InstrumentedQueuePool
+from src.db.profiler import QueryProfiler
 from src.utils.logger import logger
 
 Base = declarative_base()
@@ -13,22 +31,80 @@ class DBConnection:
     Esta clase implementa el patrón Singleton para asegurar que solo haya una instancia de conexión a la base de datos.
     Permite ejecutar consultas SQL y obtener resultados en forma de DataFrame de pandas.
 
+    El pool de conexiones se configura desde config.py (variables de entorno DB_POOL_*)
+    y sus métricas se consultan con pool_status.
+    Opcionalmente puede cachear los resultados de execute_query, query_view y call_procedure
+    (ver enable_cache), perfilar las consultas (ver enable_profiling), derivar las consultas
+    analíticas a un motor embebido (ver use_analytics_backend), detectar consultas N+1 del ORM
+    (ver enable_lazy_load_detection) y mantener las dimensiones en memoria (ver enable_dimension_cache).
     """
 
     _instance = None
+    analytics = None
+    lazy_loads = None
+    dimensions = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
             try:
-                cls._instance.engine = create_engine(DATABASE_URL, echo=False)
-                cls._instance.Session = scoped_session(
-                    sessionmaker(bind=cls._instance.engine)
+                instance = cls.from_engine(
+                    create_engine(
+                        DATABASE_URL,
+                        echo=False,
+                        poolclass=InstrumentedQueuePool,
+                        pool_size=DB_POOL_SIZE,
+                        max_overflow=DB_MAX_OVERFLOW,
+                        pool_timeout=DB_POOL_TIMEOUT,
+                        pool_recycle=DB_POOL_RECYCLE,
+                        pool_pre_ping=DB_POOL_PRE_PING,
+                    )
                 )
+                if DB_PROFILE:
+                    instance.enable_profiling()
+                if DB_ANALYTICS_BACKEND:
+                    from src.db.analytics import AnalyticsBackend
+
+                    instance.use_analytics_backend(
+                        AnalyticsBackend.from_source(DB_ANALYTICS_SOURCE, DB_ANALYTICS_BACKEND)
+                    )
             except Exception as e:
                 raise RuntimeError(f"Error al conectar a la base de datos: {str(e)}")
+            cls._instance = instance
         return cls._instance
 
+    @classmethod
+    def from_engine(cls, engine) -> "DBConnection":
+        """
+        Crea una conexión sobre un engine dado, sin pasar por el Singleton ni por la configuración de config.py.
+        Útil para tests y scripts que trabajan sobre otra base (por ejemplo, un SQLite temporal).
+
+        Args:
+            engine (Engine): Engine de SQLAlchemy. Puede ser None si las consultas se derivan
+                a un motor analítico (ver use_analytics_backend).
+
+        Ejemplo:
+            >>> db = DBConnection.from_engine(create_engine("sqlite:///ventas.db"))
+        """
+        instance = super().__new__(cls)
+        instance.engine = engine
+        instance.Session = scoped_session(sessionmaker(bind=engine))
+        instance.cache = None
+        instance.materialized = None
+        instance.profiler = None
+        instance.stream_engine = None
+        return instance
+
+    def pool_status(self) -> dict:
+        """
+        Devuelve el estado del pool de conexiones y sus métricas acumuladas: conexiones en uso,
+        conexiones creadas, tiempo de espera para obtener una conexión, overflow y timeouts.
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> db.pool_status()["checked_out"]
+        """
+        return self.engine.pool.snapshot()
+
     def get_session(self):
         """
         Obtiene una nueva sesión de la base de datos utilizando SQLAlchemy.
@@ -72,7 +148,9 @@ class DBConnection:
         except Exception as e:
             logger.error(f"Error al cerrar la sesión: {str(e)}")
 
-    def execute_query(self, query: str, params: dict = None) -> pd.DataFrame:
+    def execute_query(
+        self, query: str, params: dict = None, typed: str = None
+    ) -> pd.DataFrame:
         """
         Ejecuta una consulta SQL sobre la base de datos y devuelve los resultados como un DataFrame de pandas.
         Esta función permite ejecutar consultas SQL parametrizadas, lo que ayuda a prevenir inyecciones SQL.
@@ -80,6 +158,9 @@ class DBConnection:
         Args:
             query (str): Consulta SQL a ejecutar.
             params (dict, opcional): Diccionario de parámetros para la consulta SQL. Por defecto es None.
+            typed (str, opcional): "numpy" o "arrow" para construir columnas con tipos nativos según
+                los modelos ORM (ver src.db.dtypes.build_dataframe): DECIMAL como float64, enteros como int32,
+                texto repetido como categorical. Por defecto None (tipos que infiere pandas, DECIMAL como object).
 
         Returns:
             pd.DataFrame: Un DataFrame de pandas que contiene los resultados de la consulta, con los nombres de las columnas correspondientes.
@@ -90,17 +171,136 @@ class DBConnection:
         Ejemplo:
             >>> db = DBConnection()
             >>> df = db.execute_query("SELECT * FROM employees WHERE id = :id", {"id": 1})
+            >>> df = db.execute_query("SELECT * FROM sales", typed="numpy")
         """
+        if self.analytics is not None:
+            return self.analytics.execute_query(query, params, typed)
+        if self.cache is not None:
+            key = self.cache.make_key(query, params, variant=typed)
+            cached = self.cache.get(key)
+            if cached is not None:
+                if self.profiler is not None:
+                    self.profiler.discard()
+                return cached
+
+        with self._profile("execute_query", query, params):
+            try:
+                with self.engine.connect() as connection:
+                    result = connection.execute(text(query), params)
+                    df = self._to_dataframe(result.fetchall(), result.keys(), typed)
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+        if self.cache is not None:
+            self.cache.put(key, df, referenced_tables(query))
+        return df
+
+    def execute_query_chunks(
+        self,
+        query: str,
+        params: dict = None,
+        chunk_size: int = 10000,
+        typed: str = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Ejecuta una consulta SQL y devuelve los resultados en bloques (chunks) de DataFrames de pandas.
+        A diferencia de execute_query, no carga todo el resultado en memoria: utiliza un cursor
+        del lado del servidor (stream_results / yield_per) y construye un DataFrame por cada bloque
+        de filas, lo que permite procesar tablas de millones de filas con memoria acotada.
+        Con MySQL la consulta se ejecuta con PyMySQL (SSCursor), porque mysqlconnector no soporta
+        cursores del lado del servidor (ver _stream_engine).
+
+        Args:
+            query (str): Consulta SQL a ejecutar.
+            params (dict, opcional): Diccionario de parámetros para la consulta SQL. Por defecto es None.
+            chunk_size (int, opcional): Cantidad máxima de filas por bloque. Por defecto es 10000.
+            typed (str, opcional): "numpy" o "arrow" para construir cada bloque con tipos nativos
+                (ver execute_query). Por defecto None.
+
+        Yields:
+            pd.DataFrame: Un DataFrame por cada bloque de filas, con los nombres de las columnas correspondientes.
+
+        Raises:
+            ValueError: Si chunk_size no es un entero positivo.
+            RuntimeError: Si ocurre un error durante la ejecución de la consulta o la conexión a la base de datos.
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> for chunk in db.execute_query_chunks("SELECT * FROM sales", chunk_size=50000):
+            ...     procesar(chunk)
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser un entero positivo.")
+        if self.analytics is not None:
+            yield from self.analytics.execute_query_chunks(query, params, chunk_size, typed)
+            return
         try:
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query), params)
-                return pd.DataFrame(result.fetchall(), columns=result.keys())
+            with self._stream_engine().connect() as connection:
+                result = connection.execution_options(
+                    stream_results=True, yield_per=chunk_size
+                ).execute(text(query), params)
+                columns = list(result.keys())
+                for rows in result.partitions(chunk_size):
+                    if typed is None:
+                        yield pd.DataFrame(rows, columns=columns)
+                    else:
+                        yield build_dataframe(rows, columns, backend=typed)
         except Exception as e:
             raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
 
+    def _stream_engine(self):
+        """
+        Metodo privado que devuelve el engine con el que execute_query_chunks lee en bloques.
+
+        Si el driver no soporta cursores del lado del servidor, SQLAlchemy ignora stream_results y el
+        resultado completo queda en memoria del cliente. Es el caso de mysqlconnector (el driver de
+        DATABASE_URL por defecto): para MySQL se crea una sola vez un engine con PyMySQL sobre la misma URL,
+        que sí los soporta (SSCursor). Con otros motores sin soporte se advierte en el log.
+        SQLite no lo necesita: su cursor ya recorre el resultado a medida que se lee.
+        """
+        if self.engine.dialect.supports_server_side_cursors or self.engine.dialect.name == "sqlite":
+            return self.engine
+        if self.stream_engine is None:
+            if self.engine.dialect.name == "mysql":
+                self.stream_engine = create_engine(
+                    self.engine.url.set(drivername="mysql+pymysql"),
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_timeout=DB_POOL_TIMEOUT,
+                    pool_recycle=DB_POOL_RECYCLE,
+                    pool_pre_ping=DB_POOL_PRE_PING,
+                )
+            else:
+                logger.warning(
+                    f"El driver {self.engine.dialect.driver} no soporta cursores del lado del servidor: "
+                    "execute_query_chunks devuelve bloques, pero el resultado se carga completo en el cliente."
+                )
+                self.stream_engine = self.engine
+        return self.stream_engine
+
     def call_procedure(self, name: str, args: list = None) -> pd.DataFrame:
         """
         Ejecuta un stored procedure y devuelve el último result set como DataFrame.
+        Con un motor analítico embebido, se ejecuta su implementación en Python (ver src.db.compat.PROCEDURES).
+        """
+        if self.analytics is not None:
+            return self.analytics.call_procedure(name, args)
+        if self.cache is not None:
+            key = self.cache.make_key(f"CALL {name}", args)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with self._profile("call_procedure", f"CALL {name}", args):
+            df = self._call_procedure(name, args)
+
+        if self.cache is not None:
+            self.cache.put(key, df, self._procedure_tables(name))
+        return df
+
+    def _call_procedure(self, name: str, args: list = None) -> pd.DataFrame:
+        """
+        Metodo privado que ejecuta el stored procedure sin pasar por la caché.
         """
         raw = self.engine.raw_connection()
         try:
@@ -110,26 +310,309 @@ class DBConnection:
             for rs in cursor.stored_results():
                 rows = rs.fetchall()
                 cols = rs.column_names
-            return pd.DataFrame(rows, columns=cols)
+            return self._to_dataframe(rows, cols)
         finally:
             cursor.close()
             raw.close()
 
     def query_view(
-        self, view_name: str, where: str = None, params: dict = None
+        self,
+        view_name: str,
+        where: str = None,
+        params: dict = None,
+        typed: str = None,
     ) -> pd.DataFrame:
         """
         Hace un SELECT * desde una vista (o tabla), opcionalmente filtrando.
+        Si hay resúmenes materializados registrados (MaterializedSummaries.attach) y la vista
+        tiene uno al día, se sirve desde la tabla materializada.
         """
+        if self.analytics is not None:
+            return self.analytics.query_view(view_name, where, params, typed)
         sql = f"SELECT * FROM {view_name}"
+        if self.materialized is not None:
+            serving = self.materialized.serving_query(view_name)
+            if serving is not None:
+                sql = f"SELECT * FROM ({serving}) mv"
         if where:
             sql += f" WHERE {where}"
         # Usa execute_query para todo el trabajo
-        return self.execute_query(sql, params)
+        with self._profile("query_view", sql, params):
+            return self.execute_query(sql, params, typed)
 
-    def execute_ddl(self, query: str):
+    def execute_query_arrow(self, query: str, params: dict = None):
+        """
+        Ejecuta una consulta SQL y devuelve el resultado como una tabla de pyarrow, con los tipos
+        de los modelos ORM (ver src.db.dtypes). Útil para escribir Parquet o compartir el resultado
+        entre procesos sin pasar por objetos de Python.
+
+        Raises:
+            RuntimeError: Si ocurre un error durante la ejecución de la consulta o la conexión a la base de datos.
+
+        Ejemplo:
+            >>> table = DBConnection().execute_query_arrow("SELECT * FROM sales")
+            >>> table.schema.field("TotalPrice").type
+            DataType(double)
+        """
+        if self.analytics is not None:
+            return self.analytics.execute_query_arrow(query, params)
         try:
             with self.engine.connect() as connection:
-                connection.execute(text(query))
+                result = connection.execute(text(query), params)
+                return to_arrow_table(result.fetchall(), result.keys())
         except Exception as e:
-            raise RuntimeError(f"Error al ejecutar DDL: {e}")
+            raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+    def use_analytics_backend(self, backend):
+        """
+        Deriva las consultas de execute_query, execute_query_chunks, execute_query_arrow, query_view y
+        call_procedure a un motor analítico embebido (AnalyticsBackend o SnapshotReader), que ejecuta
+        el mismo SQL de MySQL localmente. Las sesiones ORM y execute_ddl siguen usando la base de datos.
+        También puede activarse al crear la conexión con DB_ANALYTICS_BACKEND=duckdb en el .env.
+
+        Args:
+            backend: El motor embebido, o None para volver a consultar la base de datos.
+
+        Returns:
+            El motor recibido.
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> db.use_analytics_backend(AnalyticsBackend.from_csv("data"))
+            >>> db.call_procedure("sp_porcentaje_producto_total", [1])  # en DuckDB
+            >>> db.use_analytics_backend(None)  # de nuevo en MySQL
+        """
+        self.analytics = backend
+        return backend
+
+    def execute_ddl(self, query: str):
+        with self._profile("execute_ddl", query):
+            try:
+                with self.engine.connect() as connection:
+                    connection.execute(text(query))
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar DDL: {e}")
+
+        if self.cache is not None:
+            self.cache.invalidate_tables(referenced_tables(query))
+
+    def enable_cache(
+        self,
+        max_bytes: int = 256 * 1024**2,
+        ttl: float = None,
+        disk_dir: str = None,
+        check_update_time: bool = True,
+    ):
+        """
+        Activa la caché de resultados para execute_query, query_view y call_procedure.
+
+        Las entradas se identifican por el SQL normalizado y sus parámetros. Se invalidan al vencer el TTL,
+        al ejecutar un DDL sobre alguna de sus tablas con execute_ddl o, si check_update_time es True,
+        cuando cambia el UPDATE_TIME de alguna de sus tablas en MySQL.
+
+        Args:
+            max_bytes (int): Presupuesto en bytes del nivel en memoria. Por defecto 256 MB.
+            ttl (float, opcional): Segundos de validez de cada entrada. Por defecto None (sin vencimiento).
+            disk_dir (str, opcional): Directorio para el nivel en disco (Parquet). Por defecto None.
+            check_update_time (bool): Verificar el UPDATE_TIME de las tablas en cada acceso. Por defecto True.
+
+        Returns:
+            QueryCache: La caché creada.
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> db.enable_cache(ttl=3600, disk_dir=".cache/queries")
+            >>> df = db.query_view("vw_resumen_ventas_producto")  # va a MySQL
+            >>> df = db.query_view("vw_resumen_ventas_producto")  # sale de la caché
+        """
+        self.cache = QueryCache(
+            max_bytes=max_bytes,
+            ttl=ttl,
+            disk_dir=disk_dir,
+            version_provider=self._table_versions if check_update_time else None,
+        )
+        return self.cache
+
+    def disable_cache(self):
+        """
+        Desactiva la caché de resultados. Los archivos en disco se conservan.
+        """
+        self.cache = None
+
+    def enable_profiling(
+        self,
+        slow_threshold: float = DB_SLOW_QUERY_SECONDS,
+        explain: bool = True,
+        max_records: int = 10000,
+    ):
+        """
+        Activa el perfilado de las consultas de execute_query, query_view, call_procedure y execute_ddl.
+
+        Por cada consulta se registra su huella (SQL sin literales), la duración total y en el cursor,
+        las filas y bytes devueltos y el tiempo de construcción del DataFrame. Las consultas que tardan
+        slow_threshold segundos o más se informan en el log junto con su EXPLAIN.
+        También puede activarse al crear la conexión con DB_PROFILE=true en el .env.
+
+        Args:
+            slow_threshold (float, opcional): Umbral de consulta lenta en segundos. Por defecto
+                DB_SLOW_QUERY_SECONDS (1.0). None desactiva la detección.
+            explain (bool): Capturar el EXPLAIN de las consultas lentas. Por defecto True.
+            max_records (int): Cantidad máxima de consultas conservadas. Por defecto 10000.
+
+        Returns:
+            QueryProfiler: El perfilador creado.
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> db.enable_profiling(slow_threshold=0.5)
+            >>> df = db.query_view("vw_resumen_ventas_producto")
+            >>> db.profiler.stats()[["fingerprint", "count", "p50", "p95", "p99"]]
+            >>> db.profiler.dump("query_stats.json")
+        """
+        self.disable_profiling()
+        self.profiler = QueryProfiler(
+            self.engine,
+            slow_threshold=slow_threshold,
+            explain=explain,
+            max_records=max_records,
+        )
+        return self.profiler
+
+    def disable_profiling(self):
+        """
+        Desactiva el perfilado de consultas.
+        """
+        if self.profiler is not None:
+            self.profiler.detach()
+            self.profiler = None
+
+    def enable_lazy_load_detection(self, threshold: int = 10):
+        """
+        Activa la detección de consultas N+1 en las sesiones de get_session: se registra una advertencia
+        cuando una sesión carga una misma relación de a un objeto (lazy load) más de threshold veces.
+
+        Args:
+            threshold (int): Cargas perezosas por relación y sesión antes de advertir. Por defecto 10.
+
+        Returns:
+            LazyLoadDetector: El detector creado (ver LazyLoadDetector.report).
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> db.enable_lazy_load_detection(threshold=5)
+            >>> session = db.get_session()
+            >>> [c.city.CityName for c in session.query(Customer).limit(100)]  # advierte Customer.city
+            >>> db.lazy_loads.report()
+        """
+        from src.db.loading import LazyLoadDetector
+
+        self.disable_lazy_load_detection()
+        self.lazy_loads = LazyLoadDetector(self.Session, threshold=threshold)
+        return self.lazy_loads
+
+    def disable_lazy_load_detection(self):
+        """
+        Desactiva la detección de consultas N+1.
+        """
+        if self.lazy_loads is not None:
+            self.lazy_loads.detach()
+            self.lazy_loads = None
+
+    def enable_dimension_cache(self, data_dir: str = None, check_interval: float = 60.0):
+        """
+        Activa la caché en memoria de las dimensiones (productos, categorías, empleados, clientes,
+        ciudades y países) para agregar nombres a las consultas de hechos sin JOIN (ver DimensionCache.enrich).
+        En MySQL la versión de cada dimensión es su UPDATE_TIME.
+
+        Args:
+            data_dir (str, opcional): Leer las dimensiones de <data_dir>/<tabla>.csv en lugar de la base de datos.
+            check_interval (float): Segundos entre verificaciones de versión. Por defecto 60.
+
+        Returns:
+            DimensionCache: La caché creada.
+
+        Ejemplo:
+            >>> db = DBConnection()
+            >>> db.enable_dimension_cache()
+            >>> df = db.dimensions.enrich(db.execute_query(FACT_QUERY))
+        """
+        from src.db.dimensions import DimensionCache
+
+        self.dimensions = DimensionCache(
+            engine=self.engine,
+            data_dir=data_dir,
+            version_provider=self._table_versions,
+            check_interval=check_interval,
+        )
+        return self.dimensions
+
+    def disable_dimension_cache(self):
+        """
+        Desactiva la caché de dimensiones.
+        """
+        self.dimensions = None
+
+    def _profile(self, kind: str, sql: str, params=None):
+        """
+        Metodo privado que devuelve el contexto de medición del perfilador, o uno vacío si está desactivado.
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.track(kind, sql, params)
+
+    def _to_dataframe(self, rows, columns, typed: str = None) -> pd.DataFrame:
+        """
+        Metodo privado que construye el DataFrame del resultado (tipado si typed no es None)
+        e informa su costo al perfilador.
+        """
+        start = time.perf_counter()
+        if typed is None:
+            df = pd.DataFrame(rows, columns=columns)
+        else:
+            df = build_dataframe(rows, columns, backend=typed)
+        if self.profiler is not None:
+            self.profiler.record_result(df, time.perf_counter() - start)
+        return df
+
+    def _table_versions(self, tables: set) -> dict:
+        """
+        Metodo privado que devuelve el UPDATE_TIME de cada tabla (y de las tablas base de cada vista)
+        según information_schema. Solo aplica a MySQL; en otros motores devuelve un diccionario vacío.
+        """
+        if self.engine.dialect.name != "mysql" or not tables:
+            return {}
+        names = {"names": sorted(tables)}
+        with self.engine.connect() as connection:
+            connection.execute(text("SET SESSION information_schema_stats_expiry = 0"))
+            base = connection.execute(
+                text(
+                    "SELECT LOWER(TABLE_NAME) FROM information_schema.VIEW_TABLE_USAGE "
+                    "WHERE VIEW_SCHEMA = DATABASE() AND LOWER(VIEW_NAME) IN :names"
+                ).bindparams(bindparam("names", expanding=True)),
+                names,
+            ).scalars()
+            names = {"names": sorted(set(tables) | set(base))}
+            rows = connection.execute(
+                text(
+                    "SELECT LOWER(TABLE_NAME), UPDATE_TIME FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND LOWER(TABLE_NAME) IN :names"
+                ).bindparams(bindparam("names", expanding=True)),
+                names,
+            ).fetchall()
+        return {table: update_time for table, update_time in rows}
+
+    def _procedure_tables(self, name: str) -> set:
+        """
+        Metodo privado que obtiene las tablas referenciadas por el cuerpo de un stored procedure.
+        """
+        if self.engine.dialect.name != "mysql":
+            return set()
+        with self.engine.connect() as connection:
+            definition = connection.execute(
+                text(
+                    "SELECT ROUTINE_DEFINITION FROM information_schema.ROUTINES "
+                    "WHERE ROUTINE_SCHEMA = DATABASE() AND ROUTINE_NAME = :name"
+                ),
+                {"name": name},
+            ).scalar()
+        return referenced_tables(definition or "")
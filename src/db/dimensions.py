@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from src.models import Category, City, Country, Customer, Employee, Product
+from src.utils.logger import logger
+
+# Tablas de dimensiones (modelo ORM) que se cargan en memoria.
+DIMENSION_MODELS = {
+    "countries": Country,
+    "cities": City,
+    "categories": Category,
+    "products": Product,
+    "employees": Employee,
+    "customers": Customer,
+}
+
+# Búsquedas aplanadas: clave de la venta (alternativas) y tabla de dimensión de la que sale cada una.
+LOOKUPS = {
+    "product": (("ProductID",), "products"),
+    "employee": (("EmployeeID", "SalesPersonID"), "employees"),
+    "customer": (("CustomerID",), "customers"),
+}
+
+# Atributos que enrich puede agregar a una tabla de ventas: búsqueda y columna de la búsqueda aplanada.
+ATTRIBUTES = {
+    "ProductName": ("product", "ProductName"),
+    "CategoryID": ("product", "CategoryID"),
+    "CategoryName": ("product", "CategoryName"),
+    "EmployeeName": ("employee", "EmployeeName"),
+    "EmployeeCity": ("employee", "CityName"),
+    "EmployeeCountry": ("employee", "CountryName"),
+    "CustomerName": ("customer", "CustomerName"),
+    "CustomerCity": ("customer", "CityName"),
+    "CustomerCountry": ("customer", "CountryName"),
+}
+
+# Atributos que agregan las consultas de reportes de main.ipynb al unir sales con sus dimensiones.
+DEFAULT_ATTRIBUTES = ["ProductName", "CategoryName", "CustomerName", "EmployeeName"]
+
+
+def full_name(df: pd.DataFrame) -> pd.Series:
+    """
+    Arma el nombre "Apellido, Nombre I." como el concat de MySQL de las consultas de reportes:
+    si falta alguna de las partes el resultado es nulo.
+    """
+    parts = df[["LastName", "FirstName", "MiddleInitial"]]
+    names = parts["LastName"] + ", " + parts["FirstName"] + " " + parts["MiddleInitial"] + "."
+    return names.where(parts.notna().all(axis=1))
+
+
+class DimensionCache:
+    """
+    Caché en memoria de las tablas de dimensiones (productos, categorías, empleados, clientes, ciudades
+    y países) indexadas por clave primaria.
+
+    Las consultas de reportes unen sales con cinco o seis tablas solo para agregar nombres a los IDs;
+    las dimensiones son diminutas comparadas con sales. Con esta caché cada dimensión se carga una vez
+    (desde la base de datos con los modelos ORM o desde data/*.csv) y se guarda aplanada por búsqueda
+    (producto con su categoría, cliente y empleado con su ciudad y país), con los textos como categóricos.
+    Así la consulta de hechos puede seleccionar solo las columnas de sales (ver FACT_QUERY) y enrich
+    agrega los nombres con una búsqueda vectorizada por clave.
+
+    Antes de usar las dimensiones se verifica su versión, como mucho una vez cada check_interval segundos:
+    el UPDATE_TIME de MySQL (version_provider), la cantidad de filas y la clave máxima en otros motores,
+    o la fecha de modificación de los CSV. Solo se recargan las tablas que cambiaron.
+
+    Args:
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection (si no se indica data_dir).
+        data_dir (str, opcional): Carpeta con los archivos <tabla>.csv, en lugar de la base de datos.
+        version_provider (callable, opcional): Función que recibe un conjunto de tablas y devuelve
+            {tabla: versión}, por ejemplo DBConnection._table_versions.
+        check_interval (float): Segundos entre verificaciones de versión. Por defecto 60; 0 verifica siempre.
+
+    Ejemplo:
+        >>> dimensions = DimensionCache(data_dir="data")
+        >>> df = dimensions.enrich(db.execute_query(FACT_QUERY))
+        >>> df[["SalesID", "ProductName", "EmployeeName"]]
+    """
+
+    def __init__(self, engine=None, data_dir=None, version_provider=None, check_interval=60.0):
+        if engine is None and data_dir is None:
+            from src.db.database import DBConnection
+
+            engine = DBConnection().engine
+        self.engine = engine
+        self.data_dir = data_dir
+        self.version_provider = version_provider
+        self.check_interval = check_interval
+        self.tables = {}
+        self.versions = {}
+        self.lookups = {}
+        self.checked_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> set:
+        """
+        Verifica la versión de las dimensiones y recarga las que cambiaron (o todas, con force=True).
+
+        Returns:
+            set: Tablas recargadas.
+
+        Raises:
+            RuntimeError: Si ocurre un error al leer alguna dimensión.
+        """
+        with self._lock:
+            try:
+                versions = self._versions()
+                changed = {
+                    table
+                    for table in DIMENSION_MODELS
+                    if force or table not in self.tables or versions.get(table) != self.versions.get(table)
+                }
+                for table in changed:
+                    self.tables[table] = self._read(table)
+            except Exception as e:
+                raise RuntimeError(f"Error al cargar las dimensiones: {str(e)}")
+            self.versions = versions
+            self.checked_at = time.monotonic()
+            if changed:
+                self._build_lookups()
+                logger.info(f"Dimensiones cargadas: {sorted(changed)}")
+            return changed
+
+    def get(self, table: str) -> pd.DataFrame:
+        """
+        Devuelve una dimensión indexada por su clave primaria.
+
+        Raises:
+            ValueError: Si la tabla no es una dimensión.
+        """
+        if table not in DIMENSION_MODELS:
+            raise ValueError(f"Dimensión desconocida: {table}. Disponibles: {sorted(DIMENSION_MODELS)}")
+        self._ensure_fresh()
+        return self.tables[table]
+
+    def enrich(self, df: pd.DataFrame, attributes: list = None, as_category: bool = False) -> pd.DataFrame:
+        """
+        Agrega a una tabla de ventas los atributos de sus dimensiones, buscándolos por clave.
+
+        Cada atributo se agrega si df tiene la clave de su búsqueda: ProductID (ProductName, CategoryID,
+        CategoryName), EmployeeID o SalesPersonID (EmployeeName, EmployeeCity, EmployeeCountry) y
+        CustomerID (CustomerName, CustomerCity, CustomerCountry). A diferencia de un JOIN, las ventas cuya
+        clave no existe en la dimensión se conservan con el atributo nulo. Los atributos que df ya tiene
+        no se reemplazan.
+
+        Args:
+            df (pd.DataFrame): Ventas, por ejemplo el resultado de FACT_QUERY.
+            attributes (list, opcional): Atributos de ATTRIBUTES. Por defecto DEFAULT_ATTRIBUTES.
+            as_category (bool): Devolver los textos como categóricos (menos memoria). Por defecto False.
+
+        Returns:
+            pd.DataFrame: Una copia de df con las columnas agregadas.
+
+        Raises:
+            ValueError: Si algún atributo no existe.
+        """
+        attributes = DEFAULT_ATTRIBUTES if attributes is None else attributes
+        unknown = [a for a in attributes if a not in ATTRIBUTES]
+        if unknown:
+            raise ValueError(f"Atributos desconocidos: {unknown}. Disponibles: {sorted(ATTRIBUTES)}")
+        self._ensure_fresh()
+
+        columns = {}
+        positions = {}
+        for attribute in attributes:
+            lookup, column = ATTRIBUTES[attribute]
+            key = next((k for k in LOOKUPS[lookup][0] if k in df.columns), None)
+            if key is None or attribute in df.columns:
+                continue
+            index, values = self.lookups[lookup]
+            if lookup not in positions:
+                positions[lookup] = index.get_indexer(df[key])
+            columns[attribute] = self._take(values[column], positions[lookup], as_category)
+        return df.assign(**columns)
+
+    def _take(self, values, positions: np.ndarray, as_category: bool):
+        """
+        Metodo privado que toma los valores de una columna de la búsqueda por posición (-1 es nulo).
+        """
+        if isinstance(values, pd.Categorical):
+            codes = values.codes[positions] if len(values) else np.full(len(positions), -1)
+            codes = np.where(positions >= 0, codes, -1)
+            result = pd.Categorical.from_codes(codes, dtype=values.dtype)
+            return result if as_category else np.asarray(result, dtype=object)
+        return pd.array(values).take(positions, allow_fill=True)
+
+    def _ensure_fresh(self):
+        """
+        Metodo privado que carga las dimensiones la primera vez y verifica su versión cada check_interval segundos.
+        """
+        if self.checked_at is None or time.monotonic() - self.checked_at >= self.check_interval:
+            self.refresh()
+
+    def _build_lookups(self):
+        """
+        Metodo privado que arma las búsquedas aplanadas (producto con categoría, cliente y empleado con
+        ciudad y país) y convierte sus textos en categóricos.
+        """
+        cities = self.tables["cities"].join(self.tables["countries"][["CountryName"]], on="CountryID")
+        flat = {
+            "product": self.tables["products"].join(self.tables["categories"][["CategoryName"]], on="CategoryID"),
+            "employee": self.tables["employees"].assign(EmployeeName=full_name(self.tables["employees"])),
+            "customer": self.tables["customers"].assign(
+                CustomerName=full_name(self.tables["customers"]).fillna("Sin nombre")
+            ),
+        }
+        for name in ("employee", "customer"):
+            flat[name] = flat[name].join(cities[["CityName", "CountryName"]], on="CityID")
+
+        self.lookups = {}
+        for name, frame in flat.items():
+            values = {}
+            for column in {c for lookup, c in ATTRIBUTES.values() if lookup == name}:
+                series = frame[column]
+                if series.dtype == object:
+                    values[column] = pd.Categorical(series)
+                else:
+                    values[column] = series.to_numpy()
+            self.lookups[name] = (frame.index, values)
+
+    def _read(self, table: str) -> pd.DataFrame:
+        """
+        Metodo privado que lee una dimensión desde el CSV o la base de datos, indexada por su clave primaria.
+        """
+        model = DIMENSION_MODELS[table]
+        key = model.__table__.primary_key.columns.keys()[0]
+        columns = model.__table__.columns.keys()
+        if self.data_dir is not None:
+            path = os.path.join(self.data_dir, f"{table}.csv")
+            if not os.path.exists(path):
+                logger.warning(f"No se encontró {path}, la dimensión {table} queda vacía.")
+                frame = pd.DataFrame(columns=columns)
+            else:
+                frame = pd.read_csv(
+                    path, keep_default_na=False, na_values=["", "NULL", "\\N"]
+                )
+        else:
+            with self.engine.connect() as connection:
+                result = connection.execute(select(model.__table__))
+                frame = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        return frame.set_index(key)
+
+    def _versions(self) -> dict:
+        """
+        Metodo privado que obtiene la versión actual de cada dimensión.
+        """
+        tables = set(DIMENSION_MODELS)
+        if self.data_dir is not None:
+            versions = {}
+            for table in tables:
+                path = os.path.join(self.data_dir, f"{table}.csv")
+                if os.path.exists(path):
+                    stat = os.stat(path)
+                    versions[table] = (stat.st_mtime_ns, stat.st_size)
+            return versions
+        versions = self.version_provider(tables) if self.version_provider else {}
+        if versions:
+            return {table: str(version) for table, version in versions.items()}
+        with self.engine.connect() as connection:
+            for table, model in DIMENSION_MODELS.items():
+                key = model.__table__.primary_key.columns.values()[0]
+                versions[table] = tuple(
+                    connection.execute(select(func.count(), func.max(key))).one()
+                )
+        return versions
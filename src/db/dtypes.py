@@ -0,0 +1,213 @@
+from datetime import date, datetime
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Integer, Numeric, String
+
+# Tipos lógicos de columna y su equivalente en pandas (numpy/categorical) y en Arrow.
+KINDS = ("int32", "int64", "float64", "bool", "string", "datetime")
+BACKENDS = ("numpy", "arrow")
+
+# Las columnas de texto con a lo sumo esta proporción de valores distintos se guardan como categorical.
+CATEGORY_MAX_RATIO = 0.5
+
+# Tipos inferidos de los valores que son compatibles con cada tipo lógico del modelo. Si no lo son
+# (por ejemplo AVG(Quantity) AS Quantity devuelve decimales), se usa el tipo inferido.
+_COMPATIBLE = {
+    "int32": ("int64",),
+    "int64": ("int64",),
+    "float64": ("float64", "int64"),
+    "bool": ("bool", "int64"),
+    "string": ("string",),
+    "datetime": ("datetime", "string"),
+}
+
+_model_dtypes_cache = None
+
+
+def sql_type_kind(column_type) -> str:
+    """
+    Devuelve el tipo lógico (ver KINDS) de un tipo de columna de SQLAlchemy,
+    o None si no tiene un equivalente nativo (por ejemplo TIME).
+    """
+    if isinstance(column_type, Boolean):
+        return "bool"
+    if isinstance(column_type, BigInteger):
+        return "int64"
+    if isinstance(column_type, Integer):
+        return "int32"
+    if isinstance(column_type, Numeric):
+        return "float64"
+    if isinstance(column_type, String):
+        return "string"
+    if isinstance(column_type, (DateTime, Date)):
+        return "datetime"
+    return None
+
+
+def model_dtypes(models: list = None) -> dict:
+    """
+    Arma el mapa {columna: tipo lógico} a partir de los modelos ORM de src/models
+    (Sale, Product, Customer, ...). Si dos modelos tienen una columna con el mismo nombre
+    (por ejemplo una clave foránea), se conserva el tipo del primero.
+
+    Args:
+        models (list, opcional): Modelos a considerar. Por defecto todos los de src.models.
+
+    Ejemplo:
+        >>> model_dtypes()["TotalPrice"]
+        'float64'
+    """
+    global _model_dtypes_cache
+    if models is None:
+        if _model_dtypes_cache is None:
+            from src.db.database import Base
+            import src.models  # noqa: F401  (registra los modelos en Base)
+
+            _model_dtypes_cache = model_dtypes(
+                [mapper.class_ for mapper in Base.registry.mappers]
+            )
+        return dict(_model_dtypes_cache)
+
+    dtypes = {}
+    for model in models:
+        for column in model.__table__.columns:
+            kind = sql_type_kind(column.type)
+            if kind is not None:
+                dtypes.setdefault(column.name, kind)
+    return dtypes
+
+
+def build_dataframe(rows, columns, dtypes: dict = None, backend: str = "numpy") -> pd.DataFrame:
+    """
+    Construye un DataFrame tipado columna por columna a partir de las filas de un cursor,
+    sin pasar por columnas object de Decimal.
+
+    Cada columna toma el tipo lógico de dtypes (por defecto, el de los modelos ORM);
+    las columnas calculadas que no están en los modelos (SUM, CONCAT, ...) se infieren por su primer valor.
+        - backend "numpy": enteros int32/int64 (Int32/Int64 si hay nulos), DECIMAL como float64,
+          texto como categorical si tiene pocos valores distintos y fechas como datetime64.
+        - backend "arrow": columnas respaldadas por Arrow (pd.ArrowDtype) con los mismos tipos.
+
+    Args:
+        rows (list): Filas devueltas por el cursor.
+        columns (list): Nombres de las columnas.
+        dtypes (dict, opcional): Mapa {columna: tipo lógico}. Por defecto model_dtypes().
+        backend (str): "numpy" o "arrow". Por defecto "numpy".
+
+    Returns:
+        pd.DataFrame: El resultado con tipos nativos.
+
+    Raises:
+        ValueError: Si backend no es "numpy" ni "arrow".
+
+    Ejemplo:
+        >>> result = connection.execute(text("SELECT * FROM sales"))
+        >>> df = build_dataframe(result.fetchall(), result.keys())
+        >>> df["TotalPrice"].dtype
+        dtype('float64')
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend debe ser uno de {BACKENDS}.")
+    columns = list(columns)
+    if dtypes is None:
+        dtypes = model_dtypes()
+
+    if len(rows):
+        if not isinstance(rows[0], tuple):
+            # las Row de SQLAlchemy no son tuplas y numpy las inspecciona atributo por atributo
+            rows = [tuple(row) for row in rows]
+        matrix = np.array(rows, dtype=object).reshape(len(rows), len(columns))
+    else:
+        matrix = np.empty((0, len(columns)), dtype=object)
+    convert = _to_arrow if backend == "arrow" else _to_numpy
+    arrays = [
+        convert(matrix[:, i], _column_kind(dtypes.get(name), matrix[:, i]))
+        for i, name in enumerate(columns)
+    ]
+    # Se construye por posición para admitir nombres de columna repetidos.
+    df = pd.DataFrame(dict(enumerate(arrays)), index=pd.RangeIndex(len(rows)))
+    df.columns = columns
+    return df
+
+
+def to_arrow_table(rows, columns, dtypes: dict = None):
+    """
+    Construye una tabla de pyarrow a partir de las filas de un cursor, con los tipos de build_dataframe.
+    """
+    import pyarrow as pa
+
+    df = build_dataframe(rows, columns, dtypes, backend="arrow")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _column_kind(kind, values) -> str:
+    """
+    Devuelve el tipo del modelo si es compatible con los valores recibidos, o el tipo inferido si no.
+    """
+    inferred = _infer_kind(values)
+    if kind is None or (inferred is not None and inferred not in _COMPATIBLE[kind]):
+        return inferred
+    return kind
+
+
+def _infer_kind(values) -> str:
+    """
+    Infiere el tipo lógico de una columna calculada a partir de su primer valor no nulo.
+    """
+    first = next((v for v in values if v is not None), None)
+    if isinstance(first, bool):
+        return "bool"
+    if isinstance(first, (Decimal, float)):
+        return "float64"
+    if isinstance(first, (int, np.integer)):
+        return "int64"
+    if isinstance(first, str):
+        return "string"
+    if isinstance(first, (datetime, date)):
+        return "datetime"
+    return None
+
+
+def _to_numpy(values, kind):
+    """
+    Convierte los valores de una columna a un array de pandas/numpy del tipo lógico indicado.
+    """
+    if kind == "float64":
+        return values.astype("float64")
+    if kind in ("int32", "int64"):
+        try:
+            return values.astype(kind)
+        except TypeError:  # hay nulos
+            return pd.array(values, dtype=kind.capitalize())
+    if kind == "bool":
+        return pd.array(values, dtype="boolean")
+    if kind == "string":
+        _, uniques = pd.factorize(values)
+        if len(uniques) <= CATEGORY_MAX_RATIO * len(values):
+            return pd.Categorical(values)
+        return values
+    if kind == "datetime":
+        return pd.to_datetime(pd.Series(values)).array
+    return pd.Series(values.tolist(), dtype=None).array
+
+
+def _to_arrow(values, kind):
+    """
+    Convierte los valores de una columna a un array de pandas respaldado por Arrow.
+    """
+    import pyarrow as pa
+
+    if kind == "float64":
+        array = pa.array(values.astype("float64"), from_pandas=True)
+    elif kind in ("int32", "int64"):
+        array = pa.array(values, type=getattr(pa, kind)())
+    elif kind == "bool":
+        array = pa.array(values, type=pa.bool_())
+    elif kind == "string":
+        array = pa.array(values, type=pa.string())
+    elif kind == "datetime":
+        array = pa.Array.from_pandas(pd.to_datetime(pd.Series(values)))
+    else:
+        array = pa.array(values)
+    return pd.arrays.ArrowExtensionArray(array)
@@ -0,0 +1,495 @@
+import math
+import re
+import time
+import pandas as pd
+from sqlalchemy import inspect, text
+from src.db.compat import to_embedded_sql
+from src.db.queries import QUERY_PARAMS, REPORT_QUERIES
+from src.utils.logger import logger
+
+# Solo se eliminan (con drop_undeclared=True) los índices con este prefijo que no están declarados;
+# las claves primarias, foráneas y únicas nunca se tocan.
+MANAGED_PREFIX = "idx_"
+
+_TABLE_REF = re.compile(
+    r"\b(?:from|join)\s+(\w+)(?:\s+(?:as\s+)?(?!(?:on|join|where|group|order|having|limit|inner|left|right|cross|union)\b)(\w+))?",
+    re.IGNORECASE,
+)
+_CLAUSE_END = r"(?=\b(?:join|inner|left|right|cross|where|group|order|having|limit|union|select)\b|\)|;|$)"
+_ON = re.compile(r"\bon\b(.*?)" + _CLAUSE_END, re.IGNORECASE | re.DOTALL)
+_WHERE = re.compile(r"\bwhere\b(.*?)" + _CLAUSE_END, re.IGNORECASE | re.DOTALL)
+_GROUP = re.compile(r"\bgroup\s+by\b(.*?)" + _CLAUSE_END, re.IGNORECASE | re.DOTALL)
+_COLUMN_REF = re.compile(r"\b(?:(\w+)\.)?(\w+)\b")
+_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SQLITE_PLAN = re.compile(r"^(SCAN|SEARCH)\s+(\w+)(?:\s+USING\s+(COVERING\s+)?(?:INDEX\s+(\w+)|INTEGER PRIMARY KEY))?")
+
+
+def declared_indexes(metadata=None) -> pd.DataFrame:
+    """
+    Devuelve los índices declarados en los modelos ORM (__table_args__ de Sale, Product, ...).
+
+    Returns:
+        pd.DataFrame: Una fila por índice con "table", "name", "columns" (tupla) y "unique".
+    """
+    if metadata is None:
+        from src.db.database import Base
+        import src.models  # noqa: F401  (registra los modelos en Base)
+
+        metadata = Base.metadata
+    rows = [
+        {
+            "table": table.name,
+            "name": index.name,
+            "columns": tuple(column.name for column in index.columns),
+            "unique": bool(index.unique),
+        }
+        for table in metadata.sorted_tables
+        for index in sorted(table.indexes, key=lambda i: i.name)
+    ]
+    return pd.DataFrame(rows, columns=["table", "name", "columns", "unique"])
+
+
+class IndexManager:
+    """
+    Administra el ciclo de vida de los índices declarados junto a los modelos ORM
+    (por ejemplo idx_sales_product_cover sobre sales(ProductID, Quantity, TotalPrice)).
+
+    diff compara los índices declarados con los existentes en la base de datos y apply crea los que faltan
+    y reemplaza los que cambiaron de columnas. Ambas operaciones son idempotentes: un índice que ya existe
+    con las mismas columnas, o cuyas columnas ya están cubiertas por otro índice existente con el mismo
+    prefijo, no se vuelve a crear. Los índices idx_* que existen pero no están declarados solo se eliminan
+    con drop_undeclared=True.
+
+    Args:
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection.
+        metadata (MetaData, opcional): Metadata con los índices declarados. Por defecto la de los modelos.
+
+    Ejemplo:
+        >>> manager = IndexManager()
+        >>> manager.diff()[["table", "name", "action"]]
+        >>> manager.apply()
+    """
+
+    def __init__(self, engine=None, metadata=None):
+        if engine is None:
+            from src.db.database import DBConnection
+
+            engine = DBConnection().engine
+        if metadata is None:
+            from src.db.database import Base
+            import src.models  # noqa: F401  (registra los modelos en Base)
+
+            metadata = Base.metadata
+        self.engine = engine
+        self.metadata = metadata
+
+    def existing(self) -> pd.DataFrame:
+        """
+        Devuelve los índices existentes en la base de datos para las tablas de los modelos
+        (sin la clave primaria).
+
+        Returns:
+            pd.DataFrame: Una fila por índice con "table", "name", "columns" (tupla) y "unique".
+        """
+        inspector = inspect(self.engine)
+        tables = set(inspector.get_table_names())
+        rows = [
+            {
+                "table": table,
+                "name": index["name"],
+                "columns": tuple(index["column_names"]),
+                "unique": bool(index.get("unique")),
+            }
+            for table in self.metadata.tables
+            if table in tables
+            for index in inspector.get_indexes(table)
+        ]
+        return pd.DataFrame(rows, columns=["table", "name", "columns", "unique"])
+
+    def diff(self, drop_undeclared: bool = False) -> pd.DataFrame:
+        """
+        Compara los índices declarados con los existentes.
+
+        La columna "action" indica qué haría apply:
+            - "create": el índice no existe.
+            - "replace": existe con el mismo nombre pero otras columnas.
+            - "ok": existe con las mismas columnas.
+            - "covered": no existe, pero otro índice existente (covered_by) empieza con las mismas columnas.
+            - "drop" / "undeclared": índice idx_* existente que no está declarado (se elimina solo
+              con drop_undeclared=True).
+            - "missing_table": la tabla todavía no existe.
+            - "missing_column": alguna columna todavía no existe (por ejemplo, antes de
+              SalesTimestampPipeline.migrate).
+
+        Returns:
+            pd.DataFrame: Una fila por índice con "table", "name", "columns", "action" y "covered_by".
+        """
+        declared = declared_indexes(self.metadata)
+        existing = self.existing()
+        inspector = inspect(self.engine)
+        tables = set(inspector.get_table_names())
+        columns = {
+            table: {column["name"] for column in inspector.get_columns(table)}
+            for table in set(declared["table"]) & tables
+        }
+        by_name = {(row.table, row.name): row for row in existing.itertuples()}
+        rows = []
+        for index in declared.itertuples():
+            current = by_name.get((index.table, index.name))
+            covered_by = None
+            if index.table not in tables:
+                action = "missing_table"
+            elif not set(index.columns) <= columns[index.table]:
+                action = "missing_column"
+            elif current is None:
+                covered_by = _covering_index(existing, index.table, index.columns)
+                action = "covered" if covered_by else "create"
+            elif tuple(current.columns) != tuple(index.columns):
+                action = "replace"
+            else:
+                action = "ok"
+            rows.append({"table": index.table, "name": index.name, "columns": index.columns,
+                         "action": action, "covered_by": covered_by})
+
+        declared_names = set(zip(declared["table"], declared["name"]))
+        for index in existing.itertuples():
+            if (index.table, index.name) in declared_names or not index.name.startswith(MANAGED_PREFIX):
+                continue
+            rows.append({"table": index.table, "name": index.name, "columns": index.columns,
+                         "action": "drop" if drop_undeclared else "undeclared", "covered_by": None})
+        return pd.DataFrame(rows, columns=["table", "name", "columns", "action", "covered_by"])
+
+    def apply(self, drop_undeclared: bool = False, dry_run: bool = False) -> pd.DataFrame:
+        """
+        Crea los índices declarados que faltan, reemplaza los que cambiaron y, con drop_undeclared=True,
+        elimina los índices idx_* no declarados. Volver a ejecutarlo no tiene efecto.
+
+        Args:
+            drop_undeclared (bool): Eliminar los índices idx_* que no están declarados. Por defecto False.
+            dry_run (bool): Solo devolver el diff y las sentencias, sin ejecutarlas. Por defecto False.
+
+        Returns:
+            pd.DataFrame: El diff, con las columnas "ddl" (sentencias ejecutadas) y "seconds".
+        """
+        diff = self.diff(drop_undeclared)
+        ddl, seconds = [], []
+        for row in diff.itertuples():
+            statements = self._statements(row)
+            ddl.append(statements)
+            start = time.perf_counter()
+            if statements and not dry_run:
+                with self.engine.begin() as connection:
+                    for statement in statements:
+                        connection.execute(text(statement))
+                logger.info(f"Índice {row.name} ({row.action}) en {time.perf_counter() - start:.2f}s")
+            seconds.append(time.perf_counter() - start if statements and not dry_run else 0.0)
+        diff["ddl"] = ddl
+        diff["seconds"] = seconds
+        return diff
+
+    def drop_secondary(self, table: str) -> pd.DataFrame:
+        """
+        Elimina los índices idx_* no únicos de una tabla, por ejemplo antes de una carga masiva
+        (ver BulkLoader), y devuelve los eliminados para volver a crearlos con restore.
+        Las claves primarias, foráneas y únicas no se tocan; si el motor no permite eliminar un índice
+        (en MySQL, el que usa una clave foránea) se conserva y se advierte en el log.
+
+        Returns:
+            pd.DataFrame: Los índices eliminados, con "table", "name", "columns" y "unique".
+        """
+        existing = self.existing()
+        candidates = existing[
+            (existing["table"] == table)
+            & existing["name"].str.startswith(MANAGED_PREFIX)
+            & ~existing["unique"]
+        ]
+        dropped = []
+        for row in candidates.itertuples():
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(text(self._drop_sql(row)))
+                dropped.append(row.Index)
+            except Exception as e:
+                logger.warning(f"No se pudo eliminar el índice {row.name} de {table}, se conserva: {str(e)}")
+        return candidates.loc[dropped].reset_index(drop=True)
+
+    def restore(self, indexes: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vuelve a crear los índices devueltos por drop_secondary.
+
+        Returns:
+            pd.DataFrame: Los índices, con la columna "seconds" (tiempo de creación de cada uno).
+        """
+        seconds = []
+        for row in indexes.itertuples():
+            start = time.perf_counter()
+            with self.engine.begin() as connection:
+                connection.execute(text(self._create_sql(row)))
+            seconds.append(time.perf_counter() - start)
+            logger.info(f"Índice {row.name} recreado en {seconds[-1]:.2f}s")
+        return indexes.assign(seconds=seconds)
+
+    def _drop_sql(self, row) -> str:
+        """
+        Metodo privado que arma el DROP INDEX según el motor de base de datos.
+        """
+        quote = self.engine.dialect.identifier_preparer.quote
+        if self.engine.dialect.name == "mysql":
+            return f"DROP INDEX {quote(row.name)} ON {quote(row.table)}"
+        return f"DROP INDEX {quote(row.name)}"
+
+    def _create_sql(self, row) -> str:
+        """
+        Metodo privado que arma el CREATE INDEX de un índice.
+        """
+        quote = self.engine.dialect.identifier_preparer.quote
+        return (
+            f"CREATE INDEX {quote(row.name)} ON {quote(row.table)} "
+            f"({', '.join(quote(c) for c in row.columns)})"
+        )
+
+    def _statements(self, row) -> list:
+        """
+        Metodo privado que devuelve las sentencias DDL para una fila del diff.
+        """
+        drop = self._drop_sql(row)
+        create = self._create_sql(row)
+        return {"create": [create], "replace": [drop, create], "drop": [drop]}.get(row.action, [])
+
+
+class IndexAdvisor:
+    """
+    Asesor de índices: ejecuta EXPLAIN (EXPLAIN QUERY PLAN en SQLite) sobre las consultas de reportes
+    registradas (src.db.queries.REPORT_QUERIES) y sugiere índices para las tablas que se recorren completas.
+
+    Por cada tabla recorrida completa (MySQL type ALL o index, SQLite SCAN) se arma un índice con las
+    columnas de los filtros (WHERE), luego las de los joins (ON) y las del GROUP BY; si la consulta usa
+    pocas columnas de la tabla (max_covering_columns), se agregan las restantes para que sea un índice
+    de cobertura y la consulta no lea la tabla. El ahorro se estima así:
+        - filas: con un filtro por igualdad se leen filas / valores distintos de la primera columna
+          en lugar de todas las filas;
+        - lectura: un índice de cobertura lee solo sus columnas (read_fraction = columnas del índice /
+          columnas de la tabla).
+    Las sugerencias que ya cubre un índice existente o declarado en los modelos se informan en covered_by.
+
+    Args:
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection.
+        queries (dict, opcional): {nombre: sql}. Por defecto REPORT_QUERIES.
+        params (dict, opcional): {nombre: parámetros}. Por defecto QUERY_PARAMS.
+        max_covering_columns (int): Máximo de columnas de un índice de cobertura. Por defecto 4.
+        min_rows (int): Las tablas con menos filas no reciben sugerencias. Por defecto 1000.
+
+    Ejemplo:
+        >>> advisor = IndexAdvisor()
+        >>> advisor.suggest()[["query", "table", "columns", "rows_saved", "covered_by", "ddl"]]
+    """
+
+    def __init__(
+        self, engine=None, queries=None, params=None, max_covering_columns=4, min_rows=1000, metadata=None
+    ):
+        if engine is None:
+            from src.db.database import DBConnection
+
+            engine = DBConnection().engine
+        if metadata is None:
+            from src.db.database import Base
+            import src.models  # noqa: F401  (registra los modelos en Base)
+
+            metadata = Base.metadata
+        self.engine = engine
+        self.queries = REPORT_QUERIES if queries is None else queries
+        self.params = QUERY_PARAMS if params is None else params
+        self.max_covering_columns = max_covering_columns
+        self.min_rows = min_rows
+        self.metadata = metadata
+        self._counts = {}
+
+    def explain(self, sql: str, params: dict = None) -> pd.DataFrame:
+        """
+        Ejecuta el EXPLAIN de una consulta y lo normaliza: una fila por acceso a tabla con
+        "alias", "access" ("full_scan", "index_scan" o "lookup"), "key" y "rows" (filas examinadas estimadas).
+        """
+        if self.engine.dialect.name == "sqlite":
+            sql = to_embedded_sql(sql, "sqlite")
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+        with self.engine.connect() as connection:
+            result = connection.execute(text(prefix + sql.strip().rstrip(";")), params)
+            plan = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+        rows = []
+        if self.engine.dialect.name == "sqlite":
+            for detail in plan["detail"]:
+                match = _SQLITE_PLAN.match(detail)
+                if match is None:
+                    continue
+                kind, alias, covering, key = match.groups()
+                if kind == "SEARCH":
+                    access = "lookup"
+                elif covering:
+                    access = "index_scan"
+                else:
+                    access = "full_scan"
+                rows.append({"alias": alias, "access": access, "key": key, "rows": None})
+        else:
+            for row in plan.itertuples():
+                access = {"ALL": "full_scan", "index": "index_scan"}.get(row.type, "lookup")
+                rows.append({"alias": row.table, "access": access, "key": row.key,
+                             "rows": None if pd.isna(row.rows) else int(row.rows)})
+        return pd.DataFrame(rows, columns=["alias", "access", "key", "rows"])
+
+    def suggest(self) -> pd.DataFrame:
+        """
+        Analiza todas las consultas registradas y devuelve las sugerencias de índices.
+
+        Returns:
+            pd.DataFrame: Una fila por sugerencia con "query", "table", "columns", "kind" ("filter",
+            "join" o "covering"), "access", "rows_examined", "estimated_rows", "rows_saved",
+            "read_fraction", "covered_by" (índice existente o declarado que ya la cubre) y "ddl".
+        """
+        known = self._known_indexes()
+        rows = []
+        for name, sql in self.queries.items():
+            try:
+                plan = self.explain(sql, self.params.get(name))
+            except Exception as e:
+                logger.warning(f"No se pudo obtener el plan de {name}: {str(e).splitlines()[0]}")
+                continue
+            usage = self._column_usage(sql)
+            for access in plan.itertuples():
+                if access.access == "lookup" or access.alias not in usage:
+                    continue
+                suggestion = self._suggestion(name, usage[access.alias], access, known)
+                if suggestion is not None:
+                    rows.append(suggestion)
+        columns = ["query", "table", "columns", "kind", "access", "rows_examined", "estimated_rows",
+                   "rows_saved", "read_fraction", "covered_by", "ddl"]
+        return pd.DataFrame(rows, columns=columns)
+
+    def _suggestion(self, query, usage, access, known):
+        """
+        Metodo privado que arma la sugerencia de índice para una tabla recorrida completa.
+        """
+        table = usage["table"]
+        model_columns = list(self.metadata.tables[table].columns.keys())
+        primary = {c.name for c in self.metadata.tables[table].primary_key.columns}
+        leading = _unique(usage["filter"] + usage["join"] + usage["group"])
+        leading = [c for c in leading if c not in primary] or leading
+        extra = [c for c in usage["all"] if c not in leading]
+        if len(leading) + len(extra) <= self.max_covering_columns and len(usage["all"]) < len(model_columns):
+            columns = leading + extra
+            covering = True
+        else:
+            columns = leading
+            covering = False
+        if not columns or (access.access == "index_scan" and not usage["filter"]):
+            return None
+
+        table_rows = self._count(table)
+        if table_rows < self.min_rows:
+            return None
+        examined = access.rows if access.rows is not None else table_rows
+        if usage["filter"] and columns[0] in usage["filter"]:
+            estimated = math.ceil(examined / max(self._count(table, columns[0]), 1))
+            kind = "filter"
+        else:
+            estimated = examined
+            kind = "covering" if covering else "join"
+        name = "idx_" + table + "_" + "_".join(c.lower() for c in columns)
+        return {
+            "query": query,
+            "table": table,
+            "columns": tuple(columns),
+            "kind": kind,
+            "access": access.access,
+            "rows_examined": examined,
+            "estimated_rows": estimated,
+            "rows_saved": examined - estimated,
+            "read_fraction": round(len(columns) / len(model_columns), 2) if covering else 1.0,
+            "covered_by": _covering_index(known, table, tuple(columns), len(leading)),
+            "ddl": f"CREATE INDEX {name} ON {table} ({', '.join(columns)})",
+        }
+
+    def _known_indexes(self) -> pd.DataFrame:
+        """
+        Metodo privado que reúne los índices existentes y los declarados en los modelos.
+        """
+        existing = IndexManager(self.engine, self.metadata).existing()
+        return pd.concat([existing, declared_indexes(self.metadata)], ignore_index=True)
+
+    def _column_usage(self, sql: str) -> dict:
+        """
+        Metodo privado que obtiene, por alias de tabla, las columnas que la consulta usa en filtros (WHERE),
+        joins (ON), GROUP BY y en total. La detección es por expresiones regulares: las columnas sin alias
+        se asignan a la única tabla referenciada que las tiene.
+        """
+        sql = _LITERAL.sub("''", sql)
+        aliases = {}
+        for table, alias in _TABLE_REF.findall(sql):
+            if table in self.metadata.tables:
+                aliases[(alias or table).lower()] = table
+        if not aliases:
+            return {}
+        lower_columns = {
+            alias: {c.lower(): c for c in self.metadata.tables[table].columns.keys()}
+            for alias, table in aliases.items()
+        }
+
+        def refs(fragment):
+            found = []
+            for alias, column in _COLUMN_REF.findall(fragment):
+                column = column.lower()
+                if alias:
+                    if alias.lower() in lower_columns and column in lower_columns[alias.lower()]:
+                        found.append((alias.lower(), lower_columns[alias.lower()][column]))
+                    continue
+                owners = [a for a, cols in lower_columns.items() if column in cols]
+                if len(owners) == 1:
+                    found.append((owners[0], lower_columns[owners[0]][column]))
+            return found
+
+        usage = {
+            alias: {"table": table, "filter": [], "join": [], "group": [], "all": []}
+            for alias, table in aliases.items()
+        }
+        for kind, pattern in (("filter", _WHERE), ("join", _ON), ("group", _GROUP)):
+            for fragment in pattern.findall(sql):
+                for alias, column in refs(fragment):
+                    usage[alias][kind].append(column)
+        for alias, column in refs(sql):
+            usage[alias]["all"].append(column)
+        for entry in usage.values():
+            for key in ("filter", "join", "group", "all"):
+                entry[key] = _unique(entry[key])
+        return usage
+
+    def _count(self, table: str, column: str = None) -> int:
+        """
+        Metodo privado que cuenta las filas (o los valores distintos de column) de una tabla, con caché.
+        """
+        key = (table, column)
+        if key not in self._counts:
+            quote = self.engine.dialect.identifier_preparer.quote
+            expression = f"COUNT(DISTINCT {quote(column)})" if column else "COUNT(*)"
+            with self.engine.connect() as connection:
+                self._counts[key] = connection.execute(
+                    text(f"SELECT {expression} FROM {quote(table)}")
+                ).scalar() or 0
+        return self._counts[key]
+
+
+def _covering_index(indexes: pd.DataFrame, table: str, columns: tuple, leading: int = None):
+    """
+    Devuelve el nombre de un índice de table que empieza con las primeras leading columnas de columns
+    (por defecto todas) y contiene al resto, o None.
+    """
+    leading = len(columns) if leading is None else leading
+    for index in indexes[indexes["table"] == table].itertuples():
+        if tuple(index.columns[:leading]) == tuple(columns[:leading]) and set(columns) <= set(index.columns):
+            return index.name
+    return None
+
+
+def _unique(values) -> list:
+    return list(dict.fromkeys(values))
@@ -0,0 +1,218 @@
+import argparse
+import os
+import time
+from functools import partial
+import pandas as pd
+from sqlalchemy import text
+from src.db.indexes import IndexManager
+from src.utils.logger import logger
+
+# Orden de carga respetando las claves foráneas entre tablas.
+LOAD_ORDER = [
+    "countries",
+    "cities",
+    "categories",
+    "products",
+    "employees",
+    "customers",
+    "sales",
+]
+
+
+class BulkLoader:
+    """
+    Cargador masivo de los archivos data/*.csv en la base de datos.
+    Reemplaza a los LOAD DATA LOCAL INFILE de sql/load_data.sql, que dependen de rutas absolutas.
+
+    Lee cada CSV en bloques (chunks), inserta las filas con inserciones por lotes (executemany)
+    y carga las tablas en orden de dependencias (countries -> cities -> ... -> sales).
+    Antes de cargar cada tabla elimina sus índices secundarios idx_* (ver IndexManager.drop_secondary)
+    y los vuelve a crear al terminar, de modo que cada índice se arma una sola vez sobre la tabla completa
+    en lugar de actualizarse fila a fila. En MySQL además desactiva las verificaciones de claves foráneas
+    y de unicidad durante la carga (ALTER TABLE ... DISABLE KEYS no sirve: solo afecta a MyISAM y
+    las tablas de sql/ son InnoDB).
+
+    Args:
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection.
+        data_dir (str): Carpeta con los archivos <tabla>.csv. Por defecto "data".
+        batch_size (int): Filas por cada inserción por lotes. Por defecto 5000.
+        chunk_size (int): Filas leídas del CSV por bloque (una transacción por bloque). Por defecto 50000.
+        transforms (dict, opcional): Función por tabla que transforma cada bloque antes de insertarlo,
+            por ejemplo {"sales": normalize_sales} para cargar SalesTimestamp y SalesBucket (ver src.db.timestamps).
+        drop_indexes (bool): Eliminar los índices idx_* durante la carga y recrearlos al final. Por defecto True.
+
+    Ejemplo:
+        >>> loader = BulkLoader(batch_size=10000)
+        >>> stats = loader.load_all()
+        >>> stats[["table", "rows", "rows_per_sec"]]
+    """
+
+    def __init__(
+        self, engine=None, data_dir="data", batch_size=5000, chunk_size=50000, transforms=None, drop_indexes=True
+    ):
+        if batch_size <= 0 or chunk_size <= 0:
+            raise ValueError("batch_size y chunk_size deben ser enteros positivos.")
+        if engine is None:
+            from src.db.database import DBConnection
+
+            engine = DBConnection().engine
+        self.engine = engine
+        self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.transforms = transforms or {}
+        self.drop_indexes = drop_indexes
+
+    @property
+    def _is_mysql(self):
+        return self.engine.dialect.name == "mysql"
+
+    def load_all(self, tables: list = None, truncate: bool = False) -> pd.DataFrame:
+        """
+        Carga todas las tablas (o las indicadas) en orden de dependencias.
+
+        Args:
+            tables (list, opcional): Tablas a cargar. Por defecto todas las de LOAD_ORDER.
+            truncate (bool): Si es True, vacía las tablas antes de cargarlas. Por defecto False.
+
+        Returns:
+            pd.DataFrame: Una fila por tabla con "table", "rows", "seconds" y "rows_per_sec".
+        """
+        tables = [t for t in LOAD_ORDER if tables is None or t in tables] + [
+            t for t in (tables or []) if t not in LOAD_ORDER
+        ]
+        stats = []
+        with self.engine.connect() as connection:
+            self._disable_checks(connection)
+            try:
+                if truncate:
+                    for table in reversed(tables):
+                        connection.execute(text(f"DELETE FROM {self._quote(table)}"))
+                    connection.commit()
+                for table in tables:
+                    path = os.path.join(self.data_dir, f"{table}.csv")
+                    if not os.path.exists(path):
+                        logger.warning(f"No se encontró {path}, se omite la tabla {table}.")
+                        continue
+                    stats.append(self._load(connection, table, path))
+            finally:
+                self._enable_checks(connection)
+        return pd.DataFrame(stats, columns=["table", "rows", "seconds", "rows_per_sec"])
+
+    def load_table(self, table: str, path: str = None) -> dict:
+        """
+        Carga una sola tabla desde su CSV (por defecto data_dir/<tabla>.csv).
+
+        Returns:
+            dict: Estadísticas de la carga con "table", "rows", "seconds" y "rows_per_sec".
+        """
+        path = path or os.path.join(self.data_dir, f"{table}.csv")
+        with self.engine.connect() as connection:
+            self._disable_checks(connection)
+            try:
+                return self._load(connection, table, path)
+            finally:
+                self._enable_checks(connection)
+
+    def _load(self, connection, table, path) -> dict:
+        """
+        Metodo privado que lee el CSV en bloques y los inserta por lotes, una transacción por bloque.
+        """
+        start = time.perf_counter()
+        rows = 0
+        manager = IndexManager(engine=self.engine) if self.drop_indexes else None
+        dropped = manager.drop_secondary(table) if manager is not None else None
+        try:
+            reader = pd.read_csv(
+                path,
+                chunksize=self.chunk_size,
+                dtype=str,
+                keep_default_na=False,
+                na_values=["", "NULL", "\\N"],
+            )
+            statement = None
+            transform = self.transforms.get(table)
+            for chunk in reader:
+                if transform is not None:
+                    chunk = transform(chunk)
+                if statement is None:
+                    statement = self._insert_statement(table, list(chunk.columns))
+                for column in chunk.select_dtypes(include="datetime").columns:
+                    chunk[column] = chunk[column].dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                records = [
+                    {f"c{i}": v for i, v in enumerate(row)}
+                    for row in chunk.itertuples(index=False, name=None)
+                ]
+                for i in range(0, len(records), self.batch_size):
+                    connection.execute(statement, records[i : i + self.batch_size])
+                connection.commit()
+                rows += len(records)
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            if dropped is not None and not dropped.empty:
+                manager.restore(dropped)
+
+        seconds = time.perf_counter() - start
+        rate = rows / seconds if seconds > 0 else float("inf")
+        logger.info(f"{table}: {rows} filas en {seconds:.2f}s ({rate:,.0f} filas/s)")
+        return {"table": table, "rows": rows, "seconds": seconds, "rows_per_sec": rate}
+
+    def _insert_statement(self, table, columns):
+        """
+        Metodo privado que arma el INSERT parametrizado para las columnas del CSV.
+        """
+        names = ", ".join(self._quote(c) for c in columns)
+        values = ", ".join(f":c{i}" for i in range(len(columns)))
+        return text(f"INSERT INTO {self._quote(table)} ({names}) VALUES ({values})")
+
+    def _quote(self, identifier):
+        return self.engine.dialect.identifier_preparer.quote(identifier)
+
+    def _disable_checks(self, connection):
+        """
+        Metodo privado que desactiva las verificaciones de claves foráneas y unicidad durante la carga.
+        """
+        if self._is_mysql:
+            connection.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            connection.execute(text("SET UNIQUE_CHECKS = 0"))
+
+    def _enable_checks(self, connection):
+        """
+        Metodo privado que vuelve a activar las verificaciones desactivadas por _disable_checks.
+        """
+        if self._is_mysql:
+            connection.execute(text("SET UNIQUE_CHECKS = 1"))
+            connection.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga masiva de data/*.csv en la base de datos.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--tables", nargs="*")
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument("--keep-indexes", action="store_true", help="no elimina los índices idx_* durante la carga")
+    parser.add_argument(
+        "--sales-base-date",
+        help="normaliza SalesDate en SalesTimestamp / SalesBucket anclando a esta fecha los valores sin fecha",
+    )
+    parser.add_argument("--bucket", default="hour", choices=["hour", "day", "week"])
+    args = parser.parse_args()
+
+    transforms = None
+    if args.sales_base_date:
+        from src.db.timestamps import normalize_sales
+
+        transforms = {"sales": partial(normalize_sales, base_date=args.sales_base_date, bucket=args.bucket)}
+    loader = BulkLoader(
+        data_dir=args.data_dir,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        transforms=transforms,
+        drop_indexes=not args.keep_indexes,
+    )
+    print(loader.load_all(tables=args.tables, truncate=args.truncate).to_string(index=False))
@@ -0,0 +1,194 @@
+import threading
+import weakref
+import pandas as pd
+from sqlalchemy import event, select
+from sqlalchemy.orm import joinedload, selectinload
+from src.models import Category, Customer, Employee, Product, Sale
+from src.utils.logger import logger
+
+STRATEGIES = {"joined": joinedload, "selectin": selectinload}
+
+# Perfiles de carga: modelo raíz y relaciones (rutas separadas por puntos) que se cargan junto con él.
+PROFILES = {}
+
+
+def load_options(model, *paths: str, strategy: str = None) -> list:
+    """
+    Arma las opciones de carga anticipada (eager loading) para las relaciones indicadas.
+
+    Cada ruta recorre relaciones desde model, por ejemplo "city.country" para Customer. Si no se indica
+    strategy, las relaciones a un solo objeto (muchos-a-uno) se cargan con joinedload, en la misma consulta,
+    y las colecciones con selectinload, en una consulta extra por nivel con WHERE ... IN, para no multiplicar
+    las filas del JOIN.
+
+    Args:
+        model: Modelo ORM raíz (Sale, Customer, ...).
+        *paths (str): Rutas de relaciones.
+        strategy (str, opcional): "joined" o "selectin" para forzar la misma estrategia en todas las relaciones.
+
+    Returns:
+        list: Opciones para Query.options / Select.options.
+
+    Raises:
+        ValueError: Si la estrategia no existe o alguna ruta no es una relación del modelo.
+
+    Ejemplo:
+        >>> session.query(Customer).options(*load_options(Customer, "city.country")).all()
+    """
+    if strategy is not None and strategy not in STRATEGIES:
+        raise ValueError(f"strategy debe ser una de {tuple(STRATEGIES)}.")
+    options = []
+    for path in paths:
+        option = None
+        current = model
+        for name in path.split("."):
+            relationship = current.__mapper__.relationships.get(name)
+            if relationship is None:
+                raise ValueError(f"{current.__name__} no tiene la relación {name!r} ({path}).")
+            loader = strategy or ("selectin" if relationship.uselist else "joined")
+            attribute = getattr(current, name)
+            option = (
+                STRATEGIES[loader](attribute)
+                if option is None
+                else getattr(option, f"{loader}load")(attribute)
+            )
+            current = relationship.mapper.class_
+        options.append(option)
+    return options
+
+
+def register_profile(name: str, model, *paths: str, strategy: str = None):
+    """
+    Registra (o reemplaza) un perfil de carga con nombre.
+
+    Ejemplo:
+        >>> register_profile("product_with_sales", Product, "category", "sales")
+    """
+    load_options(model, *paths, strategy=strategy)
+    PROFILES[name] = (model, paths, strategy)
+
+
+def profile_options(name: str) -> list:
+    """
+    Devuelve las opciones de carga de un perfil registrado.
+
+    Raises:
+        ValueError: Si el perfil no existe.
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Perfil de carga desconocido: {name}. Disponibles: {sorted(PROFILES)}")
+    model, paths, strategy = PROFILES[name]
+    return load_options(model, *paths, strategy=strategy)
+
+
+def query_with_profile(session, name: str):
+    """
+    Devuelve session.query(<modelo del perfil>) con las opciones de carga del perfil.
+
+    Ejemplo:
+        >>> ventas = query_with_profile(session, "sale_with_dimensions").limit(100).all()
+        >>> ventas[0].product.category.CategoryName  # sin consultas adicionales
+    """
+    options = profile_options(name)
+    return session.query(PROFILES[name][0]).options(*options)
+
+
+def select_with_profile(name: str):
+    """
+    Devuelve select(<modelo del perfil>) con las opciones de carga del perfil (estilo 2.0, session.scalars).
+    """
+    options = profile_options(name)
+    return select(PROFILES[name][0]).options(*options)
+
+
+register_profile("sale_with_dimensions", Sale, "product.category", "customer.city.country", "employee")
+register_profile("customer_with_location", Customer, "city.country")
+register_profile("employee_with_location", Employee, "city.country")
+register_profile("product_with_category", Product, "category")
+register_profile("category_with_products", Category, "products")
+
+
+class LazyLoadDetector:
+    """
+    Detector de consultas N+1: cuenta las cargas perezosas (lazy loads) de relaciones por sesión
+    y registra una advertencia cuando una misma relación se carga de a un objeto más de threshold veces
+    en una sesión, sugiriendo un perfil de carga o load_options.
+
+    Se engancha al evento do_orm_execute de una sesión, de un sessionmaker o del scoped_session
+    de DBConnection (ver DBConnection.enable_lazy_load_detection), así que no cambia las consultas.
+
+    Args:
+        target: Session, sessionmaker o scoped_session a observar.
+        threshold (int): Cargas perezosas de una relación por sesión a partir de las cuales se advierte.
+            Por defecto 10.
+
+    Ejemplo:
+        >>> detector = LazyLoadDetector(session, threshold=5)
+        >>> [c.city.CityName for c in session.query(Customer).limit(50)]
+        >>> detector.report()
+    """
+
+    def __init__(self, target, threshold: int = 10):
+        if threshold <= 0:
+            raise ValueError("threshold debe ser un entero positivo.")
+        self.target = getattr(target, "session_factory", target)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakKeyDictionary()
+        self._totals = {}
+        self._flagged = {}
+        event.listen(self.target, "do_orm_execute", self._on_execute)
+
+    def detach(self):
+        """
+        Desengancha el detector.
+        """
+        if event.contains(self.target, "do_orm_execute", self._on_execute):
+            event.remove(self.target, "do_orm_execute", self._on_execute)
+
+    def _on_execute(self, state):
+        """
+        Metodo privado que cuenta las cargas perezosas de relaciones y advierte al superar el umbral.
+        """
+        if not state.is_relationship_load or state.lazy_loaded_from is None:
+            return
+        relationship = str(state.loader_strategy_path[-1])
+        with self._lock:
+            counts = self._sessions.setdefault(state.session, {})
+            counts[relationship] = counts.get(relationship, 0) + 1
+            self._totals[relationship] = self._totals.get(relationship, 0) + 1
+            if counts[relationship] != self.threshold + 1:
+                return
+            self._flagged[relationship] = self._flagged.get(relationship, 0) + 1
+        logger.warning(
+            f"Posible N+1: {relationship} se cargó de a un objeto más de {self.threshold} veces en una sesión. "
+            f"Usar un perfil de carga (query_with_profile) o load_options con selectinload/joinedload."
+        )
+
+    def report(self) -> pd.DataFrame:
+        """
+        Devuelve las cargas perezosas observadas.
+
+        Returns:
+            pd.DataFrame: Una fila por relación con "relationship", "lazy_loads" (total) y "flagged_sessions"
+            (sesiones en las que superó el umbral), ordenada por lazy_loads descendente.
+        """
+        with self._lock:
+            rows = [
+                {"relationship": name, "lazy_loads": total, "flagged_sessions": self._flagged.get(name, 0)}
+                for name, total in self._totals.items()
+            ]
+        return (
+            pd.DataFrame(rows, columns=["relationship", "lazy_loads", "flagged_sessions"])
+            .sort_values("lazy_loads", ascending=False)
+            .reset_index(drop=True)
+        )
+
+    def reset(self):
+        """
+        Descarta los conteos acumulados.
+        """
+        with self._lock:
+            self._sessions = weakref.WeakKeyDictionary()
+            self._totals = {}
+            self._flagged = {}
@@ -0,0 +1,366 @@
+from datetime import datetime
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    DECIMAL,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    select,
+    text,
+)
+import pandas as pd
+from src.utils.logger import logger
+
+metadata = MetaData()
+
+watermarks = Table(
+    "mv_watermarks",
+    metadata,
+    Column("SummaryName", String(64), primary_key=True),
+    Column("LastSalesID", BigInteger, nullable=False),
+    Column("RefreshedAt", DateTime),
+)
+
+
+class MaterializedSummary:
+    """
+    Definición de un resumen materializado de la tabla sales.
+
+    Args:
+        name (str): Nombre del resumen (clave en mv_watermarks).
+        table (Table): Tabla física donde se guarda el resumen.
+        keys (list[str]): Columnas clave del resumen.
+        additive (list[str]): Columnas que se suman al refrescar incrementalmente.
+        source_sql (str): SELECT agregado sobre sales filtrado por :desde < SalesID <= :hasta,
+            que devuelve las columnas keys + replaced + additive en ese orden.
+        replaced (list[str], opcional): Columnas que se reemplazan por el último valor (atributos de la clave).
+        serve_sql (str, opcional): SELECT sobre la tabla materializada que reproduce la forma de una vista.
+    """
+
+    def __init__(self, name, table, keys, additive, source_sql, replaced=None, serve_sql=None):
+        self.name = name
+        self.table = table
+        self.keys = keys
+        self.additive = additive
+        self.replaced = replaced or []
+        self.source_sql = source_sql
+        self.serve_sql = serve_sql
+
+    @property
+    def columns(self):
+        return self.keys + self.replaced + self.additive
+
+
+PRODUCT_SUMMARY = MaterializedSummary(
+    name="ventas_producto",
+    table=Table(
+        "mv_ventas_producto",
+        metadata,
+        Column("ProductID", Integer, primary_key=True),
+        Column("CategoryID", Integer),
+        Column("TotalUnidadesVendidas", BigInteger, nullable=False),
+        Column("TotalFacturado", DECIMAL(18, 2), nullable=False),
+        Column("SumaPrecioUnitario", DECIMAL(24, 6), nullable=False),
+        Column("CantidadPrecioUnitario", BigInteger, nullable=False),
+        Column("CantidadVentas", BigInteger, nullable=False),
+    ),
+    keys=["ProductID"],
+    replaced=["CategoryID"],
+    additive=[
+        "TotalUnidadesVendidas",
+        "TotalFacturado",
+        "SumaPrecioUnitario",
+        "CantidadPrecioUnitario",
+        "CantidadVentas",
+    ],
+    source_sql="""
+        select s.ProductID, p.CategoryID, coalesce(sum(s.Quantity), 0), coalesce(sum(s.TotalPrice), 0),
+        coalesce(sum(s.TotalPrice / nullif(s.Quantity, 0)), 0), count(s.TotalPrice / nullif(s.Quantity, 0)), count(*)
+        from sales s join products p on s.ProductID = p.ProductID
+        where s.SalesID > :desde and s.SalesID <= :hasta
+        group by s.ProductID, p.CategoryID
+    """,
+    serve_sql="""
+        select m.ProductID, p.ProductName, c.CategoryName,
+        round(1.0 * m.SumaPrecioUnitario / nullif(m.CantidadPrecioUnitario, 0), 2) as PrecioUnitarioPromedio,
+        m.TotalUnidadesVendidas, m.TotalFacturado,
+        round(1.0 * m.TotalFacturado / nullif(m.TotalUnidadesVendidas, 0), 2) as TicketPromedio
+        from mv_ventas_producto m
+        join products p on m.ProductID = p.ProductID
+        join categories c on p.CategoryID = c.CategoryID
+    """,
+)
+
+CATEGORY_SUMMARY = MaterializedSummary(
+    name="ventas_categoria",
+    table=Table(
+        "mv_ventas_categoria",
+        metadata,
+        Column("CategoryID", Integer, primary_key=True),
+        Column("TotalUnidadesVendidas", BigInteger, nullable=False),
+        Column("TotalFacturado", DECIMAL(18, 2), nullable=False),
+        Column("CantidadVentas", BigInteger, nullable=False),
+    ),
+    keys=["CategoryID"],
+    additive=["TotalUnidadesVendidas", "TotalFacturado", "CantidadVentas"],
+    source_sql="""
+        select p.CategoryID, coalesce(sum(s.Quantity), 0), coalesce(sum(s.TotalPrice), 0), count(*)
+        from sales s join products p on s.ProductID = p.ProductID
+        where s.SalesID > :desde and s.SalesID <= :hasta
+        group by p.CategoryID
+    """,
+)
+
+EMPLOYEE_SUMMARY = MaterializedSummary(
+    name="ventas_empleado",
+    table=Table(
+        "mv_ventas_empleado",
+        metadata,
+        Column("EmployeeID", Integer, primary_key=True),
+        Column("TotalVentas", DECIMAL(18, 2), nullable=False),
+        Column("SumaCuadrados", DECIMAL(30, 4), nullable=False),
+        Column("CantidadVentas", BigInteger, nullable=False),
+        Column("CantidadProductos", BigInteger, nullable=False),
+    ),
+    keys=["EmployeeID"],
+    additive=["TotalVentas", "SumaCuadrados", "CantidadVentas", "CantidadProductos"],
+    source_sql="""
+        select s.SalesPersonID, coalesce(sum(s.TotalPrice), 0), coalesce(sum(s.TotalPrice * s.TotalPrice), 0),
+        count(s.TotalPrice), count(s.ProductID)
+        from sales s
+        where s.SalesID > :desde and s.SalesID <= :hasta
+        group by s.SalesPersonID
+    """,
+)
+
+
+class MaterializedSummaries:
+    """
+    Administra los resúmenes materializados de ventas (por producto, categoría y empleado).
+
+    Cada resumen es una tabla real con columnas aditivas (sumas y conteos). Refrescar un resumen
+    agrega solo las ventas con SalesID mayor a la última marca de agua (watermark) guardada en
+    mv_watermarks y suma esos parciales a las filas existentes (upsert), sin volver a recorrer
+    toda la tabla sales. Se asume que las ventas nuevas llegan con SalesID crecientes; si se cargan
+    ventas con SalesID menores a la marca de agua, usar rebuild.
+
+    Con attach, DBConnection.query_view sirve las vistas registradas (por defecto
+    vw_resumen_ventas_producto) desde la tabla materializada cuando está al día.
+
+    Args:
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection.
+        summaries (list[MaterializedSummary], opcional): Resúmenes a administrar. Por defecto los tres predefinidos.
+        auto_refresh (bool): Si es True, query_view refresca el resumen cuando está desactualizado
+            en lugar de consultar la vista original. Por defecto False.
+
+    Ejemplo:
+        >>> db = DBConnection()
+        >>> mv = MaterializedSummaries().create().attach(db)
+        >>> mv.refresh_all()
+        >>> db.query_view("vw_resumen_ventas_producto")  # se sirve desde mv_ventas_producto
+    """
+
+    VIEWS = {"vw_resumen_ventas_producto": "ventas_producto"}
+
+    def __init__(self, engine=None, summaries=None, auto_refresh=False):
+        if engine is None:
+            from src.db.database import DBConnection
+
+            engine = DBConnection().engine
+        self.engine = engine
+        self.summaries = {
+            s.name: s
+            for s in (summaries or [PRODUCT_SUMMARY, CATEGORY_SUMMARY, EMPLOYEE_SUMMARY])
+        }
+        self.views = dict(self.VIEWS)
+        self.auto_refresh = auto_refresh
+
+    def create(self):
+        """
+        Crea las tablas materializadas y la tabla de marcas de agua si no existen.
+        """
+        tables = [watermarks] + [s.table for s in self.summaries.values()]
+        metadata.create_all(self.engine, tables=tables)
+        return self
+
+    def attach(self, db):
+        """
+        Registra los resúmenes en una instancia de DBConnection para que query_view los utilice.
+        """
+        db.materialized = self
+        return self
+
+    def watermark(self, name: str) -> int:
+        """
+        Devuelve el último SalesID incorporado al resumen (0 si nunca se refrescó).
+        """
+        with self.engine.connect() as connection:
+            value = connection.execute(
+                select(watermarks.c.LastSalesID).where(watermarks.c.SummaryName == name)
+            ).scalar()
+        return value or 0
+
+    def refresh(self, name: str) -> int:
+        """
+        Refresca incrementalmente un resumen con las ventas nuevas desde su marca de agua.
+
+        Returns:
+            int: Cantidad de SalesID nuevos cubiertos (hasta - desde), 0 si ya estaba al día.
+        """
+        summary = self.summaries[name]
+        with self.engine.begin() as connection:
+            desde = connection.execute(
+                select(watermarks.c.LastSalesID).where(watermarks.c.SummaryName == name)
+            ).scalar() or 0
+            hasta = connection.execute(text("select coalesce(max(SalesID), 0) from sales")).scalar()
+            if hasta <= desde:
+                return 0
+
+            connection.execute(
+                text(self._upsert_sql(summary)), {"desde": desde, "hasta": hasta}
+            )
+            connection.execute(
+                text(self._watermark_sql()),
+                {"name": name, "hasta": hasta, "ahora": datetime.now()},
+            )
+
+        logger.info(f"Resumen {name} refrescado: SalesID ({desde}, {hasta}].")
+        return hasta - desde
+
+    def refresh_all(self) -> dict:
+        """
+        Refresca incrementalmente todos los resúmenes.
+        """
+        return {name: self.refresh(name) for name in self.summaries}
+
+    def rebuild(self, name: str) -> int:
+        """
+        Vacía un resumen y su marca de agua y lo recalcula desde cero.
+        """
+        summary = self.summaries[name]
+        with self.engine.begin() as connection:
+            connection.execute(summary.table.delete())
+            connection.execute(watermarks.delete().where(watermarks.c.SummaryName == name))
+        return self.refresh(name)
+
+    def is_fresh(self, name: str) -> bool:
+        """
+        Indica si el resumen incluye todas las ventas actuales (marca de agua >= max(SalesID)).
+        """
+        with self.engine.connect() as connection:
+            hasta = connection.execute(text("select coalesce(max(SalesID), 0) from sales")).scalar()
+        return self.watermark(name) >= hasta
+
+    def serving_query(self, view_name: str):
+        """
+        Devuelve el SELECT que sirve la vista desde la tabla materializada si el resumen está al día
+        (o se pudo refrescar con auto_refresh), o None si debe consultarse la vista original.
+        """
+        name = self.views.get(view_name.lower())
+        if name is None or self.summaries[name].serve_sql is None:
+            return None
+        if not self.is_fresh(name):
+            if not self.auto_refresh:
+                return None
+            self.refresh(name)
+        return self.summaries[name].serve_sql
+
+    def read(self, name: str) -> pd.DataFrame:
+        """
+        Devuelve el contenido de la tabla materializada de un resumen como DataFrame.
+        """
+        return self._query(select(self.summaries[name].table))
+
+    def top_products_by_category(self, n: int = 1) -> pd.DataFrame:
+        """
+        Productos más vendidos (por unidades) de cada categoría, con dense_rank <= n,
+        calculado sobre mv_ventas_producto en lugar de recorrer sales.
+        """
+        return self._query(
+            text("""
+            with ranked_products as (
+            select c.CategoryName, p.ProductName, m.TotalUnidadesVendidas as total_vendido,
+            dense_rank() over (
+            partition by c.CategoryName
+            order by m.TotalUnidadesVendidas desc
+            ) as ds
+            from mv_ventas_producto m join products p on m.ProductID = p.ProductID
+            join categories c on p.CategoryID = c.CategoryID)
+            select * from ranked_products
+            where ds <= :n
+            order by CategoryName, ds
+            """),
+            {"n": n},
+        )
+
+    def category_share(self, category_id: int = None) -> pd.DataFrame:
+        """
+        Total facturado por producto y su porcentaje dentro de la categoría y del total general,
+        calculado sobre mv_ventas_producto y mv_ventas_categoria.
+        Con category_id devuelve lo mismo que sp_porcentaje_producto_total para esa categoría.
+        """
+        where = "where m.CategoryID = :category_id" if category_id is not None else ""
+        return self._query(
+            text(f"""
+            select
+                m.CategoryID, c.CategoryName, p.ProductName, m.TotalFacturado,
+                t.TotalFacturado as TotalCategoria, g.GranTotal,
+                round(100.0 * m.TotalFacturado / t.TotalFacturado, 2) as PorcentajeEnCategoria,
+                round(100.0 * m.TotalFacturado / g.GranTotal, 2) as PorcentajeEnTotal
+            from mv_ventas_producto m
+            join products p on m.ProductID = p.ProductID
+            join categories c on m.CategoryID = c.CategoryID
+            join mv_ventas_categoria t on m.CategoryID = t.CategoryID
+            cross join (select sum(TotalFacturado) as GranTotal from mv_ventas_categoria) g
+            {where}
+            order by c.CategoryName, PorcentajeEnCategoria desc
+            """),
+            {"category_id": category_id},
+        )
+
+    def _query(self, statement, params=None) -> pd.DataFrame:
+        """
+        Metodo privado que ejecuta una consulta y devuelve el resultado como DataFrame.
+        """
+        with self.engine.connect() as connection:
+            result = connection.execute(statement, params or {})
+            return pd.DataFrame(result.fetchall(), columns=result.keys())
+
+    def _upsert_sql(self, summary: MaterializedSummary) -> str:
+        """
+        Metodo privado que arma el INSERT ... SELECT con upsert según el motor de base de datos.
+        """
+        columns = ", ".join(summary.columns)
+        insert = f"insert into {summary.table.name} ({columns}) {summary.source_sql}"
+        if self.engine.dialect.name == "mysql":
+            updates = [f"{c} = {c} + values({c})" for c in summary.additive]
+            updates += [f"{c} = values({c})" for c in summary.replaced]
+            return f"{insert} on duplicate key update {', '.join(updates)}"
+
+        updates = [f"{c} = {summary.table.name}.{c} + excluded.{c}" for c in summary.additive]
+        updates += [f"{c} = excluded.{c}" for c in summary.replaced]
+        return (
+            f"{insert} on conflict ({', '.join(summary.keys)}) "
+            f"do update set {', '.join(updates)}"
+        )
+
+    def _watermark_sql(self) -> str:
+        """
+        Metodo privado que arma el upsert de la marca de agua según el motor de base de datos.
+        """
+        insert = (
+            "insert into mv_watermarks (SummaryName, LastSalesID, RefreshedAt) "
+            "values (:name, :hasta, :ahora)"
+        )
+        if self.engine.dialect.name == "mysql":
+            return (
+                f"{insert} on duplicate key update "
+                "LastSalesID = values(LastSalesID), RefreshedAt = values(RefreshedAt)"
+            )
+        return (
+            f"{insert} on conflict (SummaryName) do update set "
+            "LastSalesID = excluded.LastSalesID, RefreshedAt = excluded.RefreshedAt"
+        )
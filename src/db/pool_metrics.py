@@ -0,0 +1,108 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Contadores acumulados de uso del pool de conexiones.
+
+    Atributos:
+        checkouts (int): Cantidad de conexiones entregadas por el pool.
+        connections_created (int): Cantidad de conexiones nuevas abiertas contra la base de datos.
+        overflow_events (int): Veces que se abrió una conexión por encima de pool_size.
+        timeouts (int): Veces que se agotó pool_timeout esperando una conexión.
+        wait_time_total (float): Segundos totales esperando obtener una conexión.
+        wait_time_max (float): Mayor espera individual, en segundos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Pone todos los contadores en cero.
+        """
+        with self._lock:
+            self.checkouts = 0
+            self.connections_created = 0
+            self.overflow_events = 0
+            self.timeouts = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += wait
+            self.wait_time_max = max(self.wait_time_max, wait)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_time_total += wait
+            self.wait_time_max = max(self.wait_time_max, wait)
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_created += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que registra métricas de uso (PoolMetrics) en cada checkout:
+    tiempo de espera, conexiones creadas, eventos de overflow y timeouts.
+
+    Ejemplo:
+        >>> engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_size=5)
+        >>> engine.pool.metrics.wait_time_max
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        overflow_before = self.overflow()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        overflowed = self.overflow() > max(overflow_before, 0)
+        self.metrics.record_checkout(time.perf_counter() - start, overflowed)
+        return connection
+
+    def _create_connection(self):
+        connection = super()._create_connection()
+        self.metrics.record_connect()
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def snapshot(self) -> dict:
+        """
+        Devuelve el estado actual del pool junto con las métricas acumuladas.
+        """
+        m = self.metrics
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": m.checkouts,
+            "connections_created": m.connections_created,
+            "overflow_events": m.overflow_events,
+            "timeouts": m.timeouts,
+            "wait_time_total": m.wait_time_total,
+            "wait_time_avg": m.wait_time_total / m.checkouts if m.checkouts else 0.0,
+            "wait_time_max": m.wait_time_max,
+        }
@@ -0,0 +1,334 @@
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import pandas as pd
+from sqlalchemy import event, text
+from src.db.cache import normalize_sql
+from src.utils.logger import logger
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.:])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_EXPLAINABLE = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+
+
+def fingerprint(query: str) -> str:
+    """
+    Devuelve la "huella" de una consulta: el SQL normalizado con los literales reemplazados por "?"
+    y las listas de valores colapsadas, de modo que consultas que solo difieren en sus valores
+    se agrupen juntas en las estadísticas.
+
+    Ejemplo:
+        >>> fingerprint("SELECT * FROM sales WHERE SalesID IN (1, 2, 3) AND Discount > 0.1")
+        'SELECT * FROM sales WHERE SalesID IN (?+) AND Discount > ?'
+    """
+    sql = normalize_sql(query)
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _VALUE_LIST.sub("(?+)", sql)
+
+
+class QueryRecord:
+    """
+    Medición de una consulta ejecutada a través de DBConnection.
+
+    Atributos:
+        kind (str): Método que la ejecutó ("execute_query", "query_view", "call_procedure", "execute_ddl").
+        sql (str): SQL enviado a la base de datos.
+        fingerprint (str): Huella de la consulta (ver fingerprint).
+        started_at (float): Momento de inicio (time.time()).
+        total_seconds (float): Duración total, incluida la construcción del DataFrame.
+        execute_seconds (float): Tiempo dentro de cursor.execute según los eventos del engine
+            (None si la consulta no pasó por el engine, como los stored procedures).
+        dataframe_seconds (float): Tiempo de construcción del DataFrame.
+        statements (int): Sentencias enviadas al cursor.
+        rows (int): Filas devueltas.
+        bytes (int): Tamaño en memoria del resultado (aproximación de los bytes transferidos).
+        error (str): Mensaje de error, si la consulta falló.
+        explain (pd.DataFrame): Plan de ejecución, capturado solo para las consultas lentas.
+    """
+
+    def __init__(self, kind: str, sql: str, params=None):
+        self.kind = kind
+        self.sql = sql
+        self.params = params
+        self.fingerprint = fingerprint(sql)
+        self.started_at = time.time()
+        self.total_seconds = None
+        self.execute_seconds = None
+        self.dataframe_seconds = None
+        self.statements = 0
+        self.rows = None
+        self.bytes = None
+        self.error = None
+        self.explain = None
+        self.discarded = False
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "started_at": self.started_at,
+            "total_seconds": self.total_seconds,
+            "execute_seconds": self.execute_seconds,
+            "dataframe_seconds": self.dataframe_seconds,
+            "statements": self.statements,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "error": self.error,
+        }
+
+
+class QueryProfiler:
+    """
+    Perfilador de consultas basado en los eventos before/after_cursor_execute del engine.
+
+    Cada consulta ejecutada dentro de track genera un QueryRecord con su huella, duración total,
+    tiempo de ejecución en el cursor, filas, bytes y tiempo de construcción del DataFrame.
+    Las consultas que superan slow_threshold se informan en el log y, si explain es True,
+    se guarda su plan de ejecución (EXPLAIN en MySQL, EXPLAIN QUERY PLAN en SQLite).
+    Los registros se conservan en memoria (los últimos max_records) y se resumen con stats.
+
+    Args:
+        engine (Engine): Engine de SQLAlchemy a instrumentar.
+        slow_threshold (float, opcional): Segundos a partir de los cuales una consulta es lenta.
+            None desactiva la detección. Por defecto 1.0.
+        explain (bool): Capturar el plan de ejecución de las consultas lentas. Por defecto True.
+        max_records (int): Cantidad máxima de registros conservados. Por defecto 10000.
+
+    Ejemplo:
+        >>> profiler = QueryProfiler(engine, slow_threshold=0.5)
+        >>> with profiler.track("execute_query", sql) as record:
+        ...     ...
+        >>> profiler.stats()[["fingerprint", "count", "p50", "p95", "p99"]]
+    """
+
+    def __init__(
+        self,
+        engine,
+        slow_threshold: float = 1.0,
+        explain: bool = True,
+        max_records: int = 10000,
+    ):
+        self.engine = engine
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self):
+        """
+        Quita los listeners del engine. Los registros acumulados se conservan.
+        """
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(self.engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @property
+    def current(self) -> QueryRecord:
+        """
+        Registro activo en el hilo actual, o None.
+        """
+        return getattr(self._local, "record", None)
+
+    @contextmanager
+    def track(self, kind: str, sql: str, params=None):
+        """
+        Mide todo lo que se ejecute dentro del bloque como una sola consulta.
+        Si ya hay un registro activo en el hilo (por ejemplo, query_view que llama a execute_query),
+        se reutiliza ese registro en lugar de crear uno nuevo.
+        """
+        if self.current is not None:
+            yield self.current
+            return
+
+        record = QueryRecord(kind, sql, params)
+        self._local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            record.total_seconds = time.perf_counter() - start
+            self._local.record = None
+            self._finish(record)
+
+    def record_result(self, df: pd.DataFrame, dataframe_seconds: float):
+        """
+        Asocia el resultado de la consulta al registro activo: filas, bytes y tiempo de construcción del DataFrame.
+        """
+        record = self.current
+        if record is None:
+            return
+        record.rows = len(df)
+        record.bytes = int(df.memory_usage(deep=True).sum())
+        record.dataframe_seconds = dataframe_seconds
+
+    def discard(self):
+        """
+        Descarta el registro activo (por ejemplo, cuando el resultado sale de la caché y no de la base de datos).
+        """
+        if self.current is not None:
+            self.current.discarded = True
+
+    def records(self) -> pd.DataFrame:
+        """
+        Devuelve todos los registros conservados, uno por fila.
+        """
+        with self._lock:
+            rows = [record.as_dict() for record in self._records]
+        return pd.DataFrame(rows, columns=list(QueryRecord("", "").as_dict()))
+
+    def slow_queries(self) -> pd.DataFrame:
+        """
+        Devuelve los registros de las consultas lentas, con su plan de ejecución en la columna "explain".
+        """
+        with self._lock:
+            slow = [record for record in self._records if self._is_slow(record)]
+        df = pd.DataFrame(
+            [record.as_dict() for record in slow],
+            columns=list(QueryRecord("", "").as_dict()),
+        )
+        df["explain"] = [record.explain for record in slow]
+        return df
+
+    def stats(self) -> pd.DataFrame:
+        """
+        Resume los registros por huella: cantidad de ejecuciones, tiempo total, percentiles p50/p95/p99
+        y máximo de la duración, filas y bytes promedio, tiempo promedio de construcción del DataFrame
+        y cantidad de consultas lentas. Ordenado por tiempo total descendente.
+
+        Ejemplo:
+            >>> db.profiler.stats().head(10)
+        """
+        records = self.records()
+        columns = [
+            "fingerprint",
+            "kind",
+            "count",
+            "errors",
+            "slow",
+            "total_seconds",
+            "mean",
+            "p50",
+            "p95",
+            "p99",
+            "max",
+            "execute_seconds_mean",
+            "dataframe_seconds_mean",
+            "rows_mean",
+            "bytes_total",
+        ]
+        if records.empty:
+            return pd.DataFrame(columns=columns)
+
+        records["is_slow"] = [
+            self.slow_threshold is not None and seconds >= self.slow_threshold
+            for seconds in records["total_seconds"]
+        ]
+        grouped = records.groupby("fingerprint", sort=False)
+        duration = grouped["total_seconds"]
+        stats = pd.DataFrame(
+            {
+                "kind": grouped["kind"].first(),
+                "count": duration.size(),
+                "errors": grouped["error"].count(),
+                "slow": grouped["is_slow"].sum(),
+                "total_seconds": duration.sum(),
+                "mean": duration.mean(),
+                "p50": duration.quantile(0.50),
+                "p95": duration.quantile(0.95),
+                "p99": duration.quantile(0.99),
+                "max": duration.max(),
+                "execute_seconds_mean": grouped["execute_seconds"].mean(),
+                "dataframe_seconds_mean": grouped["dataframe_seconds"].mean(),
+                "rows_mean": grouped["rows"].mean(),
+                "bytes_total": grouped["bytes"].sum(),
+            }
+        )
+        return (
+            stats.reset_index()
+            .sort_values("total_seconds", ascending=False)
+            .reset_index(drop=True)[columns]
+        )
+
+    def dump(self, path: str):
+        """
+        Guarda las estadísticas en un archivo: CSV si la extensión es .csv; en otro caso JSON
+        con las estadísticas y las consultas lentas (incluido su plan de ejecución).
+        """
+        stats = self.stats()
+        if path.endswith(".csv"):
+            stats.to_csv(path, index=False)
+            return
+        slow = self.slow_queries()
+        slow["explain"] = [
+            None if plan is None else plan.astype(str).to_dict(orient="records")
+            for plan in slow["explain"]
+        ]
+        payload = {
+            "stats": json.loads(stats.to_json(orient="records")),
+            "slow_queries": json.loads(slow.to_json(orient="records")),
+        }
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2)
+
+    def reset(self):
+        """
+        Descarta todos los registros acumulados.
+        """
+        with self._lock:
+            self._records.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.current is not None:
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        record = self.current
+        starts = conn.info.get("query_start_time")
+        if record is None or not starts:
+            return
+        record.execute_seconds = (record.execute_seconds or 0.0) + time.perf_counter() - starts.pop()
+        record.statements += 1
+
+    def _is_slow(self, record) -> bool:
+        return self.slow_threshold is not None and record.total_seconds >= self.slow_threshold
+
+    def _finish(self, record):
+        """
+        Metodo privado que guarda el registro y, si la consulta fue lenta, la informa y captura su EXPLAIN.
+        """
+        if record.discarded:
+            return
+        if self._is_slow(record):
+            logger.warning(
+                f"Consulta lenta ({record.total_seconds:.3f}s, {record.kind}): {record.fingerprint}"
+            )
+            if self.explain and record.error is None:
+                record.explain = self._explain(record.sql, record.params)
+        with self._lock:
+            self._records.append(record)
+
+    def _explain(self, sql, params):
+        """
+        Metodo privado que obtiene el plan de ejecución de una consulta SELECT.
+        """
+        if not _EXPLAINABLE.match(sql):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            with self.engine.connect() as connection:
+                result = connection.execute(text(prefix + sql), params)
+                return pd.DataFrame(result.fetchall(), columns=result.keys())
+        except Exception as e:
+            logger.warning(f"No se pudo obtener el plan de ejecución: {str(e)}")
+            return None
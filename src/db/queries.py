@@ -0,0 +1,96 @@
+# Consultas de reportes de main.ipynb (SQL de MySQL). Las usan el asesor de índices
+# (src.db.indexes.IndexAdvisor) y los benchmarks de backends (benchmarks/bench_backends.py).
+from src.db.compat import VIEWS
+
+REPORT_QUERIES = {
+    "ventas": """
+        select SalesID, s.ProductID, ProductName, Quantity, TotalPrice, c.CustomerID,
+        coalesce(concat( c.LastName, ", ", c.FirstName, " ", c.MiddleInitial, "."), "Sin nombre") as CustomerName,
+        e.EmployeeID, concat(e.LastName, ", ", e.FirstName, " ", e.MiddleInitial, ".") as EmployeeName
+        from sales s join products p on s.productid = p.ProductID
+        join customers c on s.CustomerID = c.CustomerID
+        join employees e on s.SalesPersonID = e.EmployeeID
+        order by c.CustomerID;
+    """,
+    # misma consulta que "ventas" sin los JOIN: los nombres los agrega DimensionCache.enrich
+    "ventas_hechos": """
+        select SalesID, ProductID, Quantity, TotalPrice, CustomerID, SalesPersonID as EmployeeID
+        from sales
+        order by CustomerID;
+    """,
+    "ubicacion_clientes": """
+        select CustomerID, FirstName, coalesce(MiddleInitial, "") as MiddleInitial, LastName, Address, CityName, CountryName
+        from customers cu join cities ci on cu.cityID = ci.CityID
+        join countries co on ci.CountryID = co.CountryID;
+    """,
+    "top_producto_categoria": """
+        with ranked_products as (
+        select c.CategoryName, p.ProductName, sum(Quantity) as total_vendido,
+        dense_rank() over (
+        partition by c.CategoryName
+        order by sum(s.Quantity) desc
+        ) as ds
+        from products p join categories c on p.CategoryID = c.CategoryID
+        join sales s on s.ProductID = p.ProductID
+        group by c.CategoryName, p.ProductName
+        order by c.categoryName, ds)
+        select * from ranked_products
+        where ds<= 1
+        order by categoryname, ds;
+    """,
+    "porcentaje_categoria": """
+        with ventas_por_categoria as (
+            select
+                c.CategoryID, c.CategoryName, p.ProductID, p.ProductName, SUM(s.TotalPrice) AS TotalFacturado
+            from sales s
+            join products p ON s.ProductID = p.ProductID
+            join categories c ON p.CategoryID = c.CategoryID
+            group by c.CategoryID, c.CategoryName, p.ProductID, p.ProductName
+        ),
+        totales_categoria as (
+            select CategoryID, SUM(TotalFacturado) AS TotalCategoria
+            from ventas_por_categoria
+            group by CategoryID
+        ),
+        total_general_ventas as (
+            select SUM(TotalFacturado) AS GranTotal from ventas_por_categoria
+        )
+        select
+            v.CategoryID, v.CategoryName, v.ProductName, v.TotalFacturado, t.TotalCategoria, g.GranTotal,
+            ROUND(100 * v.TotalFacturado / t.TotalCategoria, 2) AS PorcentajeEnCategoria,
+            ROUND(100 * v.TotalFacturado / g.GranTotal, 2) AS PorcentajeEnTotal
+        from ventas_por_categoria v
+        join totales_categoria t ON v.CategoryID = t.CategoryID
+        cross join total_general_ventas g
+        order by v.CategoryName, PorcentajeEnCategoria DESC;
+    """,
+    "resumen_ventas_producto": VIEWS["vw_resumen_ventas_producto"],
+    "ventas_de_producto": """
+        select SalesID, Quantity, TotalPrice from sales where ProductID = :product_id
+    """,
+}
+
+# Consulta de hechos de ventas: solo columnas de sales (ver src.db.dimensions.DimensionCache).
+FACT_QUERY = REPORT_QUERIES["ventas_hechos"]
+
+# Parámetros de ejemplo de las consultas parametrizadas (para EXPLAIN y benchmarks).
+QUERY_PARAMS = {"ventas_de_producto": {"product_id": 1}}
+
+
+def register_query(name: str, sql: str, params: dict = None):
+    """
+    Registra una consulta de reporte para que el asesor de índices la analice.
+
+    Args:
+        name (str): Nombre de la consulta.
+        sql (str): Consulta SQL (de MySQL).
+        params (dict, opcional): Valores de ejemplo de sus parámetros.
+
+    Ejemplo:
+        >>> register_query("ventas_empleado", "SELECT * FROM sales WHERE SalesPersonID = :id", {"id": 1})
+    """
+    REPORT_QUERIES[name] = sql
+    if params is not None:
+        QUERY_PARAMS[name] = params
+    else:
+        QUERY_PARAMS.pop(name, None)
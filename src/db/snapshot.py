@@ -0,0 +1,453 @@
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import text
+from src.db.cache import referenced_tables
+from src.db.compat import VIEWS, call_procedure, parse_call, to_embedded_sql
+from src.db.dtypes import to_arrow_table
+from src.db.loader import LOAD_ORDER
+from src.utils.logger import logger
+
+# Particionado por tabla: (columna, tamaño del rango). Con tamaño None se crea un directorio por valor.
+PARTITIONING = {
+    "sales": ("SalesID", 1_000_000),
+    "products": ("CategoryID", None),
+}
+
+# Tablas que se actualizan incrementalmente por marca de agua (columna creciente).
+WATERMARKS = {"sales": "SalesID"}
+
+MANIFEST = "_snapshot.json"
+NULL_PARTITION = "__null__"
+
+
+class SnapshotStore:
+    """
+    Snapshot local en Parquet de las tablas mapeadas en src/models (sales, products, customers, ...).
+
+    Cada tabla se guarda en root/<tabla>/ particionada según PARTITIONING: sales por rangos de SalesID
+    (root/sales/SalesID=3000000/...) y products por CategoryID. Las columnas se escriben con los tipos
+    de los modelos ORM (ver src.db.dtypes). Las tablas de WATERMARKS se actualizan incrementalmente:
+    append solo trae las filas con SalesID mayor a la marca de agua guardada en root/_snapshot.json.
+    Las demás tablas (dimensiones chicas) se reescriben completas.
+
+    Los reportes leen el snapshot con SnapshotReader, que tiene la misma interfaz que DBConnection,
+    de modo que no vuelven a consultar la base de datos transaccional.
+
+    Args:
+        root (str): Directorio del snapshot. Por defecto "snapshots".
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection.
+        chunk_size (int): Filas leídas por bloque. Por defecto 100000.
+        partitioning (dict, opcional): Reemplaza entradas de PARTITIONING, por ejemplo
+            {"sales": ("SalesID", 250000)}.
+
+    Ejemplo:
+        >>> store = SnapshotStore("snapshots")
+        >>> store.export()          # primera vez: todas las tablas
+        >>> store.refresh()         # luego: ventas nuevas + dimensiones
+        >>> db = store.reader()
+        >>> df = db.execute_query("SELECT ProductID, SUM(TotalPrice) AS total FROM sales GROUP BY ProductID")
+    """
+
+    def __init__(self, root="snapshots", engine=None, chunk_size=100_000, partitioning=None):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser un entero positivo.")
+        from src.db.database import DBConnection
+
+        self.db = DBConnection() if engine is None else DBConnection.from_engine(engine)
+        self.root = root
+        self.engine = self.db.engine
+        self.chunk_size = chunk_size
+        self.partitioning = {**PARTITIONING, **(partitioning or {})}
+        os.makedirs(root, exist_ok=True)
+
+    def tables(self) -> list:
+        """
+        Devuelve las tablas de los modelos ORM, en orden de dependencias.
+        """
+        from src.db.database import Base
+        import src.models  # noqa: F401  (registra los modelos en Base)
+
+        names = list(Base.metadata.tables)
+        return [t for t in LOAD_ORDER if t in names] + [t for t in names if t not in LOAD_ORDER]
+
+    def manifest(self) -> dict:
+        """
+        Devuelve el contenido de root/_snapshot.json: por tabla, filas, marca de agua y fecha de actualización.
+        """
+        path = os.path.join(self.root, MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def watermark(self, table: str = "sales"):
+        """
+        Devuelve la marca de agua de una tabla incremental (None si nunca se exportó).
+        """
+        return self.manifest().get(table, {}).get("watermark")
+
+    def export(self, tables: list = None) -> pd.DataFrame:
+        """
+        Exporta completas las tablas indicadas (por defecto todas), reemplazando su snapshot anterior.
+
+        Returns:
+            pd.DataFrame: Una fila por tabla con "table", "rows", "seconds" y "rows_per_sec".
+        """
+        stats = []
+        for table in tables or self.tables():
+            start = time.perf_counter()
+            staging = os.path.join(self.root, f".staging-{table}")
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+
+            rows, watermark = self._copy(
+                f"SELECT * FROM {self._quote(table)}", None, table, staging, "part"
+            )
+            if watermark is None and table in WATERMARKS:
+                watermark = 0
+
+            target = os.path.join(self.root, table)
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(staging, target)
+            self._update_manifest(table, rows, watermark, replace=True)
+            stats.append(self._stats(table, rows, start))
+        return pd.DataFrame(stats, columns=["table", "rows", "seconds", "rows_per_sec"])
+
+    def append(self, tables: list = None) -> pd.DataFrame:
+        """
+        Agrega al snapshot las filas nuevas de las tablas incrementales (WATERMARKS), es decir, las que
+        tienen la columna de marca de agua mayor a la guardada. Si una tabla nunca se exportó, la exporta completa.
+
+        Returns:
+            pd.DataFrame: Una fila por tabla con "table", "rows", "seconds" y "rows_per_sec".
+        """
+        stats = []
+        for table in tables or [t for t in self.tables() if t in WATERMARKS]:
+            if table not in WATERMARKS:
+                raise ValueError(f"La tabla {table} no tiene una columna de marca de agua.")
+            watermark = self.watermark(table)
+            if watermark is None:
+                stats.extend(self.export([table]).to_dict("records"))
+                continue
+
+            start = time.perf_counter()
+            column = self._quote(WATERMARKS[table])
+            query = (
+                f"SELECT * FROM {self._quote(table)} "
+                f"WHERE {column} > :watermark ORDER BY {column}"
+            )
+            target = os.path.join(self.root, table)
+            basename = f"append-{datetime.now():%Y%m%d%H%M%S%f}"
+            rows, new_watermark = self._copy(
+                query, {"watermark": watermark}, table, target, basename
+            )
+            if rows:
+                self._update_manifest(table, rows, new_watermark, replace=False)
+            stats.append(self._stats(table, rows, start))
+        return pd.DataFrame(stats, columns=["table", "rows", "seconds", "rows_per_sec"])
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Actualiza el snapshot: incremental para las tablas de WATERMARKS y completo para las dimensiones.
+        """
+        incremental = [t for t in self.tables() if t in WATERMARKS]
+        dimensions = [t for t in self.tables() if t not in WATERMARKS]
+        return pd.concat([self.export(dimensions), self.append(incremental)], ignore_index=True)
+
+    def reader(self, memory_map: bool = True) -> "SnapshotReader":
+        """
+        Devuelve un SnapshotReader sobre este snapshot.
+        """
+        return SnapshotReader(self.root, memory_map=memory_map)
+
+    def _copy(self, query, params, table, directory, basename):
+        """
+        Metodo privado que lee la consulta en bloques y escribe cada bloque particionado en directory.
+        La lectura usa el mismo engine que DBConnection.execute_query_chunks (ver DBConnection._stream_engine),
+        para que con MySQL el resultado se recorra con un cursor del lado del servidor.
+        Los archivos se escriben con extensión .tmp y se renombran al terminar, para que un lector
+        no vea una copia a medias. Devuelve la cantidad de filas y la mayor marca de agua leída
+        (None si no hubo filas).
+        """
+        rows = 0
+        watermark = None
+        written = []
+        watermark_column = WATERMARKS.get(table)
+        try:
+            with self.db._stream_engine().connect() as connection:
+                result = connection.execution_options(
+                    stream_results=True, yield_per=self.chunk_size
+                ).execute(text(query), params)
+                columns = list(result.keys())
+                schema = None
+                for i, chunk in enumerate(result.partitions(self.chunk_size)):
+                    arrow = to_arrow_table(chunk, columns)
+                    if schema is None:
+                        schema = arrow.schema
+                    else:
+                        arrow = arrow.cast(schema)
+                    written += self._write_partitions(table, arrow, directory, f"{basename}-{i}")
+                    rows += arrow.num_rows
+                    if watermark_column and arrow.num_rows:
+                        chunk_max = int(arrow.column(watermark_column).to_pandas().max())
+                        watermark = max(watermark or 0, chunk_max)
+        except Exception:
+            for path in written:
+                os.remove(path)
+            raise
+
+        for path in written:
+            os.replace(path, path[: -len(".tmp")])
+        return rows, watermark
+
+    def _write_partitions(self, table, arrow, directory, basename) -> list:
+        """
+        Metodo privado que escribe un bloque en un archivo Parquet por partición y devuelve las rutas escritas.
+        """
+        import pyarrow.parquet as pq
+
+        column, size = self.partitioning.get(table, (None, None))
+        if column is None:
+            path = os.path.join(directory, f"{basename}.parquet.tmp")
+            pq.write_table(arrow, path)
+            return [path]
+
+        keys = arrow.column(column).to_pandas()
+        if size:
+            keys = keys // size * size
+        paths = []
+        for value, positions in keys.groupby(keys, dropna=False).indices.items():
+            name = NULL_PARTITION if pd.isna(value) else str(int(value))
+            partition = os.path.join(directory, f"{column}={name}")
+            os.makedirs(partition, exist_ok=True)
+            path = os.path.join(partition, f"{basename}.parquet.tmp")
+            pq.write_table(arrow.take(positions), path)
+            paths.append(path)
+        return paths
+
+    def _update_manifest(self, table, rows, watermark, replace):
+        """
+        Metodo privado que actualiza root/_snapshot.json de forma atómica.
+        """
+        manifest = self.manifest()
+        entry = manifest.get(table, {"rows": 0})
+        manifest[table] = {
+            "rows": rows if replace else entry["rows"] + rows,
+            "watermark": watermark,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        path = os.path.join(self.root, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _stats(self, table, rows, start) -> dict:
+        seconds = time.perf_counter() - start
+        rate = rows / seconds if seconds > 0 else float("inf")
+        logger.info(f"Snapshot {table}: {rows} filas en {seconds:.2f}s ({rate:,.0f} filas/s)")
+        return {"table": table, "rows": rows, "seconds": seconds, "rows_per_sec": rate}
+
+    def _quote(self, identifier):
+        return self.engine.dialect.identifier_preparer.quote(identifier)
+
+
+class SnapshotReader:
+    """
+    Lector de un snapshot de SnapshotStore con la misma interfaz de consulta que DBConnection
+    (execute_query, execute_query_chunks, execute_query_arrow y query_view).
+
+    Cada tabla del snapshot se expone como un dataset de pyarrow leído con memory map y se consulta
+    con DuckDB en el mismo proceso, que solo lee las columnas y los row groups que necesita la consulta.
+    Los parámetros se escriben igual que en DBConnection (:nombre) y el SQL de MySQL se traduce con
+    src.db.compat (concat, comillas dobles, stored procedures en Python). Si el snapshot cambia
+    (por ejemplo, tras un append), los datasets se vuelven a registrar en la siguiente consulta.
+
+    Args:
+        root (str): Directorio del snapshot. Por defecto "snapshots".
+        memory_map (bool): Leer los archivos Parquet con memory map. Por defecto True.
+
+    Ejemplo:
+        >>> db = SnapshotReader("snapshots")
+        >>> df_sales = db.execute_query(query_sales)
+        >>> ReportBuilder().set_dataframe(df_sales)...
+    """
+
+    def __init__(self, root="snapshots", memory_map=True):
+        import duckdb
+
+        self.root = root
+        self.memory_map = memory_map
+        self.connection = duckdb.connect()
+        self.views = {}
+        self._lock = threading.Lock()
+        self._registered = set()
+        self._version = None
+
+    def tables(self) -> list:
+        """
+        Devuelve las tablas disponibles en el snapshot.
+        """
+        return sorted(
+            name
+            for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+            and not name.startswith((".", "_"))
+        )
+
+    def dataset(self, table: str):
+        """
+        Devuelve el dataset de pyarrow de una tabla del snapshot.
+        """
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        return ds.dataset(
+            os.path.join(self.root, table),
+            format="parquet",
+            filesystem=fs.LocalFileSystem(use_mmap=self.memory_map),
+        )
+
+    def create_view(self, name: str, sql: str):
+        """
+        Define una vista sobre las tablas del snapshot (por ejemplo, vw_resumen_ventas_producto)
+        para poder usarla con query_view.
+        """
+        sql = to_embedded_sql(sql, "duckdb")
+        with self._lock:
+            self._register(sql)
+            self.connection.execute(f"CREATE OR REPLACE VIEW {name} AS {sql}")
+            self.views[name.lower()] = sql
+        return self
+
+    def execute_query(
+        self, query: str, params: dict = None, typed: str = None
+    ) -> pd.DataFrame:
+        """
+        Ejecuta una consulta SQL sobre el snapshot y devuelve un DataFrame, como DBConnection.execute_query.
+        Con typed="arrow" las columnas quedan respaldadas por Arrow; en otro caso, con tipos de numpy.
+
+        Raises:
+            RuntimeError: Si ocurre un error durante la ejecución de la consulta.
+        """
+        call = parse_call(query)
+        if call is not None:
+            return self.call_procedure(*call)
+        with self._lock:
+            try:
+                cursor = self._execute(query, params)
+                if typed == "arrow":
+                    return cursor.arrow().to_pandas(types_mapper=pd.ArrowDtype)
+                return cursor.df()
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+    def execute_query_arrow(self, query: str, params: dict = None):
+        """
+        Ejecuta una consulta SQL sobre el snapshot y devuelve una tabla de pyarrow.
+        """
+        with self._lock:
+            try:
+                return self._execute(query, params).arrow()
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+
+    def execute_query_chunks(
+        self,
+        query: str,
+        params: dict = None,
+        chunk_size: int = 10000,
+        typed: str = None,
+    ):
+        """
+        Ejecuta una consulta SQL sobre el snapshot y devuelve los resultados en bloques de DataFrames.
+
+        Cada lectura usa su propio cursor de DuckDB: el lector de fetch_record_batch queda atado a la
+        conexión, y cualquier otra consulta sobre la conexión compartida lo cortaría sin error.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser un entero positivo.")
+        with self._lock:
+            cursor = self.connection.cursor()
+        try:
+            try:
+                batches = self._execute(query, params, cursor).fetch_record_batch(chunk_size)
+            except Exception as e:
+                raise RuntimeError(f"Error al ejecutar la consulta: {str(e)}")
+            types_mapper = pd.ArrowDtype if typed == "arrow" else None
+            for batch in batches:
+                yield batch.to_pandas(types_mapper=types_mapper)
+        finally:
+            cursor.close()
+
+    def query_view(
+        self,
+        view_name: str,
+        where: str = None,
+        params: dict = None,
+        typed: str = None,
+    ) -> pd.DataFrame:
+        """
+        Hace un SELECT * desde una vista (ver create_view) o tabla del snapshot, opcionalmente filtrando.
+        Las vistas de src.db.compat.VIEWS (vw_resumen_ventas_producto) se crean al usarlas por primera vez.
+        """
+        if view_name.lower() in VIEWS and view_name.lower() not in self.views:
+            self.create_view(view_name.lower(), VIEWS[view_name.lower()])
+        sql = f"SELECT * FROM {view_name}"
+        if where:
+            sql += f" WHERE {where}"
+        return self.execute_query(sql, params, typed)
+
+    def call_procedure(self, name: str, args: list = None) -> pd.DataFrame:
+        """
+        Ejecuta la implementación en Python de un stored procedure de MySQL (ver src.db.compat.PROCEDURES).
+
+        Raises:
+            RuntimeError: Si el procedimiento no tiene implementación registrada o falla.
+        """
+        return call_procedure(self, name, args)
+
+    def _execute(self, query, params, cursor=None):
+        """
+        Metodo privado que registra las tablas referenciadas y ejecuta la consulta en DuckDB
+        (en la conexión compartida o en cursor).
+        El SQL de MySQL se traduce con to_embedded_sql y los parámetros :nombre se traducen a $nombre.
+        """
+        query = to_embedded_sql(query, "duckdb", named_params=True)
+        self._register(query, cursor)
+        return (cursor or self.connection).execute(query, params or None)
+
+    def _register(self, query, cursor=None):
+        """
+        Metodo privado que registra como tablas de DuckDB los datasets referenciados por la consulta,
+        y los vuelve a registrar todos si el snapshot cambió desde la última consulta.
+        Los datasets registrados son propios de cada conexión: en un cursor se registran siempre.
+        """
+        if cursor is not None:
+            for table in sorted(self._referenced(query)):
+                cursor.register(table, self.dataset(table))
+            return
+        manifest = os.path.join(self.root, MANIFEST)
+        version = os.stat(manifest).st_mtime_ns if os.path.exists(manifest) else None
+        if version != self._version:
+            for table in self._registered:
+                self.connection.unregister(table)
+            self._registered = set()
+            self._version = version
+
+        for table in sorted(self._referenced(query) - self._registered):
+            self.connection.register(table, self.dataset(table))
+            self._registered.add(table)
+
+    def _referenced(self, query) -> set:
+        """
+        Metodo privado que devuelve las tablas del snapshot que usan la consulta y las vistas definidas.
+        """
+        wanted = referenced_tables(query) | {
+            table for sql in self.views.values() for table in referenced_tables(sql)
+        }
+        return wanted & set(self.tables())
@@ -0,0 +1,207 @@
+import time
+from datetime import timedelta
+import pandas as pd
+from sqlalchemy import inspect, text
+from src.design_patterns.aggregation import BUCKETS, time_bucket
+from src.utils.logger import logger
+
+# Formatos de sales.SalesDate: fecha y hora completas, solo la hora (TIME de MySQL) o solo minutos
+# y segundos, que es como quedó exportado data/sales.csv (p. ej. "31:24.2" = minuto 31, segundo 24.2).
+_TIME = r"^(?P<h>\d{1,2}):(?P<m>\d{2}):(?P<s>\d{2}(?:\.\d+)?)$"
+_MINUTES = r"^(?P<m>\d{1,2}):(?P<s>\d{2}(?:\.\d+)?)$"
+
+# Columnas que agrega la normalización a la tabla sales.
+TIMESTAMP_COLUMNS = {"SalesTimestamp": "DATETIME", "SalesBucket": "DATETIME"}
+
+
+def parse_sales_dates(values, base_date=None) -> pd.Series:
+    """
+    Convierte los valores de SalesDate en marcas de tiempo (datetime64).
+
+    Acepta fechas y horas completas (texto ISO o datetime), horas sin fecha ("07:31:24.2" o el timedelta
+    que devuelve una columna TIME) y el formato truncado de data/sales.csv ("31:24.2", minutos y segundos).
+    Los valores sin fecha no permiten ubicar la venta en el tiempo: se anclan a base_date (la hora, si falta,
+    queda en 0) o, si no se indica, quedan como NaT. Los valores que no se pueden interpretar también quedan
+    como NaT y se informan en el log.
+
+    Args:
+        values (Iterable): Valores de SalesDate.
+        base_date (str | datetime, opcional): Fecha a la que se anclan los valores sin fecha.
+
+    Returns:
+        pd.Series: Serie datetime64 con el mismo índice (o posiciones) que values.
+
+    Ejemplo:
+        >>> parse_sales_dates(["2018-02-05 07:38:25.4", "31:24.2"], base_date="2018-02-05")
+    """
+    values = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    base = None if base_date is None else pd.Timestamp(base_date).normalize()
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_timedelta64_dtype(values) and base is not None:
+        return base + values
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    deltas = values.map(lambda v: isinstance(v, (timedelta, pd.Timedelta)))
+    if deltas.any() and base is not None:
+        result[deltas] = base + pd.to_timedelta(values[deltas].tolist())
+
+    texts = values[~deltas & values.notna()].astype(str).str.strip()
+    dated = texts[texts.str.contains(r"[-/]", regex=True)]
+    if not dated.empty:
+        result[dated.index] = pd.to_datetime(dated, format="ISO8601", errors="coerce")
+
+    undated = texts.drop(dated.index)
+    if not undated.empty and base is not None:
+        for pattern in (_TIME, _MINUTES):
+            parts = undated.str.extract(pattern).dropna(how="all")
+            if parts.empty:
+                continue
+            seconds = parts["s"].astype(float) + parts["m"].astype(float) * 60
+            if "h" in parts:
+                seconds += parts["h"].astype(float) * 3600
+            result[parts.index] = base + pd.to_timedelta(seconds, unit="s")
+            undated = undated.drop(parts.index)
+
+    missing = int(result.isna().sum() - values.isna().sum())
+    if missing:
+        reason = "sin fecha (indicar base_date)" if base is None else "con formato desconocido"
+        logger.warning(f"SalesDate: {missing} valores {reason} quedaron sin marca de tiempo.")
+    return result
+
+
+def normalize_sales(df: pd.DataFrame, base_date=None, bucket: str = "hour", column: str = "SalesDate") -> pd.DataFrame:
+    """
+    Agrega a un DataFrame de ventas la marca de tiempo normalizada ("SalesTimestamp") y el inicio
+    de su bucket ("SalesBucket", ver time_bucket). Es la etapa de transformación que usan BulkLoader
+    (transforms) y SalesTimestampPipeline.backfill; también sirve para los resultados de execute_query
+    antes de las estrategias por ventana de tiempo.
+
+    Args:
+        df (pd.DataFrame): Ventas con la columna column.
+        base_date (str | datetime, opcional): Fecha para los valores sin fecha (ver parse_sales_dates).
+        bucket (str): "hour", "day" o "week". Por defecto "hour".
+        column (str): Columna de origen. Por defecto "SalesDate".
+
+    Returns:
+        pd.DataFrame: Una copia de df con las dos columnas nuevas.
+    """
+    timestamps = parse_sales_dates(df[column], base_date)
+    return df.assign(SalesTimestamp=timestamps, SalesBucket=time_bucket(timestamps, bucket).to_numpy())
+
+
+class SalesTimestampPipeline:
+    """
+    Normaliza sales.SalesDate (TIME) en columnas DATETIME reales dentro de la base de datos.
+
+    migrate agrega a la tabla sales las columnas "SalesTimestamp" y "SalesBucket" si no existen, y backfill
+    las completa leyendo SalesID y SalesDate por bloques, normalizando cada bloque en pandas
+    (normalize_sales) y escribiendo con UPDATE por lotes. Ambas operaciones pueden repetirse.
+
+    Args:
+        engine (Engine, opcional): Engine de SQLAlchemy. Por defecto el de DBConnection.
+        base_date (str | datetime, opcional): Fecha para los valores sin fecha (ver parse_sales_dates).
+        bucket (str): "hour", "day" o "week". Por defecto "hour".
+        chunk_size (int): Filas por bloque (una transacción por bloque). Por defecto 50000.
+
+    Ejemplo:
+        >>> pipeline = SalesTimestampPipeline(base_date="2018-01-01", bucket="hour")
+        >>> pipeline.migrate()
+        >>> pipeline.backfill()
+    """
+
+    def __init__(self, engine=None, base_date=None, bucket="hour", chunk_size=50000):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser un entero positivo.")
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket debe ser uno de {tuple(BUCKETS)}.")
+        if engine is None:
+            from src.db.database import DBConnection
+
+            engine = DBConnection().engine
+        self.engine = engine
+        self.base_date = base_date
+        self.bucket = bucket
+        self.chunk_size = chunk_size
+
+    def migrate(self) -> list:
+        """
+        Agrega a sales las columnas de TIMESTAMP_COLUMNS que falten.
+
+        Returns:
+            list: Sentencias ejecutadas (vacía si la tabla ya estaba migrada).
+
+        Raises:
+            RuntimeError: Si falla el ALTER TABLE.
+        """
+        existing = {c["name"] for c in inspect(self.engine).get_columns("sales")}
+        statements = [
+            f"ALTER TABLE sales ADD COLUMN {name} {kind}"
+            for name, kind in TIMESTAMP_COLUMNS.items()
+            if name not in existing
+        ]
+        try:
+            with self.engine.begin() as connection:
+                for statement in statements:
+                    connection.execute(text(statement))
+        except Exception as e:
+            raise RuntimeError(f"Error al migrar la tabla sales: {str(e)}")
+        for statement in statements:
+            logger.info(statement)
+        return statements
+
+    def backfill(self, only_missing: bool = True) -> dict:
+        """
+        Completa SalesTimestamp y SalesBucket a partir de SalesDate.
+
+        Args:
+            only_missing (bool): Si es True, solo procesa las ventas sin SalesTimestamp. Por defecto True.
+
+        Returns:
+            dict: "rows", "unparsed" (ventas que quedaron sin marca de tiempo), "seconds" y "rows_per_sec".
+
+        Raises:
+            RuntimeError: Si ocurre un error al leer o actualizar la tabla.
+        """
+        # paginación por clave (keyset) en lugar de un cursor abierto, para poder actualizar entre bloques
+        query = "SELECT SalesID, SalesDate FROM sales WHERE SalesID > :last"
+        if only_missing:
+            query += " AND SalesTimestamp IS NULL"
+        query = text(query + " ORDER BY SalesID LIMIT :limit")
+        update = text(
+            "UPDATE sales SET SalesTimestamp = :ts, SalesBucket = :bucket WHERE SalesID = :id"
+        )
+        start = time.perf_counter()
+        rows = unparsed = 0
+        last = -1
+        try:
+            with self.engine.connect() as connection:
+                while True:
+                    part = connection.execute(
+                        query, {"last": last, "limit": self.chunk_size}
+                    ).fetchall()
+                    if not part:
+                        break
+                    chunk = normalize_sales(
+                        pd.DataFrame(part, columns=["SalesID", "SalesDate"]), self.base_date, self.bucket
+                    )
+                    valid = chunk[chunk["SalesTimestamp"].notna()]
+                    if not valid.empty:
+                        connection.execute(
+                            update,
+                            [
+                                {"id": int(i), "ts": ts.to_pydatetime(), "bucket": b.to_pydatetime()}
+                                for i, ts, b in zip(valid["SalesID"], valid["SalesTimestamp"], valid["SalesBucket"])
+                            ],
+                        )
+                    connection.commit()
+                    unparsed += len(chunk) - len(valid)
+                    rows += len(chunk)
+                    last = int(chunk["SalesID"].iloc[-1])
+        except Exception as e:
+            raise RuntimeError(f"Error al normalizar SalesDate: {str(e)}")
+
+        seconds = time.perf_counter() - start
+        rate = rows / seconds if seconds > 0 else float("inf")
+        logger.info(f"sales: {rows} fechas normalizadas en {seconds:.2f}s ({unparsed} sin marca de tiempo)")
+        return {"rows": rows, "unparsed": unparsed, "seconds": seconds, "rows_per_sec": rate}
@@ -0,0 +1,203 @@
+import time
+from typing import Iterable, Iterator, Union
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError
+from config import DB_WRITE_BATCH_SIZE, DB_WRITE_MAX_RETRIES, DB_WRITE_TRANSACTION_SIZE
+from src.models import Sale
+from src.utils.logger import logger
+
+# Códigos de error que indican un conflicto transitorio entre transacciones: deadlock y lock wait timeout
+# de MySQL, deadlock y serialización de PostgreSQL. En SQLite, "database is locked".
+RETRYABLE_ERRORS = {1213, 1205, "40P01", "40001"}
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Indica si un error de la base de datos es un deadlock o un bloqueo transitorio que puede reintentarse.
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    orig = error.orig
+    codes = {getattr(orig, "errno", None), getattr(orig, "pgcode", None)}
+    if getattr(orig, "args", None):
+        codes.add(orig.args[0])
+    return bool(codes & RETRYABLE_ERRORS) or "database is locked" in str(orig).lower()
+
+
+class BulkWriter:
+    """
+    Escritura masiva de filas con el ORM (por defecto en sales), sobre una sesión de DBConnection.get_session.
+
+    En lugar de session.add + commit por objeto, agrupa las filas en lotes que se envían con un único
+    INSERT por lote (executemany, que los drivers convierten en INSERT de varias filas) y confirma
+    una transacción cada transaction_size filas. Con upsert=True las filas cuya clave primaria (SalesID)
+    ya existe se actualizan (ON DUPLICATE KEY UPDATE en MySQL, ON CONFLICT DO UPDATE en SQLite y PostgreSQL).
+    Si una transacción falla por un deadlock o un bloqueo transitorio se deshace y se reintenta completa,
+    con espera exponencial, hasta max_retries veces.
+
+    Args:
+        db (DBConnection, opcional): Conexión de la que se obtiene la sesión. Por defecto DBConnection().
+        model: Modelo ORM destino. Por defecto Sale.
+        batch_size (int): Filas por INSERT. Por defecto DB_WRITE_BATCH_SIZE (5000).
+        transaction_size (int): Filas por transacción (se redondea a lotes completos).
+            Por defecto DB_WRITE_TRANSACTION_SIZE (50000).
+        max_retries (int): Reintentos por transacción ante deadlocks. Por defecto DB_WRITE_MAX_RETRIES (3).
+        retry_backoff (float): Espera inicial en segundos entre reintentos (se duplica). Por defecto 0.1.
+
+    Ejemplo:
+        >>> writer = BulkWriter(batch_size=10000)
+        >>> stats = writer.write(df_ventas_nuevas, upsert=True)
+        >>> stats["rows_per_sec"]
+    """
+
+    def __init__(
+        self,
+        db=None,
+        model=Sale,
+        batch_size: int = DB_WRITE_BATCH_SIZE,
+        transaction_size: int = DB_WRITE_TRANSACTION_SIZE,
+        max_retries: int = DB_WRITE_MAX_RETRIES,
+        retry_backoff: float = 0.1,
+    ):
+        if batch_size <= 0 or transaction_size <= 0:
+            raise ValueError("batch_size y transaction_size deben ser enteros positivos.")
+        if max_retries < 0:
+            raise ValueError("max_retries no puede ser negativo.")
+        if db is None:
+            from src.db.database import DBConnection
+
+            db = DBConnection()
+        self.db = db
+        self.model = model
+        self.table = model.__table__
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def write(
+        self,
+        rows: Union[pd.DataFrame, Iterable[pd.DataFrame], Iterable[dict]],
+        upsert: bool = False,
+    ) -> dict:
+        """
+        Inserta (o con upsert=True, inserta o actualiza) las filas en la tabla del modelo.
+
+        Args:
+            rows: DataFrame, iterador de bloques de DataFrames (por ejemplo, ventas que llegan de forma continua)
+                o iterable de diccionarios. Las columnas que no son del modelo se ignoran; NaN se escribe como NULL.
+            upsert (bool): Actualizar las filas cuya clave primaria ya existe. Por defecto False.
+
+        Returns:
+            dict: "rows", "batches", "transactions", "retries", "seconds" y "rows_per_sec".
+
+        Raises:
+            ValueError: Si upsert no está soportado por el motor de la base de datos.
+            RuntimeError: Si la escritura falla, o si un deadlock persiste después de max_retries reintentos.
+        """
+        start = time.perf_counter()
+        stats = {"rows": 0, "batches": 0, "transactions": 0, "retries": 0}
+        statement = None
+        pending, pending_rows = [], 0
+
+        session = self.db.get_session()
+        try:
+            for batch in self._batches(rows):
+                if statement is None:
+                    statement = self._statement(list(batch[0]), upsert)
+                pending.append(batch)
+                pending_rows += len(batch)
+                if pending_rows >= self.transaction_size:
+                    self._commit(session, statement, pending, stats)
+                    pending, pending_rows = [], 0
+            if pending:
+                self._commit(session, statement, pending, stats)
+        finally:
+            self.db.close_session(session)
+            cache = getattr(self.db, "cache", None)
+            if cache is not None and stats["rows"]:
+                cache.invalidate_tables({self.table.name})
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] > 0 else float("inf")
+        logger.info(
+            f"{self.table.name}: {stats['rows']} filas escritas en {stats['seconds']:.2f}s "
+            f"({stats['rows_per_sec']:,.0f} filas/s, {stats['transactions']} transacciones, "
+            f"{stats['retries']} reintentos)"
+        )
+        return stats
+
+    def _commit(self, session, statement, batches, stats):
+        """
+        Metodo privado que ejecuta los lotes de una transacción y la confirma, reintentando la transacción
+        completa si falla por un deadlock.
+        """
+        attempt = 0
+        while True:
+            try:
+                for batch in batches:
+                    session.execute(statement, batch)
+                session.commit()
+                break
+            except Exception as e:
+                session.rollback()
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise RuntimeError(f"Error al escribir en {self.table.name}: {str(e)}")
+                attempt += 1
+                stats["retries"] += 1
+                wait = self.retry_backoff * 2 ** (attempt - 1)
+                logger.warning(
+                    f"{self.table.name}: conflicto de bloqueo, reintento {attempt}/{self.max_retries} en {wait:.2f}s"
+                )
+                time.sleep(wait)
+        stats["rows"] += sum(len(batch) for batch in batches)
+        stats["batches"] += len(batches)
+        stats["transactions"] += 1
+
+    def _statement(self, columns: list, upsert: bool):
+        """
+        Metodo privado que arma el INSERT (o el upsert del dialecto) para las columnas de las filas.
+        """
+        if not upsert:
+            return insert(self.table)
+        keys = [column.name for column in self.table.primary_key]
+        updates = [column for column in columns if column not in keys]
+        dialect = self.db.engine.dialect.name
+        if dialect == "mysql":
+            statement = mysql_insert(self.table)
+            return statement.on_duplicate_key_update({c: statement.inserted[c] for c in updates})
+        if dialect in ("sqlite", "postgresql"):
+            statement = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(self.table)
+            if not updates:
+                return statement.on_conflict_do_nothing(index_elements=keys)
+            return statement.on_conflict_do_update(
+                index_elements=keys, set_={c: statement.excluded[c] for c in updates}
+            )
+        raise ValueError(f"upsert no está soportado para {dialect}.")
+
+    def _batches(self, rows) -> Iterator[list]:
+        """
+        Metodo privado que convierte las filas en lotes de diccionarios con solo las columnas del modelo.
+        """
+        columns = set(self.table.columns.keys())
+        if isinstance(rows, pd.DataFrame):
+            rows = [rows]
+        batch = []
+        for item in rows:
+            if isinstance(item, pd.DataFrame):
+                frame = item[[c for c in item.columns if c in columns]]
+                frame = frame.astype(object).where(frame.notna(), None)
+                records = frame.to_dict("records")
+            else:
+                records = [{k: v for k, v in item.items() if k in columns}]
+            for record in records:
+                batch.append(record)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,507 @@
+import os
+import re
+import shutil
+import tempfile
+import weakref
+from typing import Iterator
+import numpy as np
+import pandas as pd
+
+
+def from_clause(source: str) -> str:
+    """
+    Devuelve la expresión FROM para un origen de datos: el nombre de una tabla o vista tal cual,
+    o una consulta SELECT como tabla derivada.
+    """
+    source = source.strip().rstrip(";").strip()
+    if re.fullmatch(r"[\w.]+", source):
+        return source
+    return f"({source}) as origen"
+
+
+class SalesAggregateState:
+    """
+    Estado parcial de agregación de ventas agrupado por una clave (por defecto "EmployeeID").
+
+    Por cada columna registrada guarda la suma, la cantidad de valores no nulos y la suma de cuadrados
+    por clave. El estado puede actualizarse bloque a bloque, combinarse con otro estado
+    (por ejemplo, el calculado por otro proceso o sobre ventas nuevas) y a partir de él se obtienen
+    totales, promedios y desvíos sin volver a recorrer todo el historial.
+
+    Args:
+        columns (list[str]): Columnas numéricas a agregar, por ejemplo ["TotalPrice"].
+        key (str): Columna por la cual se agrupa. Por defecto "EmployeeID".
+        name_column (str, opcional): Columna descriptiva de la clave; se conserva el primer valor visto.
+            Por defecto "EmployeeName". Si es None no se guardan nombres.
+
+    Ejemplo:
+        >>> state = SalesAggregateState(["TotalPrice"])
+        >>> for chunk in db.execute_query_chunks(query):
+        ...     state.update(chunk)
+        >>> state.mean("TotalPrice")
+    """
+
+    STATS = ("sum", "count", "sumsq")
+
+    def __init__(self, columns, key="EmployeeID", name_column="EmployeeName"):
+        self.columns = list(dict.fromkeys(columns))
+        self.key = key
+        self.name_column = name_column
+        self.stats = pd.DataFrame(
+            columns=pd.MultiIndex.from_product([self.columns, self.STATS]),
+            index=pd.Index([], name=key),
+        )
+        self.names = pd.DataFrame(
+            columns=[key, name_column] if name_column else [key]
+        )
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Incorpora un bloque de ventas al estado. Devuelve el propio estado para encadenar llamadas.
+        """
+        frame = {}
+        agg = {}
+        for column in self.columns:
+            values = chunk[column]
+            squares = values
+            if pd.api.types.is_integer_dtype(values) and values.dtype.itemsize < 8:
+                # evita el desborde de int32 (columnas tipadas) al elevar al cuadrado
+                squares = values.astype("int64")
+            frame[(column, "sum")] = values
+            frame[(column, "count")] = values
+            frame[(column, "sumsq")] = squares * squares
+            agg[(column, "sum")] = "sum"
+            agg[(column, "count")] = "count"
+            agg[(column, "sumsq")] = "sum"
+
+        parcial = pd.DataFrame(frame, index=chunk.index).groupby(chunk[self.key]).agg(agg)
+        parcial.columns = pd.MultiIndex.from_tuples(parcial.columns)
+        parcial.index.name = self.key
+
+        names = None
+        if self.name_column:
+            names = chunk[[self.key, self.name_column]].drop_duplicates(subset=self.key)
+
+        return self._combine(parcial, names)
+
+    def aggregate_query(self, source: str) -> str:
+        """
+        Compila el estado en una única consulta SQL que calcula las mismas estadísticas en la base de datos
+        (SUM, COUNT y SUM de cuadrados por clave), de modo que solo viaja una fila por clave.
+        El nombre de cada clave se toma con MIN (las ventas de un empleado comparten el nombre).
+
+        Args:
+            source (str): Nombre de una tabla o vista, o una consulta SELECT (se usa como tabla derivada).
+
+        Returns:
+            str: Consulta con una columna "<columna>__<estadística>" por cada estadística, ordenada por la clave.
+
+        Ejemplo:
+            >>> SalesAggregateState(["TotalPrice"]).aggregate_query("vw_ventas")
+        """
+        select = [self.key]
+        if self.name_column:
+            select.append(f"min({self.name_column}) as {self.name_column}")
+        for column in self.columns:
+            select += [
+                f"sum({column}) as {column}__sum",
+                f"count({column}) as {column}__count",
+                f"sum({column} * {column}) as {column}__sumsq",
+            ]
+        return (
+            f"select {', '.join(select)} from {from_clause(source)} "
+            f"group by {self.key} order by {self.key}"
+        )
+
+    def load_aggregates(self, frame: pd.DataFrame):
+        """
+        Incorpora al estado el resultado de aggregate_query. Devuelve el propio estado para encadenar llamadas.
+        """
+        stats = pd.DataFrame(
+            {
+                (column, stat): frame[f"{column}__{stat}"].fillna(0).to_numpy()
+                for column in self.columns
+                for stat in self.STATS
+            },
+            index=pd.Index(frame[self.key].to_numpy(), name=self.key),
+        ).sort_index()
+        stats.columns = pd.MultiIndex.from_tuples(stats.columns)
+
+        names = None
+        if self.name_column:
+            names = frame[[self.key, self.name_column]].reset_index(drop=True)
+        return self._combine(stats, names)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Devuelve el estado con el mismo formato que el resultado de aggregate_query (una fila por clave,
+        columnas "<columna>__<estadística>"), que load_aggregates vuelve a incorporar.
+        """
+        frame = pd.DataFrame(
+            {
+                f"{column}__{stat}": self.stats[(column, stat)].to_numpy()
+                for column in self.columns
+                for stat in self.STATS
+            },
+            index=pd.Index(self.stats.index, name=self.key),
+        ).reset_index()
+        if self.name_column:
+            frame.insert(1, self.name_column, frame[self.key].map(self.names.set_index(self.key)[self.name_column]))
+        return frame
+
+    def merge(self, other: "SalesAggregateState"):
+        """
+        Combina otro estado (con las mismas columnas y clave) dentro de este.
+        Devuelve el propio estado para encadenar llamadas.
+
+        Raises:
+            ValueError: Si los estados no agregan las mismas columnas o la misma clave.
+        """
+        if other.columns != self.columns or other.key != self.key:
+            raise ValueError("Solo se pueden combinar estados con las mismas columnas y clave.")
+        return self._combine(other.stats, other.names if self.name_column else None)
+
+    def _combine(self, stats: pd.DataFrame, names: pd.DataFrame = None):
+        """
+        Metodo privado que suma estadísticas parciales al estado y conserva el primer nombre visto por clave.
+        """
+        if self.stats.empty:
+            self.stats = stats
+        elif not stats.empty:
+            self.stats = pd.concat([self.stats, stats]).groupby(level=0).sum()
+            self.stats.index.name = self.key
+
+        if names is not None and not names.empty:
+            if self.names.empty:
+                self.names = names
+            else:
+                self.names = pd.concat([self.names, names]).drop_duplicates(
+                    subset=self.key
+                )
+        return self
+
+    def sum(self, column: str) -> pd.Series:
+        """Suma de la columna por clave."""
+        return self.stats[(column, "sum")].rename(column)
+
+    def count(self, column: str) -> pd.Series:
+        """Cantidad de valores no nulos de la columna por clave."""
+        return self.stats[(column, "count")].rename(column)
+
+    def mean(self, column: str) -> pd.Series:
+        """Promedio de la columna por clave."""
+        return (self.sum(column) / self.count(column)).rename(column)
+
+    def variance(self, column: str) -> pd.Series:
+        """Varianza muestral (ddof=1) de la columna por clave, calculada a partir de la suma de cuadrados."""
+        n = self.count(column)
+        s = self.sum(column)
+        sumsq = self.stats[(column, "sumsq")]
+        return ((sumsq - s * s / n) / (n - 1)).rename(column)
+
+
+# Tamaños de bucket admitidos y su frecuencia de pandas (las semanas empiezan el lunes).
+BUCKETS = {"hour": "h", "day": "D", "week": "W-MON"}
+
+
+def time_bucket(values, bucket: str = "hour") -> pd.Series:
+    """
+    Devuelve el inicio del bucket (hora, día o semana) de cada marca de tiempo.
+
+    Raises:
+        ValueError: Si bucket no es "hour", "day" o "week".
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket debe ser uno de {tuple(BUCKETS)}.")
+    values = pd.to_datetime(pd.Series(values))
+    if bucket == "week":
+        return values.dt.to_period("W-SUN").dt.start_time
+    return values.dt.floor(BUCKETS[bucket])
+
+
+class TimeBucketState:
+    """
+    Estado de agregación de ventas por clave (por defecto "EmployeeID") y bucket de tiempo.
+
+    Por cada par (clave, bucket) guarda la suma de las columnas registradas y la cantidad de ventas.
+    Se actualiza bloque a bloque y lleva una marca de agua (la venta más reciente vista): los buckets
+    anteriores al bucket de la marca de agua están cerrados y pop_closed devuelve, una sola vez,
+    el rango de los que se cerraron desde la última llamada. Así los informes por ventana de tiempo
+    se emiten de forma incremental, sin recalcular el historial.
+
+    Args:
+        columns (list[str]): Columnas a sumar, por ejemplo ["TotalPrice"].
+        bucket (str): "hour", "day" o "week". Por defecto "hour".
+        timestamp (str): Columna con la fecha y hora de la venta. Por defecto "SalesTimestamp".
+        key (str, opcional): Columna por la cual se agrupa. Por defecto "EmployeeID"; None para un total general.
+        name_column (str, opcional): Columna descriptiva de la clave. Por defecto "EmployeeName".
+
+    Ejemplo:
+        >>> state = TimeBucketState(["TotalPrice"], bucket="day")
+        >>> for chunk in db.execute_query_chunks(query):
+        ...     state.update(chunk)
+        >>> state.matrix("TotalPrice")
+    """
+
+    def __init__(
+        self,
+        columns,
+        bucket="hour",
+        timestamp="SalesTimestamp",
+        key="EmployeeID",
+        name_column="EmployeeName",
+    ):
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket debe ser uno de {tuple(BUCKETS)}.")
+        self.columns = list(dict.fromkeys(columns))
+        self.bucket = bucket
+        self.timestamp = timestamp
+        self.key = key
+        self.name_column = name_column if key else None
+        levels = [key, "Bucket"] if key else ["Bucket"]
+        self.stats = pd.DataFrame(
+            columns=self.columns + ["count"],
+            index=pd.MultiIndex.from_arrays([[]] * len(levels), names=levels),
+        )
+        self.names = pd.DataFrame(
+            columns=[key, self.name_column] if self.name_column else [key]
+        )
+        self.watermark = None
+        self.emitted = None
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Incorpora un bloque de ventas al estado. Las ventas sin fecha se ignoran.
+        Devuelve el propio estado para encadenar llamadas.
+        """
+        timestamps = pd.to_datetime(chunk[self.timestamp])
+        valid = timestamps.notna().to_numpy()
+        chunk, timestamps = chunk[valid], timestamps[valid]
+        if chunk.empty:
+            return self
+
+        buckets = time_bucket(timestamps, self.bucket).rename("Bucket")
+        buckets.index = chunk.index
+        groups = [chunk[self.key], buckets] if self.key else [buckets]
+        grouped = chunk[self.columns].groupby(groups)
+        parcial = grouped.sum()
+        parcial["count"] = grouped.size()
+
+        if self.stats.empty:
+            self.stats = parcial
+        else:
+            self.stats = pd.concat([self.stats, parcial]).groupby(level=parcial.index.names).sum()
+
+        if self.name_column:
+            names = chunk[[self.key, self.name_column]].drop_duplicates(subset=self.key)
+            self.names = (
+                names
+                if self.names.empty
+                else pd.concat([self.names, names]).drop_duplicates(subset=self.key)
+            )
+
+        latest = timestamps.max()
+        self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+        return self
+
+    def closed_until(self):
+        """
+        Inicio del bucket en curso: todos los buckets anteriores están cerrados. None si no hay ventas.
+        """
+        if self.watermark is None:
+            return None
+        return time_bucket([self.watermark], self.bucket).iloc[0]
+
+    def pop_closed(self):
+        """
+        Devuelve el rango [inicio, fin) de los buckets que se cerraron desde la última llamada
+        y los marca como emitidos, o None si no se cerró ninguno.
+        """
+        until = self.closed_until()
+        if until is None or (self.emitted is not None and until <= self.emitted):
+            return None
+        start = self.emitted
+        if start is None:
+            start = self.stats.index.get_level_values("Bucket").min()
+            if start >= until:
+                return None
+        self.emitted = until
+        return start, until
+
+    def matrix(self, column: str = "count", since=None, until=None) -> pd.DataFrame:
+        """
+        Devuelve la columna (o "count") como matriz bucket x clave, con todos los buckets del rango
+        (los buckets sin ventas valen 0). since y until (excluido) acotan el rango de buckets.
+        """
+        values = self.stats[column]
+        if self.key:
+            values = values.unstack(self.key, fill_value=0)
+        else:
+            values = values.to_frame(column)
+        values.index = pd.DatetimeIndex(values.index.get_level_values("Bucket"), name="Bucket")
+        if values.empty:
+            return values
+
+        start = values.index.min() if since is None else max(since, values.index.min())
+        end = values.index.max()
+        if until is not None:
+            end = min(end, until - pd.tseries.frequencies.to_offset(BUCKETS[self.bucket]))
+        full = pd.date_range(start, end, freq=BUCKETS[self.bucket], name="Bucket")
+        return values.reindex(full, fill_value=0)
+
+
+def combine_aggregates(frames, key: str, name_column: str = None) -> pd.DataFrame:
+    """
+    Combina resultados parciales con el formato de aggregate_query (pueden repetir claves)
+    en una fila por clave: suma las estadísticas y conserva el primer nombre.
+    """
+    frame = pd.concat(frames, ignore_index=True)
+    agg = {column: "sum" for column in frame.columns if "__" in column}
+    if name_column:
+        agg[name_column] = "first"
+    return frame.groupby(key, sort=True).agg(agg).reset_index()
+
+
+class SpillAggregateState:
+    """
+    Estado de agregación para claves de alta cardinalidad (por ejemplo "CustomerID") que no entran en memoria.
+
+    Cada bloque se preagrega por clave y sus filas se reparten por hash de la clave en partitions particiones.
+    Las particiones se acumulan en memoria hasta memory_rows filas y luego se vuelcan a archivos Parquet
+    temporales. Como cada clave cae siempre en la misma partición, cada una se agrega por separado
+    (iter_partitions) y en memoria solo hay una partición a la vez. Los archivos se borran con close
+    o al liberar el estado.
+
+    Args:
+        columns (list[str]): Columnas numéricas a agregar, por ejemplo ["TotalPrice"].
+        key (str): Columna por la cual se agrupa. Por defecto "CustomerID".
+        name_column (str, opcional): Columna descriptiva de la clave. Por defecto "CustomerName".
+        partitions (int): Cantidad de particiones. Por defecto 64.
+        memory_rows (int): Filas preagregadas que se acumulan en memoria antes de volcarlas a disco.
+            Por defecto 1000000.
+        spill_dir (str, opcional): Directorio para los archivos temporales. Por defecto el del sistema.
+
+    Ejemplo:
+        >>> state = SpillAggregateState(["TotalPrice"], partitions=128)
+        >>> for chunk in db.execute_query_chunks(query):
+        ...     state.update(chunk)
+        >>> for partition in state.iter_partitions():
+        ...     partition.sum("TotalPrice")
+    """
+
+    def __init__(
+        self,
+        columns,
+        key="CustomerID",
+        name_column="CustomerName",
+        partitions=64,
+        memory_rows=1_000_000,
+        spill_dir=None,
+    ):
+        if partitions <= 0 or memory_rows <= 0:
+            raise ValueError("partitions y memory_rows deben ser enteros positivos.")
+        self.columns = list(dict.fromkeys(columns))
+        self.key = key
+        self.name_column = name_column
+        self.partitions = partitions
+        self.memory_rows = memory_rows
+        self.path = tempfile.mkdtemp(prefix="spill-", dir=spill_dir)
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.path, ignore_errors=True)
+        self._buffers = [[] for _ in range(partitions)]
+        self._buffered = 0
+        self._files = [[] for _ in range(partitions)]
+        self.spilled_rows = 0
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Preagrega un bloque de ventas, lo reparte por partición y vuelca a disco si se supera memory_rows.
+        Devuelve el propio estado para encadenar llamadas.
+        """
+        parcial = SalesAggregateState(self.columns, self.key, self.name_column).update(chunk).to_frame()
+        if parcial.empty:
+            return self
+        codes = pd.util.hash_pandas_object(parcial[self.key], index=False).to_numpy() % self.partitions
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(self.partitions + 1))
+        parcial = parcial.take(order)
+        for i in np.flatnonzero(np.diff(bounds)):
+            self._buffers[i].append(parcial.iloc[bounds[i] : bounds[i + 1]])
+        self._buffered += len(parcial)
+        if self._buffered >= self.memory_rows:
+            self.spill()
+        return self
+
+    def spill(self):
+        """
+        Vuelca a disco las particiones acumuladas en memoria, un archivo Parquet por partición.
+        """
+        for i, parts in enumerate(self._buffers):
+            if not parts:
+                continue
+            frame = combine_aggregates(parts, self.key, self.name_column)
+            path = os.path.join(self.path, f"p{i:04d}-{len(self._files[i]):06d}.parquet")
+            frame.to_parquet(path, index=False)
+            self._files[i].append(path)
+            self.spilled_rows += len(frame)
+        self._buffers = [[] for _ in range(self.partitions)]
+        self._buffered = 0
+
+    def iter_partitions(self) -> Iterator[SalesAggregateState]:
+        """
+        Agrega cada partición por separado y la devuelve como un SalesAggregateState, de a una.
+        """
+        for i in range(self.partitions):
+            frames = [pd.read_parquet(path) for path in self._files[i]] + self._buffers[i]
+            if not frames:
+                continue
+            yield SalesAggregateState(self.columns, self.key, self.name_column).load_aggregates(
+                combine_aggregates(frames, self.key, self.name_column)
+            )
+
+    def close(self):
+        """
+        Borra los archivos temporales del estado.
+        """
+        self._cleanup()
+
+
+def merge_sorted_runs(paths, key: str, ascending: bool = True, batch_size: int = 65536) -> Iterator[pd.DataFrame]:
+    """
+    Mezcla archivos Parquet ordenados por key (corridas) y devuelve el resultado ordenado en bloques,
+    leyendo cada corrida de a batch_size filas, de modo que nunca hay más de un lote por corrida en memoria.
+    Las filas con key nula se devuelven al final.
+    """
+    import pyarrow.parquet as pq
+
+    readers = [pq.ParquetFile(path).iter_batches(batch_size=batch_size) for path in paths]
+    buffers = {}
+    nulls = []
+
+    def refill(i):
+        for batch in readers[i]:
+            frame = batch.to_pandas()
+            missing = frame[key].isna()
+            if missing.any():
+                nulls.append(frame[missing])
+                frame = frame[~missing]
+            if not frame.empty:
+                buffers[i] = frame
+                return
+        buffers.pop(i, None)
+
+    for i in range(len(readers)):
+        refill(i)
+    while buffers:
+        lasts = [frame[key].iloc[-1] for frame in buffers.values()]
+        bound = min(lasts) if ascending else max(lasts)
+        block = []
+        for i, frame in list(buffers.items()):
+            ready = (frame[key] <= bound) if ascending else (frame[key] >= bound)
+            block.append(frame[ready])
+            if ready.all():
+                refill(i)
+            else:
+                buffers[i] = frame[~ready]
+        yield pd.concat(block, ignore_index=True).sort_values(key, ascending=ascending, kind="mergesort")
+    if nulls:
+        yield pd.concat(nulls, ignore_index=True)
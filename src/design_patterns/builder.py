@@ -1,5 +1,16 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
-from src.design_patterns.strategy import ReportStrategy
+from src.design_patterns.aggregation import SalesAggregateState, from_clause
+from src.design_patterns.strategy import (
+    AggregateReportStrategy,
+    ApproximateStrategy,
+    RankingStrategy,
+    ReportStrategy,
+    iter_chunks,
+)
 
 
 class ReportBuilder:
@@ -19,21 +30,96 @@ class ReportBuilder:
             .add_report(ProductSalesByEmployee())
             .build_all()
         )
+
+    Con set_fused(True) todas las estrategias de agregación se calculan en una única pasada
+    agrupada sobre los datos (que en este modo también pueden ser un iterador de bloques).
+
+    Con set_executor("thread") o set_executor("process") los informes se calculan en paralelo
+    (ver set_executor). El resultado es idéntico al de la ejecución en serie.
+
+    Las estrategias de ranking (TopNEmployeesBySales, BottomN, TopNProductsPerCategory) se agregan igual;
+    las que no son por vendedor (RankingStrategy) no forman parte del CombinedReport y, en modo fusionado,
+    se actualizan en la misma pasada sobre los bloques que las demás.
+
+    Con set_source el builder trabaja en modo diferido: en lugar de un DataFrame recibe una tabla, vista
+    o consulta y resuelve las estrategias de agregación con un único GROUP BY "EmployeeID" en la base de datos.
+
+    Con set_accuracy las estrategias aproximadas (SampledSalesByEmployee, DistinctCustomersByEmployee,
+    PriceQuantilesByCategory) ajustan su compromiso entre precisión y velocidad.
     """
 
+    EXECUTORS = ("serial", "thread", "process")
+
     def __init__(self):
         self.df = None
+        self.source = None
+        self.db = None
+        self.params = None
         self._report_configs = []
         self.combined_sort_key = None
         self.combined_sort_ascending = True
+        self.fused = False
+        self.executor = "serial"
+        self.max_workers = None
+        self.accuracy = None
 
     def set_dataframe(self, df: pd.DataFrame):
         """
         Establece el DataFrame a utilizar en los informes.
         """
         self.df = df
+        self.source = None
+        return self
+
+    def set_source(self, db, source: str, params: dict = None):
+        """
+        Activa el modo diferido: los informes se calculan a partir de un origen en la base de datos
+        en lugar de un DataFrame ya cargado.
+
+        Las estrategias con traducción a SQL (sql_pushdown, las de agregación por vendedor) se compilan
+        en una sola consulta "GROUP BY EmployeeID" con SUM / COUNT (los promedios salen de ambos), de modo que
+        solo viaja una fila por vendedor. Las demás (por ejemplo TopNProductsPerCategory) se calculan en pandas
+        sobre las filas del origen, que en ese caso se leen una única vez. El resultado es idéntico al del modo normal.
+
+        Args:
+            db: Conexión con execute_query (DBConnection, AnalyticsBackend o SnapshotReader).
+            source (str): Tabla o vista, o consulta SELECT con las columnas "EmployeeID", "EmployeeName"
+                y las que usen las estrategias.
+            params (dict, opcional): Parámetros de la consulta.
+
+        Raises:
+            ValueError: Si source está vacío.
+
+        Ejemplo:
+            >>> reports = (
+            ...     ReportBuilder()
+            ...     .set_source(DBConnection(), REPORT_QUERIES["ventas"])
+            ...     .add_report(TotalSalesByEmployee())
+            ...     .add_report(AverageSalesByEmployee())
+            ...     .build_all()
+            ... )
+        """
+        if not source or not source.strip():
+            raise ValueError("source debe ser una tabla, vista o consulta.")
+        self.db = db
+        self.source = source
+        self.params = params
+        self.df = None
         return self
 
+    def compile_sql(self) -> str:
+        """
+        Devuelve la consulta GROUP BY que el modo diferido envía a la base de datos para las estrategias
+        con traducción a SQL, o None si no hay ninguna.
+
+        Raises:
+            ValueError: Si no se estableció un origen con set_source.
+        """
+        if self.source is None:
+            raise ValueError("Debe establecerse un origen con set_source.")
+        state = self._pushdown_state()
+        return state.aggregate_query(self.source) if state is not None else None
+
     def set_combined_sorting(self, key: str, ascending: bool = True):
         """
         Establece la clave y el orden de clasificación para el informe combinado.
@@ -43,11 +129,59 @@ class ReportBuilder:
         self.combined_sort_ascending = ascending
         return self
 
+    def set_fused(self, fused: bool = True):
+        """
+        Activa el modo de ejecución fusionado: las agregaciones de todas las estrategias se resuelven
+        en un solo agrupamiento por "EmployeeID", la búsqueda de nombres de empleados se hace una única vez
+        y el CombinedReport se arma alineando por índice en lugar de encadenar merges.
+        El resultado es idéntico al del modo normal.
+        Si alguna estrategia no es de agregación, build_all utiliza el modo normal.
+        """
+        self.fused = fused
+        return self
+
+    def set_executor(self, executor: str = "serial", max_workers: int = None):
+        """
+        Establece cómo se ejecutan los informes:
+            - "serial": uno después del otro en el proceso actual (por defecto).
+            - "thread": las estrategias independientes se ejecutan en paralelo en un pool de hilos;
+              en modo fusionado, las ventas se particionan por hash de "EmployeeID" entre los hilos.
+            - "process": las ventas se particionan por hash de "EmployeeID" entre procesos. Las columnas
+              necesarias se publican una sola vez en memoria compartida (formato Arrow) y cada proceso
+              lee sin copiar solo su partición. Requiere estrategias de agregación; si no, se usa "thread".
+
+        Como todas las ventas de un empleado quedan en la misma partición y en el mismo orden,
+        los estados parciales se combinan sin alterar los resultados.
+
+        Raises:
+            ValueError: Si executor no es "serial", "thread" o "process".
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"executor debe ser uno de {self.EXECUTORS}.")
+        self.executor = executor
+        self.max_workers = max_workers
+        return self
+
+    def set_accuracy(self, accuracy: float = None):
+        """
+        Establece la precisión de las estrategias aproximadas (ApproximateStrategy), en (0, 1]:
+        fracción de la muestra, precisión de HyperLogLog y compresión de t-digest (ver accuracy_settings).
+        Valores bajos dan resultados más rápidos o sketches más chicos con más error; 1 es la máxima precisión.
+        None conserva la configuración de cada estrategia. No afecta a las estrategias exactas.
+
+        Raises:
+            ValueError: Si accuracy no está en (0, 1].
+        """
+        if accuracy is not None and not 0 < accuracy <= 1:
+            raise ValueError("accuracy debe estar en (0, 1].")
+        self.accuracy = accuracy
+        return self
+
     def add_report(self, strategy: ReportStrategy):
         """
         Agrega una nueva estrategia de reporte al builder.
         """
-        if self.df is None:
+        if self.df is None and self.source is None:
             raise ValueError("Debe existir un DataFrame antes de agregar informes.")
         self._report_configs.append(strategy)
         return self
@@ -62,21 +196,46 @@ class ReportBuilder:
             - value es el DataFrame producido por esa estrategia.
         También añade "CombinedReport" al final.
         """
-        if self.df is None or not self._report_configs:
+        if (self.df is None and self.source is None) or not self._report_configs:
             raise ValueError("Falta un DataFrame o una configuración de informe.")
+        if self.accuracy is not None:
+            for strategy in self._report_configs:
+                if isinstance(strategy, ApproximateStrategy):
+                    strategy.set_accuracy(self.accuracy)
+        if self.source is not None:
+            return self._build_lazy()
+
+        can_fuse = self._can_fuse()
+        is_frame = isinstance(self.df, pd.DataFrame)
+
+        partitionable = can_fuse and not self._ranking_strategies()
+        if is_frame and partitionable and self.executor == "process":
+            return self._finalize_all(self._aggregate_partitioned(processes=True))
+        if is_frame and partitionable and self.fused and self.executor == "thread":
+            return self._finalize_all(self._aggregate_partitioned(processes=False))
+        if self.fused and can_fuse:
+            return self._build_fused()
+
+        if not is_frame:
+            raise ValueError(
+                "Los datos en bloques solo pueden usarse en modo fusionado (set_fused)."
+            )
 
+        return self._assemble(self._generate_reports())
+
+    def _assemble(self, reports):
+        """
+        Metodo privado que arma el diccionario de resultados a partir del informe de cada estrategia,
+        uniendo con merge los combinables en el CombinedReport.
+        """
         result = {}
         combine_reports = None
 
-        for strategy in self._report_configs:
+        for strategy, report in zip(self._report_configs, reports):
             name = strategy.__class__.__name__
-
-            report = strategy.generate_report(
-                self.df,
-                key=self.combined_sort_key,
-                ascending=self.combined_sort_ascending,
-            )
             result[name] = report
+            if not strategy.combinable:
+                continue
 
             if combine_reports is None:
                 combine_reports = report
@@ -89,6 +248,199 @@ class ReportBuilder:
 
         return result
 
+    def _generate_reports(self):
+        """
+        Metodo privado que genera el informe de cada estrategia, en serie o en un pool de hilos.
+        """
+
+        def generate(strategy):
+            return strategy.generate_report(
+                self.df,
+                key=self.combined_sort_key,
+                ascending=self.combined_sort_ascending,
+            )
+
+        if self.executor == "serial" or len(self._report_configs) == 1:
+            return [generate(strategy) for strategy in self._report_configs]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(generate, self._report_configs))
+
+    def _pushdown_state(self):
+        """
+        Metodo privado que crea el estado de agregación de las estrategias con traducción a SQL,
+        o None si no hay ninguna.
+        """
+        columns = [s.column for s in self._report_configs if s.sql_pushdown]
+        return SalesAggregateState(columns) if columns else None
+
+    def _build_lazy(self):
+        """
+        Metodo privado que genera los reportes en modo diferido: una consulta agregada para las estrategias
+        con traducción a SQL y una única lectura de las filas del origen para las demás.
+        """
+        state = self._pushdown_state()
+        if state is not None:
+            state.load_aggregates(
+                self.db.execute_query(state.aggregate_query(self.source), self.params)
+            )
+
+        data = None
+        if not all(strategy.sql_pushdown for strategy in self._report_configs):
+            data = self.db.execute_query(
+                f"select * from {from_clause(self.source)}", self.params
+            )
+
+        reports = [
+            strategy.finalize(state, self.combined_sort_key, self.combined_sort_ascending)
+            if strategy.sql_pushdown
+            else strategy.generate_report(
+                data, key=self.combined_sort_key, ascending=self.combined_sort_ascending
+            )
+            for strategy in self._report_configs
+        ]
+        return self._assemble(reports)
+
+    def _can_fuse(self):
+        """
+        Metodo privado que indica si todas las estrategias cargadas pueden resolverse en una sola pasada.
+        """
+        strategies = self._report_configs
+        aggregates = self._aggregate_strategies()
+        names = [strategy.__class__.__name__ for strategy in strategies]
+        labels = [strategy.label for strategy in aggregates]
+        return (
+            bool(aggregates)
+            and len(aggregates) + len(self._ranking_strategies()) == len(strategies)
+            and len(set(names)) == len(names)
+            and len(set(labels)) == len(labels)
+        )
+
+    def _aggregate_strategies(self):
+        """
+        Metodo privado que devuelve las estrategias de agregación por vendedor cargadas.
+        """
+        return [s for s in self._report_configs if isinstance(s, AggregateReportStrategy)]
+
+    def _ranking_strategies(self):
+        """
+        Metodo privado que devuelve las estrategias de ranking que mantienen su propio estado.
+        """
+        return [s for s in self._report_configs if isinstance(s, RankingStrategy)]
+
+    def _build_fused(self):
+        """
+        Metodo privado que genera todos los reportes a partir de un único estado de agregación
+        compartido por todas las estrategias de agregación, más el estado propio de cada estrategia
+        de ranking, actualizados en una sola pasada sobre los bloques.
+        """
+        state = SalesAggregateState(
+            [strategy.column for strategy in self._aggregate_strategies()]
+        )
+        rankings = {id(s): s.create_state() for s in self._ranking_strategies()}
+        for chunk in iter_chunks(self.df):
+            state.update(chunk)
+            for strategy in self._ranking_strategies():
+                strategy.update_state(rankings[id(strategy)], chunk)
+        return self._finalize_all(state, rankings)
+
+    def _finalize_all(self, state: SalesAggregateState, rankings: dict = None):
+        """
+        Metodo privado que finaliza todas las estrategias a partir de un estado de agregación
+        (y de los estados de las estrategias de ranking) y arma el diccionario de resultados
+        con el mismo orden de claves que el modo normal.
+        """
+        reports = [
+            strategy.finalize(
+                rankings[id(strategy)] if isinstance(strategy, RankingStrategy) else state,
+                key=self.combined_sort_key,
+                ascending=self.combined_sort_ascending,
+            )
+            for strategy in self._report_configs
+        ]
+        combinable = [
+            (strategy, report)
+            for strategy, report in zip(self._report_configs, reports)
+            if strategy.combinable
+        ]
+        combined = self._combine_aligned(
+            [report for _, report in combinable], [strategy.label for strategy, _ in combinable]
+        )
+
+        result = {}
+        for strategy, report in zip(self._report_configs, reports):
+            result[strategy.__class__.__name__] = report
+            if strategy.combinable:
+                result["CombinedReport"] = combined
+        return result
+
+    def _aggregate_partitioned(self, processes: bool) -> SalesAggregateState:
+        """
+        Metodo privado que particiona las ventas por hash de "EmployeeID", agrega cada partición
+        en paralelo (hilos o procesos) y combina los estados parciales.
+        """
+        columns = [strategy.column for strategy in self._report_configs]
+        needed = list(dict.fromkeys(["EmployeeID", "EmployeeName"] + columns))
+        workers = self.max_workers or os.cpu_count() or 1
+
+        frame = self.df[needed]
+        codes = (
+            pd.util.hash_pandas_object(frame["EmployeeID"], index=False).to_numpy()
+            % workers
+        )
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(workers + 1))
+        frame = frame.take(order)
+
+        if processes:
+            states = _aggregate_in_processes(frame, columns, bounds, workers)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                states = list(
+                    executor.map(
+                        lambda i: SalesAggregateState(columns).update(
+                            frame.iloc[bounds[i] : bounds[i + 1]]
+                        ),
+                        range(workers),
+                    )
+                )
+
+        state = SalesAggregateState(columns)
+        for partial in states:
+            state.merge(partial)
+        return state
+
+    def _combine_aligned(self, reports, labels):
+        """
+        Metodo privado que arma el informe combinado alineando por "IDVendedor",
+        con las mismas columnas y el mismo orden que produce la cadena de merges.
+        """
+        if len(reports) == 1:
+            return reports[0]
+
+        ids = pd.Index(
+            pd.concat([report["IDVendedor"] for report in reports]).unique()
+        ).sort_values()
+
+        # Como en _clean_combined_df: el nombre se toma del primer informe que incluye al vendedor
+        # (un Top-N cargado primero no incluye a todos).
+        names = reports[0].set_index("IDVendedor")["Nombre Apellido Vendedor"]
+        for report in reports[1:]:
+            names = names.combine_first(
+                report.set_index("IDVendedor")["Nombre Apellido Vendedor"]
+            )
+        combined = pd.DataFrame(
+            {
+                "IDVendedor": ids,
+                "Nombre Apellido Vendedor": names.reindex(ids).to_numpy(),
+            }
+        )
+        for report, label in zip(reports, labels):
+            combined[label] = report.set_index("IDVendedor")[label].reindex(ids).to_numpy()
+
+        return combined.sort_values(
+            "Nombre Apellido Vendedor", ascending=self.combined_sort_ascending
+        ).reset_index(drop=True)
+
     def _clean_combined_df(self, df: pd.DataFrame):
         """
         Metodo privado que limpia el DataFrame combinado eliminando columnas duplicadas y renombrando las columnas de IDVendedor.
@@ -108,3 +460,56 @@ class ReportBuilder:
             ).reset_index(drop=True)
 
         return df
+
+
+def _aggregate_in_processes(frame, columns, bounds, workers):
+    """
+    Publica las columnas necesarias en memoria compartida como un stream Arrow IPC
+    y agrega cada partición [bounds[i], bounds[i + 1]) en un proceso distinto.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    buffer = sink.getvalue()
+    del table
+
+    shm = shared_memory.SharedMemory(create=True, size=max(buffer.size, 1))
+    try:
+        shm.buf[: buffer.size] = memoryview(buffer).cast("B")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _aggregate_shared_partition,
+                    shm.name,
+                    buffer.size,
+                    columns,
+                    int(bounds[i]),
+                    int(bounds[i + 1]),
+                )
+                for i in range(workers)
+            ]
+            return [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _aggregate_shared_partition(shm_name, size, columns, start, stop):
+    """
+    Se ejecuta en un proceso trabajador: lee sin copiar la tabla Arrow de la memoria compartida,
+    convierte a pandas solo las filas de su partición y devuelve su estado de agregación.
+    """
+    import pyarrow as pa
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(shm.buf[:size])).read_all()
+        chunk = table.slice(start, stop - start).to_pandas()
+        state = SalesAggregateState(columns).update(chunk)
+        del table, chunk
+        return state
+    finally:
+        shm.close()
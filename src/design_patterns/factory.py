@@ -1,16 +1,171 @@
 from abc import ABC, abstractmethod
+import pandas as pd
+
+
+class SlotsRecord:
+    """
+    Registro compacto basado en __slots__ (sin __dict__ por instancia).
+    Las subclases declaran sus atributos en __slots__ y se construyen con los valores en ese orden.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def as_dict(self):
+        """
+        Devuelve los atributos del registro como diccionario.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())
+        return f"{self.__class__.__name__}({values})"
+
+
+class ColumnarRecords:
+    """
+    Vista columnar y perezosa sobre un conjunto de registros.
+
+    Guarda un arreglo por atributo y solo materializa un registro (record_type) cuando se accede a él,
+    ya sea por índice o al iterar. Permite además acceder a columnas completas sin crear objetos.
+
+    Ejemplo:
+        >>> ventas = SalesSummary.from_dataframe(df_sales)
+        >>> len(ventas)
+        >>> ventas[0].total_price
+        >>> ventas.column("total_price").sum()
+    """
+
+    def __init__(self, columns: dict, record_type):
+        self._columns = columns
+        self.record_type = record_type
+        self._length = len(next(iter(columns.values()))) if columns else 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarRecords(
+                {field: values[index] for field, values in self._columns.items()},
+                self.record_type,
+            )
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Índice fuera de rango.")
+        return self.record_type(
+            *(self._columns[field][index] for field in self.record_type.__slots__)
+        )
+
+    def __iter__(self):
+        arrays = [self._columns[field] for field in self.record_type.__slots__]
+        for values in zip(*arrays):
+            yield self.record_type(*values)
+
+    def column(self, field: str):
+        """
+        Devuelve el arreglo completo de un atributo, sin materializar registros.
+        """
+        return self._columns[field]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Devuelve los registros como DataFrame, con una columna por atributo.
+        """
+        return pd.DataFrame(self._columns)
 
 
 class BaseFactory(ABC):
     """
     Clase base abstracta para fabricas que define el método from_series.
     Las clases que hereden de BaseFactory deben implementar este método para crear instancias
+
+    Las subclases declaran además columns (atributo -> columna del DataFrame) y record_type
+    (registro con __slots__) para construir colecciones completas con from_dataframe.
     """
 
+    columns = {}
+    record_type = None
+
     @abstractmethod
     def from_series(self, serie):
         pass
 
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Crea instancias de forma perezosa a partir de un iterador de bloques de DataFrames
+        (por ejemplo, el resultado de DBConnection.execute_query_chunks).
+        Solo se mantiene en memoria un bloque a la vez.
+
+        Ejemplo:
+            >>> for venta in SalesSummary.from_chunks(db.execute_query_chunks(query)):
+            ...     procesar(venta)
+        """
+        for chunk in chunks:
+            for _, serie in chunk.iterrows():
+                yield cls.from_series(serie)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> ColumnarRecords:
+        """
+        Crea la colección completa de registros a partir de un DataFrame en una sola operación.
+        Toma los arreglos de cada columna sin recorrer las filas y devuelve una vista columnar
+        que materializa registros compactos (record_type) solo al accederlos.
+
+        Raises:
+            KeyError: Si falta alguna de las columnas necesarias.
+
+        Ejemplo:
+            >>> ventas = SalesSummary.from_dataframe(df_sales)
+            >>> ventas[0].as_dict()
+        """
+        return ColumnarRecords(
+            {field: df[column].to_numpy() for field, column in cls.columns.items()},
+            cls.record_type,
+        )
+
+
+class SalesSummaryRecord(SlotsRecord):
+    """
+    Registro compacto de SalesSummary generado por SalesSummary.from_dataframe.
+    """
+
+    __slots__ = (
+        "sale_id",
+        "product_id",
+        "product_name",
+        "quantity",
+        "total_price",
+        "customer_id",
+        "customer_name",
+        "employee_id",
+        "employee_name",
+    )
+
+
+class CustomerLocationInfoRecord(SlotsRecord):
+    """
+    Registro compacto de CustomerLocationInfo generado por CustomerLocationInfo.from_dataframe.
+    """
+
+    __slots__ = (
+        "customer_id",
+        "first_name",
+        "middle_initial",
+        "last_name",
+        "address",
+        "city_name",
+        "country_name",
+    )
+
 
 class SalesSummary(BaseFactory):
     """
@@ -43,6 +198,7 @@ class SalesSummary(BaseFactory):
 
     Methods:
         from_series(serie): Crea una instancia de SalesSummary a partir de una serie de datos.
+        from_dataframe(df): Crea todos los registros (SalesSummaryRecord) de un DataFrame en una sola operación.
 
     Ejemplo:
         >>> sales_summary = SalesSummary.from_series(serie)
@@ -51,6 +207,19 @@ class SalesSummary(BaseFactory):
         SalesSummary: Una instancia de la clase SalesSummary con los datos de la venta.
     """
 
+    columns = {
+        "sale_id": "SalesID",
+        "product_id": "ProductID",
+        "product_name": "ProductName",
+        "quantity": "Quantity",
+        "total_price": "TotalPrice",
+        "customer_id": "CustomerID",
+        "customer_name": "CustomerName",
+        "employee_id": "EmployeeID",
+        "employee_name": "EmployeeName",
+    }
+    record_type = SalesSummaryRecord
+
     def __init__(
         self,
         sale_id,
@@ -120,6 +289,7 @@ class CustomerLocationInfo(BaseFactory):
 
     Methods:
         from_series(serie): Crea una instancia de CustomerLocationInfo a partir de una serie de datos.
+        from_dataframe(df): Crea todos los registros (CustomerLocationInfoRecord) de un DataFrame en una sola operación.
 
     Ejemplo:
         >>> customer_location = CustomerLocationInfo.from_series(serie)
@@ -128,6 +298,17 @@ class CustomerLocationInfo(BaseFactory):
         CustomerLocationInfo: Una instancia de la clase CustomerLocationInfo con los datos del cliente.
     """
 
+    columns = {
+        "customer_id": "CustomerID",
+        "first_name": "FirstName",
+        "middle_initial": "MiddleInitial",
+        "last_name": "LastName",
+        "address": "Address",
+        "city_name": "CityName",
+        "country_name": "CountryName",
+    }
+    record_type = CustomerLocationInfoRecord
+
     def __init__(
         self,
         customer_id,
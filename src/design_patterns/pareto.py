@@ -0,0 +1,326 @@
+import numpy as np
+import pandas as pd
+from src.design_patterns.sketches import MergeableSketch
+
+# Columnas del índice por categoría (ver ParetoIndex.share), con los nombres de la consulta
+# "porcentaje_categoria" de main.ipynb y de sp_porcentaje_producto_total.
+SHARE_COLUMNS = [
+    "CategoryID",
+    "CategoryName",
+    "ProductID",
+    "ProductName",
+    "TotalFacturado",
+    "TotalCategoria",
+    "GranTotal",
+    "PorcentajeEnCategoria",
+    "PorcentajeEnTotal",
+    "PorcentajeAcumulado",
+    "ClaseABC",
+]
+
+
+def cumulative_share(groups, values) -> tuple:
+    """
+    Ordena los valores de mayor a menor dentro de cada grupo y calcula su participación acumulada
+    en el total del grupo, para todos los grupos en una sola pasada vectorizada (lexsort + cumsum).
+
+    Args:
+        groups: Grupo de cada valor (por ejemplo, la categoría de cada producto).
+        values: Valores a acumular (por ejemplo, el total facturado de cada producto).
+
+    Returns:
+        tuple: (order, starts, cumulative): posiciones ordenadas por grupo y valor descendente,
+        posición inicial de cada grupo dentro de order y participación acumulada (0 a 1) de cada posición.
+        Los grupos cuyo total es 0 quedan con participación acumulada 1.
+    """
+    values = np.asarray(values, dtype=float)
+    codes = pd.factorize(np.asarray(groups), sort=True)[0]
+    order = np.lexsort((-values, codes))
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+
+    starts = np.flatnonzero(np.diff(sorted_codes, prepend=-1))
+    sizes = np.diff(np.append(starts, len(order)))
+    running = np.cumsum(sorted_values)
+    running -= np.repeat(running[starts] - sorted_values[starts], sizes)
+    totals = np.repeat(running[starts + sizes - 1], sizes)
+    cumulative = np.divide(running, totals, out=np.ones_like(running), where=totals != 0)
+    return order, starts, cumulative
+
+
+class ParetoIndex(MergeableSketch):
+    """
+    Índice de participación acumulada (Pareto) de los productos en la facturación de su categoría,
+    con la clasificación ABC de cada producto.
+
+    La consulta "porcentaje_categoria" de main.ipynb y sp_porcentaje_producto_total recorren sales con CTE
+    en cada llamada, una categoría por llamada. El índice guarda el total por producto (se actualiza
+    bloque a bloque con update, también con ventas nuevas) y, al consultarlo, calcula para todas las
+    categorías a la vez el orden de los productos por facturación y su participación acumulada
+    (ver cumulative_share). Cada categoría queda como arreglos ordenados, de modo que "qué productos
+    forman el 80 % de la categoría X" se resuelve con una búsqueda binaria (np.searchsorted, O(log n)).
+    Al agregar ventas solo se recalculan las categorías que cambiaron; el porcentaje sobre el total
+    general se calcula al armar el resultado, así que no invalida las demás.
+
+    Clasificación ABC: un producto es "A" si la participación acumulada de los productos que lo preceden
+    es menor que thresholds[0] (por defecto 80 %), "B" si es menor que thresholds[1] (95 %) y "C" si no.
+    Los productos "A" son exactamente los que devuelve products_for_share(categoría, thresholds[0]).
+
+    Args:
+        value (str): Columna a sumar. Por defecto "TotalPrice"; "TotalFacturado" para cargar
+            mv_ventas_producto (update acepta filas ya agregadas por producto).
+        item (str): Columna del producto. Por defecto "ProductID".
+        group (str): Columna de la categoría. Por defecto "CategoryID".
+        item_name (str, opcional): Columna descriptiva del producto. Por defecto "ProductName".
+        group_name (str, opcional): Columna descriptiva de la categoría. Por defecto "CategoryName".
+        thresholds (tuple): Límites de participación acumulada de las clases A y B. Por defecto (0.8, 0.95).
+
+    Raises:
+        ValueError: Si los límites no cumplen 0 < A <= B <= 1.
+
+    Ejemplo:
+        >>> df = dimensions.enrich(db.execute_query(FACT_QUERY), ["ProductName", "CategoryID", "CategoryName"])
+        >>> index = ParetoIndex().update(df)
+        >>> index.products_for_share(1, 0.8)  # productos que forman el 80 % de la categoría 1
+        >>> index.update(df_ventas_nuevas).share(1)  # mismo resultado que sp_porcentaje_producto_total(1)
+    """
+
+    def __init__(
+        self,
+        value="TotalPrice",
+        item="ProductID",
+        group="CategoryID",
+        item_name="ProductName",
+        group_name="CategoryName",
+        thresholds=(0.8, 0.95),
+    ):
+        if len(thresholds) != 2 or not 0 < thresholds[0] <= thresholds[1] <= 1:
+            raise ValueError("thresholds debe ser (A, B) con 0 < A <= B <= 1.")
+        self.value = value
+        self.item = item
+        self.group = group
+        self.item_name = item_name
+        self.group_name = group_name
+        self.thresholds = tuple(thresholds)
+        self.totals = pd.Series(dtype=float, index=pd.Index([], name=item))
+        self.groups = pd.Series(dtype=object, index=pd.Index([], name=item))
+        self.item_names = pd.Series(dtype=object, index=pd.Index([], name=item))
+        self.group_names = pd.Series(dtype=object, index=pd.Index([], name=group))
+        self.entries = {}
+        self.dirty = set()
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Incorpora un bloque de ventas (o de totales por producto) al índice y marca sus categorías
+        para recalcular. Devuelve el propio índice para encadenar llamadas.
+        """
+        if chunk.empty:
+            return self
+        totals = chunk.groupby(self.item, sort=False)[self.value].sum().astype(float)
+        first = chunk.drop_duplicates(subset=self.item).set_index(self.item)
+        item_names = first[self.item_name] if self.item_name else None
+        group_names = None
+        if self.group_name:
+            group_names = chunk.drop_duplicates(subset=self.group).set_index(self.group)[self.group_name]
+        return self._combine(totals, first[self.group], item_names, group_names)
+
+    def merge(self, other: "ParetoIndex"):
+        """
+        Combina otro índice (con las mismas columnas) dentro de este. Devuelve el propio índice.
+
+        Raises:
+            ValueError: Si los índices no usan las mismas columnas de producto y categoría.
+        """
+        if (other.item, other.group) != (self.item, self.group):
+            raise ValueError("Solo se pueden combinar índices con las mismas columnas de producto y categoría.")
+        return self._combine(other.totals, other.groups, other.item_names, other.group_names)
+
+    def categories(self) -> list:
+        """
+        Categorías del índice, ordenadas.
+        """
+        return sorted(self.groups.unique().tolist())
+
+    def products_for_share(self, category, share: float = 0.8) -> pd.DataFrame:
+        """
+        Devuelve los productos de mayor facturación que, juntos, alcanzan al menos share de la facturación
+        de la categoría. La cantidad de productos se obtiene con una búsqueda binaria sobre la
+        participación acumulada (ver count_for_share) y solo se arman sus filas.
+
+        Args:
+            category: Valor de la columna group (por defecto CategoryID).
+            share (float): Participación acumulada buscada, en (0, 1]. Por defecto 0.8.
+
+        Returns:
+            pd.DataFrame: Las filas de share(category) de esos productos, ordenadas por facturación descendente.
+
+        Raises:
+            ValueError: Si share no está en (0, 1] o la categoría no existe.
+        """
+        count = self.count_for_share(category, share)
+        items, values, cumulative, total = self._entry(category)
+        return self._frame([(category, (items[:count], values[:count], cumulative[:count], total))])
+
+    def count_for_share(self, category, share: float = 0.8) -> int:
+        """
+        Cantidad de productos de mayor facturación necesarios para alcanzar share de la facturación
+        de la categoría, con np.searchsorted sobre la participación acumulada (O(log n)).
+
+        Raises:
+            ValueError: Si share no está en (0, 1] o la categoría no existe.
+        """
+        if not 0 < share <= 1:
+            raise ValueError("share debe estar en (0, 1].")
+        cumulative = self._entry(category)[2]
+        return min(int(np.searchsorted(cumulative, share, side="left")) + 1, len(cumulative))
+
+    def share(self, category=None) -> pd.DataFrame:
+        """
+        Total facturado por producto, su porcentaje dentro de la categoría y del total general,
+        el porcentaje acumulado en la categoría y la clase ABC.
+
+        Con category devuelve lo mismo que sp_porcentaje_producto_total para esa categoría; sin ella,
+        lo mismo que la consulta "porcentaje_categoria" (todas las categorías), con las columnas de
+        SHARE_COLUMNS (los nombres que no se registran quedan nulos).
+
+        Returns:
+            pd.DataFrame: Ordenado por nombre de categoría y por facturación descendente.
+
+        Raises:
+            ValueError: Si la categoría no existe.
+        """
+        self._refresh()
+        categories = self.categories() if category is None else [category]
+        resultado = self._frame([(c, self._entry(c)) for c in categories])
+        if category is None and self.group_name:
+            resultado = resultado.sort_values("CategoryName", kind="stable").reset_index(drop=True)
+        return resultado
+
+    def _frame(self, entries: list) -> pd.DataFrame:
+        """
+        Metodo privado que arma las filas de share a partir de las entradas (ordenadas) de cada categoría.
+        """
+        if not entries:
+            return pd.DataFrame(columns=SHARE_COLUMNS)
+        sizes = [len(entry[0]) for _, entry in entries]
+        items = np.concatenate([entry[0] for _, entry in entries])
+        values = np.concatenate([entry[1] for _, entry in entries])
+        cumulative = np.concatenate([entry[2] for _, entry in entries])
+        groups = np.repeat([c for c, _ in entries], sizes)
+        category_totals = np.repeat([entry[3] for _, entry in entries], sizes)
+        grand_total = self.totals.sum()
+
+        # participación acumulada de los productos que preceden a cada uno (0 para el primero de cada categoría)
+        previous = np.concatenate([np.r_[0.0, entry[2][:-1]] for _, entry in entries])
+        in_category = np.divide(values, category_totals, out=np.zeros_like(values), where=category_totals != 0)
+        return pd.DataFrame(
+            {
+                "CategoryID": groups,
+                "CategoryName": self.group_names.reindex(groups).to_numpy(),
+                "ProductID": items,
+                "ProductName": self.item_names.reindex(items).to_numpy(),
+                "TotalFacturado": values,
+                "TotalCategoria": category_totals,
+                "GranTotal": grand_total,
+                "PorcentajeEnCategoria": np.round(100 * in_category, 2),
+                "PorcentajeEnTotal": np.round(100 * values / grand_total, 2) if grand_total else 0.0,
+                "PorcentajeAcumulado": np.round(100 * cumulative, 2),
+                "ClaseABC": np.select(
+                    [previous < self.thresholds[0], previous < self.thresholds[1]], ["A", "B"], "C"
+                ),
+            }
+        )
+
+    def _entry(self, category) -> tuple:
+        """
+        Metodo privado que devuelve (productos, totales, participación acumulada, total de la categoría)
+        de una categoría, recalculando las categorías pendientes.
+        """
+        self._refresh()
+        if category not in self.entries:
+            raise ValueError(f"Categoría desconocida: {category}.")
+        return self.entries[category]
+
+    def _refresh(self):
+        """
+        Metodo privado que recalcula en una sola pasada el orden y la participación acumulada
+        de las categorías que cambiaron desde la última consulta.
+        """
+        if not self.dirty:
+            return
+        mask = self.groups.isin(self.dirty).to_numpy()
+        items = self.groups.index.to_numpy()[mask]
+        groups = self.groups.to_numpy()[mask]
+        values = self.totals.reindex(items).to_numpy()
+        order, starts, cumulative = cumulative_share(groups, values)
+        for start, end in zip(starts, np.r_[starts[1:], len(order)]):
+            positions = order[start:end]
+            self.entries[groups[positions[0]]] = (
+                items[positions], values[positions], cumulative[start:end], values[positions].sum()
+            )
+        self.dirty = set()
+
+    def _combine(self, totals: pd.Series, groups: pd.Series, item_names=None, group_names=None):
+        """
+        Metodo privado que suma totales parciales por producto y conserva la primera categoría
+        y los primeros nombres vistos.
+        """
+        if totals.empty:
+            return self
+        self.totals = totals.copy() if self.totals.empty else self.totals.add(totals, fill_value=0)
+        self.totals.index.name = self.item
+        self.groups = _append_new(self.groups, groups)
+        if item_names is not None:
+            self.item_names = _append_new(self.item_names, item_names)
+        if group_names is not None:
+            self.group_names = _append_new(self.group_names, group_names)
+        self.dirty.update(self.groups.reindex(totals.index).unique().tolist())
+        return self
+
+    def _dump(self):
+        meta = {
+            "value": self.value,
+            "item": self.item,
+            "group": self.group,
+            "item_name": self.item_name,
+            "group_name": self.group_name,
+            "thresholds": list(self.thresholds),
+            "items": self.totals.index.tolist(),
+            "groups": self.groups.reindex(self.totals.index).tolist(),
+            "item_names": self.item_names.reindex(self.totals.index).tolist(),
+            "group_keys": self.group_names.index.tolist(),
+            "group_names": self.group_names.tolist(),
+        }
+        return meta, {"totals": self.totals.to_numpy()}
+
+    @classmethod
+    def _restore(cls, meta, arrays):
+        index = cls(
+            value=meta["value"],
+            item=meta["item"],
+            group=meta["group"],
+            item_name=meta["item_name"],
+            group_name=meta["group_name"],
+            thresholds=meta["thresholds"],
+        )
+        items = pd.Index(meta["items"], name=meta["item"])
+        group_names = None
+        if meta["group_name"]:
+            group_names = pd.Series(meta["group_names"], index=pd.Index(meta["group_keys"], name=meta["group"]))
+        return index._combine(
+            pd.Series(arrays["totals"], index=items),
+            pd.Series(meta["groups"], index=items),
+            pd.Series(meta["item_names"], index=items) if meta["item_name"] else None,
+            group_names,
+        )
+
+
+def _append_new(current: pd.Series, new: pd.Series) -> pd.Series:
+    """
+    Agrega a una serie indexada por clave los valores de las claves que todavía no tiene.
+    """
+    new = new[~new.index.duplicated()]
+    if current.empty:
+        return new.copy()
+    new = new[~new.index.isin(current.index)]
+    return current if new.empty else pd.concat([current, new])
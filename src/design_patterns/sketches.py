@@ -0,0 +1,434 @@
+import json
+import math
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from src.design_patterns.aggregation import SalesAggregateState
+
+
+def accuracy_settings(accuracy: float) -> dict:
+    """
+    Traduce el nivel de precisión de ReportBuilder.set_accuracy (0 < accuracy <= 1) a los parámetros
+    de cada estimación: fracción de la muestra, precisión de HyperLogLog y compresión de t-digest.
+    Con accuracy=1 la muestra es completa (resultado exacto) y los sketches usan su tamaño máximo.
+
+    Raises:
+        ValueError: Si accuracy no está en (0, 1].
+    """
+    if not 0 < accuracy <= 1:
+        raise ValueError("accuracy debe estar en (0, 1].")
+    return {
+        "fraction": accuracy,
+        "precision": 4 + round(12 * accuracy),
+        "compression": 20 + round(480 * accuracy),
+    }
+
+
+class MergeableSketch(ABC):
+    """
+    Clase base de los estados aproximados: se combinan con merge y se guardan y cargan de disco
+    (save / load, un archivo .npz sin pickle) para actualizarlos de forma incremental con ventas nuevas.
+
+    Las subclases implementan _dump (metadatos JSON y arreglos de numpy) y _restore.
+    """
+
+    def save(self, path: str):
+        """
+        Guarda el estado en un archivo .npz.
+        """
+        meta, arrays = self._dump()
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Carga un estado guardado con save.
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {name: data[name] for name in data.files if name != "meta"}
+        return cls._restore(meta, arrays)
+
+    @abstractmethod
+    def _dump(self):
+        """
+        Devuelve (metadatos serializables en JSON, {nombre: arreglo de numpy}) con el estado.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def _restore(cls, meta: dict, arrays: dict):
+        """
+        Reconstruye el estado a partir de lo devuelto por _dump.
+        """
+        pass
+
+
+def _names_dict(names: pd.DataFrame, key: str, name_column: str) -> dict:
+    """
+    Devuelve los nombres de las claves como listas serializables en JSON.
+    """
+    if not name_column or names.empty:
+        return {"keys": [], "names": []}
+    return {"keys": names[key].tolist(), "names": names[name_column].tolist()}
+
+
+class SampledAggregateState(SalesAggregateState, MergeableSketch):
+    """
+    Estado de agregación por clave calculado sobre una muestra de Bernoulli de las ventas.
+
+    Cada fila se conserva con probabilidad fraction, así que el tiempo de agregación baja en la misma
+    proporción. Los totales se estiman con el estimador de Horvitz-Thompson (suma de la muestra / fraction)
+    y su varianza con (1 - fraction) / fraction² · suma de cuadrados de la muestra, que el estado ya guarda.
+    Dos estados con la misma fraction se combinan con merge.
+
+    Args:
+        columns (list[str]): Columnas numéricas a agregar.
+        fraction (float): Fracción de filas muestreadas, en (0, 1]. Por defecto 0.1.
+        key (str): Columna por la cual se agrupa. Por defecto "EmployeeID".
+        name_column (str, opcional): Columna descriptiva de la clave. Por defecto "EmployeeName".
+        seed (int, opcional): Semilla del muestreo.
+
+    Ejemplo:
+        >>> state = SampledAggregateState(["TotalPrice"], fraction=0.05)
+        >>> state.update(df_sales).estimate_total("TotalPrice")
+    """
+
+    def __init__(self, columns, fraction=0.1, key="EmployeeID", name_column="EmployeeName", seed=None):
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction debe estar en (0, 1].")
+        super().__init__(columns, key=key, name_column=name_column)
+        self.fraction = fraction
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.rows_seen = 0
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Incorpora una muestra del bloque al estado. Devuelve el propio estado para encadenar llamadas.
+        """
+        self.rows_seen += len(chunk)
+        if self.fraction < 1:
+            chunk = chunk[self.rng.random(len(chunk)) < self.fraction]
+        if chunk.empty:
+            return self
+        return super().update(chunk)
+
+    def merge(self, other: "SampledAggregateState"):
+        """
+        Combina otro estado muestreado con la misma fraction. Devuelve el propio estado.
+
+        Raises:
+            ValueError: Si las fracciones, columnas o claves no coinciden.
+        """
+        if getattr(other, "fraction", None) != self.fraction:
+            raise ValueError("Solo se pueden combinar muestras con la misma fraction.")
+        super().merge(other)
+        self.rows_seen += other.rows_seen
+        return self
+
+    def estimate_total(self, column: str) -> pd.Series:
+        """Total estimado de la columna por clave."""
+        return (self.sum(column) / self.fraction).rename(column)
+
+    def estimate_count(self, column: str) -> pd.Series:
+        """Cantidad estimada de valores no nulos de la columna por clave."""
+        return (self.count(column) / self.fraction).rename(column)
+
+    def total_error(self, column: str, confidence: float = 0.95) -> pd.Series:
+        """
+        Semiancho del intervalo de confianza (aproximación normal) del total estimado por clave.
+        """
+        z = _z_value(confidence)
+        variance = (1 - self.fraction) / self.fraction**2 * self.stats[(column, "sumsq")].astype(float)
+        return (z * np.sqrt(variance)).rename(column)
+
+    def _dump(self):
+        meta = {
+            "columns": self.columns,
+            "fraction": self.fraction,
+            "key": self.key,
+            "name_column": self.name_column,
+            "rows_seen": self.rows_seen,
+            "index": self.stats.index.tolist(),
+            **_names_dict(self.names, self.key, self.name_column),
+        }
+        return meta, {"stats": self.stats.to_numpy(dtype=float)}
+
+    @classmethod
+    def _restore(cls, meta, arrays):
+        state = cls(meta["columns"], meta["fraction"], meta["key"], meta["name_column"])
+        state.rows_seen = meta["rows_seen"]
+        if meta["index"]:
+            state.stats = pd.DataFrame(
+                arrays["stats"], index=pd.Index(meta["index"], name=state.key), columns=state.stats.columns
+            )
+        if state.name_column and meta["keys"]:
+            state.names = pd.DataFrame({state.key: meta["keys"], state.name_column: meta["names"]})
+        return state
+
+
+def _z_value(confidence: float) -> float:
+    """
+    Devuelve el cuantil de la normal estándar para un intervalo de confianza bilateral.
+    """
+    from statistics import NormalDist
+
+    if not 0 < confidence < 1:
+        raise ValueError("confidence debe estar en (0, 1).")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Cantidad de bits significativos de cada entero sin signo de 64 bits (exponente de frexp, corregido
+    cuando la conversión a float redondea hacia la potencia de 2 siguiente).
+    """
+    exponent = np.frexp(values.astype(np.float64))[1].astype(np.int64)
+    shift = np.maximum(exponent - 1, 0).astype(np.uint64)
+    return exponent - ((exponent > 0) & ((values >> shift) == 0))
+
+
+class HyperLogLogState(MergeableSketch):
+    """
+    Cantidad aproximada de valores distintos (por defecto clientes) por clave (por defecto vendedor)
+    con HyperLogLog.
+
+    Cada clave guarda 2^precision registros de un byte, sin importar cuántos valores distintos vea;
+    el error relativo típico es 1.04 / sqrt(2^precision) (1.6 % con precision=12). Los registros
+    se combinan con el máximo, así que dos estados (por ejemplo, de días distintos) se suman con merge
+    sin volver a leer las ventas.
+
+    Args:
+        value (str): Columna cuyos valores distintos se cuentan. Por defecto "CustomerID".
+        key (str): Columna por la cual se agrupa. Por defecto "EmployeeID".
+        name_column (str, opcional): Columna descriptiva de la clave. Por defecto "EmployeeName".
+        precision (int): Bits del índice de registro, entre 4 y 18. Por defecto 12.
+
+    Ejemplo:
+        >>> state = HyperLogLogState(precision=14).update(df_sales)
+        >>> state.estimate()
+    """
+
+    def __init__(self, value="CustomerID", key="EmployeeID", name_column="EmployeeName", precision=12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision debe estar entre 4 y 18.")
+        self.value = value
+        self.key = key
+        self.name_column = name_column
+        self.precision = precision
+        self.keys = pd.Index([], name=key)
+        self.registers = np.zeros((0, 2**precision), dtype=np.uint8)
+        self.names = pd.DataFrame(columns=[key, name_column] if name_column else [key])
+
+    @property
+    def relative_error(self) -> float:
+        """Error relativo típico (un desvío estándar) de las estimaciones."""
+        return 1.04 / math.sqrt(2**self.precision)
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Incorpora los valores de un bloque de ventas. Devuelve el propio estado para encadenar llamadas.
+        """
+        chunk = chunk[chunk[self.value].notna() & chunk[self.key].notna()]
+        if chunk.empty:
+            return self
+        hashes = pd.util.hash_pandas_object(chunk[self.value], index=False).to_numpy()
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        rest = hashes & ((np.uint64(1) << (np.uint64(64) - p)) - np.uint64(1))
+        rank = (64 - self.precision - _bit_length(rest) + 1).astype(np.uint8)
+
+        rows = self._rows(chunk[self.key])
+        np.maximum.at(self.registers, (rows, index), rank)
+
+        if self.name_column:
+            names = chunk[[self.key, self.name_column]].drop_duplicates(subset=self.key)
+            self.names = (
+                names if self.names.empty else pd.concat([self.names, names]).drop_duplicates(subset=self.key)
+            )
+        return self
+
+    def merge(self, other: "HyperLogLogState"):
+        """
+        Combina otro estado con la misma precisión. Devuelve el propio estado.
+
+        Raises:
+            ValueError: Si las precisiones o las claves no coinciden.
+        """
+        if other.precision != self.precision or other.key != self.key:
+            raise ValueError("Solo se pueden combinar estados con la misma precisión y clave.")
+        rows = self._rows(pd.Series(other.keys))
+        self.registers[rows] = np.maximum(self.registers[rows], other.registers)
+        if self.name_column and not other.names.empty:
+            self.names = pd.concat([self.names, other.names]).drop_duplicates(subset=self.key)
+        return self
+
+    def estimate(self) -> pd.Series:
+        """
+        Cantidad estimada de valores distintos por clave, con la corrección para cardinalidades bajas.
+        """
+        m = self.registers.shape[1]
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.power(2.0, -self.registers.astype(float)).sum(axis=1)
+        zeros = (self.registers == 0).sum(axis=1)
+        small = (raw <= 2.5 * m) & (zeros > 0)
+        estimate = np.where(small, m * np.log(m / np.maximum(zeros, 1)), raw)
+        return pd.Series(np.round(estimate).astype(np.int64), index=self.keys, name=self.value)
+
+    def _rows(self, keys: pd.Series) -> np.ndarray:
+        """
+        Metodo privado que devuelve la fila de registros de cada clave, agregando las claves nuevas.
+        """
+        new = pd.Index(keys.unique()).difference(self.keys)
+        if len(new):
+            new = pd.Index(new, name=self.key)
+            self.keys = new if self.keys.empty else self.keys.append(new)
+            self.registers = np.vstack(
+                [self.registers, np.zeros((len(new), self.registers.shape[1]), dtype=np.uint8)]
+            )
+        return self.keys.get_indexer(keys)
+
+    def _dump(self):
+        meta = {
+            "value": self.value,
+            "key": self.key,
+            "name_column": self.name_column,
+            "precision": self.precision,
+            "index": self.keys.tolist(),
+            **_names_dict(self.names, self.key, self.name_column),
+        }
+        return meta, {"registers": self.registers}
+
+    @classmethod
+    def _restore(cls, meta, arrays):
+        state = cls(meta["value"], meta["key"], meta["name_column"], meta["precision"])
+        state.keys = pd.Index(meta["index"], name=state.key)
+        state.registers = arrays["registers"]
+        if state.name_column and meta["keys"]:
+            state.names = pd.DataFrame({state.key: meta["keys"], state.name_column: meta["names"]})
+        return state
+
+
+def compress_centroids(means: np.ndarray, weights: np.ndarray, compression: float):
+    """
+    Comprime centroides (o valores sueltos con peso 1) en un t-digest.
+
+    Los puntos se ordenan y se agrupan según la función de escala k(q) = compression / (2π) · asin(2q - 1):
+    cada centroide abarca menos de una unidad de k, de modo que los centroides son pequeños en las colas
+    (cuantiles extremos precisos) y grandes en el centro. La asignación es vectorizada.
+    """
+    order = np.argsort(means, kind="stable")
+    means, weights = means[order], weights[order]
+    total = weights.sum()
+    q = (np.cumsum(weights) - weights / 2) / total
+    k = compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+    clusters = np.floor(k - k[0]).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, clusters[1:] != clusters[:-1]])
+    merged = np.add.reduceat(weights, starts)
+    return np.add.reduceat(means * weights, starts) / merged, merged
+
+
+class TDigestState(MergeableSketch):
+    """
+    Cuantiles aproximados de una columna (por defecto "TotalPrice") por clave (por defecto "CategoryName")
+    con t-digest.
+
+    Cada clave guarda unos compression centroides (media y peso) en lugar de todos los valores;
+    los cuantiles extremos (p99) son los más precisos. Los estados se combinan con merge juntando
+    y recomprimiendo los centroides.
+
+    Args:
+        value (str): Columna numérica. Por defecto "TotalPrice".
+        key (str): Columna por la cual se agrupa. Por defecto "CategoryName".
+        compression (int): Parámetro de compresión (cantidad aproximada de centroides). Por defecto 200.
+
+    Ejemplo:
+        >>> state = TDigestState().update(df_sales)
+        >>> state.quantiles([0.5, 0.9, 0.99])
+    """
+
+    def __init__(self, value="TotalPrice", key="CategoryName", compression=200):
+        if compression < 10:
+            raise ValueError("compression debe ser al menos 10.")
+        self.value = value
+        self.key = key
+        self.compression = compression
+        self.digests = {}
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Incorpora los valores de un bloque de ventas. Devuelve el propio estado para encadenar llamadas.
+        """
+        chunk = chunk[chunk[self.value].notna() & chunk[self.key].notna()]
+        for key, values in chunk.groupby(self.key, sort=False)[self.value]:
+            values = values.to_numpy(dtype=float)
+            self._add(key, values, np.ones(len(values)), values.min(), values.max())
+        return self
+
+    def merge(self, other: "TDigestState"):
+        """
+        Combina otro estado con la misma columna y clave. Devuelve el propio estado.
+        """
+        if other.value != self.value or other.key != self.key:
+            raise ValueError("Solo se pueden combinar estados con la misma columna y clave.")
+        for key, (means, weights, low, high) in other.digests.items():
+            self._add(key, means, weights, low, high)
+        return self
+
+    def quantiles(self, qs) -> pd.DataFrame:
+        """
+        Cuantiles estimados por clave: una fila por clave (ordenadas) y una columna por cuantil.
+        """
+        qs = list(qs)
+        rows = {}
+        for key in sorted(self.digests):
+            means, weights, low, high = self.digests[key]
+            total = weights.sum()
+            centers = (np.cumsum(weights) - weights / 2) / total
+            rows[key] = np.interp(qs, np.r_[0, centers, 1], np.r_[low, means, high])
+        return pd.DataFrame.from_dict(rows, orient="index", columns=qs).rename_axis(self.key)
+
+    def counts(self) -> pd.Series:
+        """Cantidad de valores por clave."""
+        return pd.Series(
+            {key: digest[1].sum() for key, digest in sorted(self.digests.items())}, name=self.value
+        ).rename_axis(self.key)
+
+    def _add(self, key, means, weights, low, high):
+        """
+        Metodo privado que agrega centroides a la clave y recomprime.
+        """
+        if key in self.digests:
+            old_means, old_weights, old_low, old_high = self.digests[key]
+            means, weights = np.r_[old_means, means], np.r_[old_weights, weights]
+            low, high = min(low, old_low), max(high, old_high)
+        means, weights = compress_centroids(means, weights, self.compression)
+        self.digests[key] = (means, weights, float(low), float(high))
+
+    def _dump(self):
+        keys = list(self.digests)
+        meta = {
+            "value": self.value,
+            "key": self.key,
+            "compression": self.compression,
+            "index": [k.item() if hasattr(k, "item") else k for k in keys],
+            "sizes": [len(self.digests[k][0]) for k in keys],
+        }
+        arrays = {
+            "means": np.concatenate([self.digests[k][0] for k in keys]) if keys else np.array([]),
+            "weights": np.concatenate([self.digests[k][1] for k in keys]) if keys else np.array([]),
+            "bounds": np.array([self.digests[k][2:] for k in keys]).reshape(-1, 2),
+        }
+        return meta, arrays
+
+    @classmethod
+    def _restore(cls, meta, arrays):
+        state = cls(meta["value"], meta["key"], meta["compression"])
+        offsets = np.cumsum([0] + meta["sizes"])
+        for i, key in enumerate(meta["index"]):
+            start, stop = offsets[i], offsets[i + 1]
+            low, high = arrays["bounds"][i]
+            state.digests[key] = (arrays["means"][start:stop], arrays["weights"][start:stop], low, high)
+        return state
@@ -1,12 +1,97 @@
+import os
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Union
+import numpy as np
 import pandas as pd
+from src.design_patterns.aggregation import (
+    BUCKETS,
+    SalesAggregateState,
+    SpillAggregateState,
+    TimeBucketState,
+    merge_sorted_runs,
+)
+from src.design_patterns.pareto import ParetoIndex
+from src.design_patterns.sketches import (
+    HyperLogLogState,
+    SampledAggregateState,
+    TDigestState,
+    accuracy_settings,
+)
+
+
+def iter_chunks(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+) -> Iterator[pd.DataFrame]:
+    """
+    Normaliza los datos de entrada de una estrategia a un iterador de DataFrames.
+    Acepta un DataFrame completo o un iterable de bloques (por ejemplo, el resultado de
+    DBConnection.execute_query_chunks).
+    """
+    if isinstance(data, pd.DataFrame):
+        yield data
+    else:
+        yield from data
+
+
+def select_top(values: pd.Series, n: int, largest: bool = True, keep: str = "first") -> pd.Series:
+    """
+    Selecciona los n mayores (o menores) valores de una serie con selección parcial (nlargest / nsmallest),
+    en O(m log n) en lugar de ordenar las m filas. El resultado queda en el orden del ranking.
+
+    Args:
+        values (pd.Series): Valores a rankear.
+        n (int): Cantidad de valores a seleccionar.
+        largest (bool): True para los mayores, False para los menores. Por defecto True.
+        keep (str): "first", "last" o "all" (conserva los empates con el último). Por defecto "first".
+
+    Raises:
+        ValueError: Si n no es un entero positivo.
+    """
+    if n <= 0:
+        raise ValueError("n debe ser un entero positivo.")
+    return values.nlargest(n, keep=keep) if largest else values.nsmallest(n, keep=keep)
+
+
+def select_top_per_group(groups, values, n: int, largest: bool = True) -> np.ndarray:
+    """
+    Devuelve las posiciones de los n mayores (o menores) valores de cada grupo, conservando los empates
+    con el n-ésimo valor (como RANK() <= n en SQL).
+
+    Los grupos se separan con un agrupamiento lineal y en cada uno se elige el n-ésimo valor con
+    np.partition (selección parcial, O(m) en total); solo las filas seleccionadas se ordenan.
+    Las posiciones quedan ordenadas por grupo (en orden de aparición) y por valor dentro del grupo.
+
+    Raises:
+        ValueError: Si n no es un entero positivo.
+    """
+    if n <= 0:
+        raise ValueError("n debe ser un entero positivo.")
+    values = np.asarray(values, dtype=float)
+    keys = values if largest else -values
+    selected = []
+    for positions in pd.Series(keys).groupby(pd.factorize(groups)[0], sort=True).indices.values():
+        group_keys = keys[positions]
+        if len(positions) > n:
+            kth = np.partition(group_keys, len(positions) - n)[len(positions) - n]
+            mask = group_keys >= kth
+            positions, group_keys = positions[mask], group_keys[mask]
+        selected.append(positions[np.argsort(-group_keys, kind="stable")])
+    return np.concatenate(selected) if selected else np.array([], dtype=int)
 
 
 class ReportStrategy(ABC):
     """
     Clase base abstracta que define estrategias de generación de informes.
+
+    Las estrategias aceptan tanto un DataFrame completo como un iterador de bloques de DataFrames.
+    combinable indica si el informe tiene una fila por vendedor ("IDVendedor") y puede sumarse
+    al CombinedReport de ReportBuilder; sql_pushdown, si puede calcularse con una agregación SQL
+    en el modo diferido de ReportBuilder (set_source).
     """
 
+    combinable = True
+    sql_pushdown = False
+
     @abstractmethod
     def generate_report(self, data: pd.DataFrame, key, ascending: bool) -> pd.DataFrame:
         """
@@ -18,12 +103,76 @@ class ReportStrategy(ABC):
         pass
 
 
-class TotalSalesByEmployee(ReportStrategy):
+class AggregateReportStrategy(ReportStrategy):
+    """
+    Clase base para estrategias que resumen una columna de ventas por empleado.
+
+    Expone un estado parcial de agregación (SalesAggregateState) que puede actualizarse con bloques
+    de ventas, combinarse con estados calculados en otros procesos y finalizarse en el informe.
+    Las subclases definen la columna a agregar (column), el nombre de la columna del informe (label)
+    y cómo obtener los valores finales a partir del estado (_values).
+    Como el estado solo guarda SUM, COUNT y SUM de cuadrados, también puede calcularse en la base de datos
+    (ver SalesAggregateState.aggregate_query).
+
+    Ejemplo:
+        >>> strategy = TotalSalesByEmployee()
+        >>> state = strategy.create_state()
+        >>> for chunk in db.execute_query_chunks(query):
+        ...     strategy.update_state(state, chunk)
+        >>> report = strategy.finalize(state, key="TotalPrice", ascending=False)
+    """
+
+    column = None
+    label = None
+    sql_pushdown = True
+
+    def create_state(self) -> SalesAggregateState:
+        """
+        Crea un estado de agregación vacío con las columnas que necesita la estrategia.
+        """
+        return SalesAggregateState([self.column])
+
+    def update_state(self, state: SalesAggregateState, chunk: pd.DataFrame):
+        """
+        Incorpora un bloque de ventas al estado y lo devuelve.
+        """
+        return state.update(chunk)
+
+    def finalize(self, state: SalesAggregateState, key, ascending=True) -> pd.DataFrame:
+        """
+        Convierte un estado de agregación en el DataFrame del informe, ordenado por key.
+        """
+        ventas = self._values(state).to_frame(self.column)
+        ventas.index.name = "EmployeeID"
+
+        resultado = ventas.merge(state.names, on="EmployeeID", how="left")
+
+        resultado = resultado[["EmployeeID", "EmployeeName", self.column]]
+        resultado.sort_values(key, ascending=ascending, inplace=True)
+        resultado.columns = ["IDVendedor", "Nombre Apellido Vendedor", self.label]
+
+        return resultado
+
+    def generate_report(self, df, key, ascending=True):
+        state = self.create_state()
+        for chunk in iter_chunks(df):
+            self.update_state(state, chunk)
+        return self.finalize(state, key, ascending)
+
+    @abstractmethod
+    def _values(self, state: SalesAggregateState) -> pd.Series:
+        """
+        Devuelve la serie final del informe (indexada por "EmployeeID") a partir del estado.
+        """
+        pass
+
+
+class TotalSalesByEmployee(AggregateReportStrategy):
     """
     Esta clase genera un informe de ventas por cada vendedor, mostrando por cada uno el total de ventas realizadas.
 
     Args:
-        df (pd.DataFrame): DataFrame que contiene las ventas,
+        df (pd.DataFrame | Iterable[pd.DataFrame]): DataFrame (o iterador de bloques) que contiene las ventas,
         con columnas "EmployeeID", "TotalPrice" y "EmployeeName".
         key (str): Clave por la cual se ordenará el informe, puede ser "TotalPrice" o cualquier otra columna relevante.
         acscending (bool): Indica si el ordenamiento debe ser ascendente o descendente.
@@ -33,27 +182,19 @@ class TotalSalesByEmployee(ReportStrategy):
         incluyendo "IDVendedor", "Nombre Apellido Vendedor" y "TotalVentas".
     """
 
-    def generate_report(self, df, key, ascending=True):
-        ventas = df.groupby("EmployeeID")[["TotalPrice"]].sum()
-        nombres = df[["EmployeeID", "EmployeeName"]].drop_duplicates(
-            subset="EmployeeID"
-        )
-
-        resultado = ventas.merge(nombres, on="EmployeeID", how="left")
-
-        resultado = resultado[["EmployeeID", "EmployeeName", "TotalPrice"]]
-        resultado.sort_values(key, ascending=ascending, inplace=True)
-        resultado.columns = ["IDVendedor", "Nombre Apellido Vendedor", "TotalVentas"]
+    column = "TotalPrice"
+    label = "TotalVentas"
 
-        return resultado
+    def _values(self, state):
+        return state.sum(self.column)
 
 
-class AverageSalesByEmployee(ReportStrategy):
+class AverageSalesByEmployee(AggregateReportStrategy):
     """
     Esta clase genera un informe de ventas por vendedor, mostrando por cada uno el promedio de ventas.
 
     Args:
-        df (pd.DataFrame): DataFrame que contiene las ventas,
+        df (pd.DataFrame | Iterable[pd.DataFrame]): DataFrame (o iterador de bloques) que contiene las ventas,
         con columnas "EmployeeID", "TotalPrice" y "EmployeeName".
         key (str): Clave por la cual se ordenará el informe, puede ser "TotalPrice" o cualquier otra columna relevante.
         ascending (bool): Indica si el ordenamiento debe ser ascendente o descendente.
@@ -63,31 +204,23 @@ class AverageSalesByEmployee(ReportStrategy):
         incluyendo "IDVendedor", "Nombre Apellido Vendedor" y "Promedio de ventas".
     """
 
-    def generate_report(self, df, key, ascending=True):
-        ventas = df.groupby("EmployeeID")[["TotalPrice"]].mean().round(2)
-        nombres = df[["EmployeeID", "EmployeeName"]].drop_duplicates(
-            subset="EmployeeID"
-        )
+    column = "TotalPrice"
+    label = "Promedio de ventas"
 
-        resultado = ventas.merge(nombres, on="EmployeeID", how="left")
+    def _values(self, state):
+        promedio = state.mean(self.column)
+        if promedio.dtype == object:
+            # TotalPrice DECIMAL de MySQL llega como Decimal: el promedio conserva ese tipo
+            return promedio.map(lambda valor: round(valor, 2))
+        return promedio.astype(float).round(2)
 
-        resultado = resultado[["EmployeeID", "EmployeeName", "TotalPrice"]]
-        resultado.sort_values(key, ascending=ascending, inplace=True)
-        resultado.columns = [
-            "IDVendedor",
-            "Nombre Apellido Vendedor",
-            "Promedio de ventas",
-        ]
 
-        return resultado
-
-
-class ProductSalesByEmployee(ReportStrategy):
+class ProductSalesByEmployee(AggregateReportStrategy):
     """
     Esta clase genera un informe de ventas por empleado, mostrando por cada uno la cantidad de productos vendidos.
 
     Args:
-        df (pd.DataFrame): DataFrame que contiene las ventas,
+        df (pd.DataFrame | Iterable[pd.DataFrame]): DataFrame (o iterador de bloques) que contiene las ventas,
         con columnas "EmployeeID", "ProductID" y "EmployeeName".
         key (str): Clave por la cual se ordenará el informe,
         puede ser por id de producto "ProductID", nombre de Empleado "EmployeeName"
@@ -99,20 +232,686 @@ class ProductSalesByEmployee(ReportStrategy):
         incluyendo "IDVendedor", "Nombre Apellido Vendedor" y "Cantidad de productos vendidos".
     """
 
-    def generate_report(self, df, key, ascending=True):
-        ventas = df.groupby("EmployeeID")[["ProductID"]].count()
-        nombres = df[["EmployeeID", "EmployeeName"]].drop_duplicates(
-            subset="EmployeeID"
+    column = "ProductID"
+    label = "Cantidad de productos vendidos"
+
+    def _values(self, state):
+        return state.count(self.column)
+
+
+class TopNEmployeesBySales(AggregateReportStrategy):
+    """
+    Esta clase genera el ranking de los n vendedores con mayor total de ventas.
+
+    A diferencia de TotalSalesByEmployee no ordena todos los vendedores: selecciona los n primeros
+    con selección parcial (ver select_top). Como es una estrategia de agregación, puede calcularse
+    por bloques, en modo fusionado o en paralelo dentro de ReportBuilder.
+
+    Args:
+        n (int): Cantidad de vendedores del ranking. Por defecto 10.
+        keep (str): Manejo de empates con el último puesto: "first", "last" o "all". Por defecto "first".
+
+    Returns:
+        pd.DataFrame: Los n vendedores en orden de ranking, con "IDVendedor", "Nombre Apellido Vendedor"
+        y "Top n TotalVentas". key y ascending no se usan: el orden es el del ranking.
+
+    Ejemplo:
+        >>> TopNEmployeesBySales(n=5).generate_report(df_sales)
+    """
+
+    column = "TotalPrice"
+    largest = True
+
+    def __init__(self, n: int = 10, keep: str = "first"):
+        if n <= 0:
+            raise ValueError("n debe ser un entero positivo.")
+        self.n = n
+        self.keep = keep
+        self.label = f"{'Top' if self.largest else 'Bottom'} {n} TotalVentas"
+
+    def _values(self, state):
+        return state.sum(self.column)
+
+    def finalize(self, state: SalesAggregateState, key=None, ascending=None) -> pd.DataFrame:
+        """
+        Selecciona los n vendedores del ranking a partir del estado de agregación.
+        """
+        ventas = select_top(self._values(state), self.n, self.largest, self.keep).to_frame(self.column)
+        ventas.index.name = "EmployeeID"
+
+        resultado = ventas.merge(state.names, on="EmployeeID", how="left")
+        resultado = resultado[["EmployeeID", "EmployeeName", self.column]]
+        resultado.columns = ["IDVendedor", "Nombre Apellido Vendedor", self.label]
+        return resultado.reset_index(drop=True)
+
+    def generate_report(self, df, key=None, ascending=None):
+        return super().generate_report(df, key, ascending)
+
+
+class BottomN(TopNEmployeesBySales):
+    """
+    Esta clase genera el ranking de los n vendedores con menor total de ventas (el inverso de TopNEmployeesBySales),
+    también con selección parcial.
+
+    Ejemplo:
+        >>> BottomN(n=3).generate_report(df_sales)
+    """
+
+    largest = False
+
+
+class RankingStrategy(ReportStrategy):
+    """
+    Clase base para estrategias de ranking que no son por vendedor (por ejemplo, por categoría),
+    por lo que no se suman al CombinedReport.
+
+    Igual que AggregateReportStrategy, exponen un estado (create_state / update_state / finalize)
+    que se actualiza bloque a bloque, de modo que ReportBuilder las calcula en la misma pasada
+    que las demás estrategias en modo fusionado.
+    """
+
+    combinable = False
+
+    @abstractmethod
+    def create_state(self):
+        """
+        Crea el estado vacío de la estrategia.
+        """
+        pass
+
+    def update_state(self, state, chunk: pd.DataFrame):
+        """
+        Incorpora un bloque de ventas al estado y lo devuelve.
+        """
+        return state.update(chunk)
+
+    @abstractmethod
+    def finalize(self, state, key=None, ascending=None) -> pd.DataFrame:
+        """
+        Convierte el estado en el DataFrame del informe.
+        """
+        pass
+
+    def generate_report(self, df, key=None, ascending=None):
+        state = self.create_state()
+        for chunk in iter_chunks(df):
+            self.update_state(state, chunk)
+        return self.finalize(state, key, ascending)
+
+
+class TopNProductsPerCategory(RankingStrategy):
+    """
+    Esta clase genera los n productos más vendidos de cada categoría, resuelto en pandas. Con n=1 equivale
+    a la CTE con dense_rank() = 1 de main.ipynb.
+
+    El estado acumula el total por producto (SalesAggregateState con clave item), de modo que las ventas
+    pueden llegar en bloques. Al finalizar, cada categoría se resuelve con selección parcial
+    (ver select_top_per_group) en lugar de ordenar todos los productos. Los empates con el n-ésimo
+    producto se conservan (como RANK() <= n).
+
+    Args:
+        n (int): Productos por categoría. Por defecto 1.
+        value (str): Columna a sumar. Por defecto "Quantity".
+        group (str): Columna de la categoría. Por defecto "CategoryName".
+        item (str): Columna del producto. Por defecto "ProductName".
+        largest (bool): False para los productos menos vendidos. Por defecto True.
+
+    Returns:
+        pd.DataFrame: Una fila por producto seleccionado con "Categoría", "Producto", "Total Vendido"
+        y "Ranking" (dense rank dentro de la categoría), ordenado por categoría y ranking.
+
+    Ejemplo:
+        >>> df = db.execute_query("select s.*, p.ProductName, c.CategoryName from sales s join ...")
+        >>> TopNProductsPerCategory(n=3).generate_report(df)
+    """
+
+    labels = ["Categoría", "Producto", "Total Vendido", "Ranking"]
+
+    def __init__(self, n: int = 1, value="Quantity", group="CategoryName", item="ProductName", largest=True):
+        if n <= 0:
+            raise ValueError("n debe ser un entero positivo.")
+        self.n = n
+        self.value = value
+        self.group = group
+        self.item = item
+        self.largest = largest
+
+    def create_state(self) -> SalesAggregateState:
+        return SalesAggregateState([self.value], key=self.item, name_column=self.group)
+
+    def finalize(self, state: SalesAggregateState, key=None, ascending=None) -> pd.DataFrame:
+        totals = state.sum(self.value)
+        groups = state.names.set_index(self.item)[self.group].reindex(totals.index)
+        positions = select_top_per_group(groups.to_numpy(), totals.to_numpy(), self.n, self.largest)
+
+        resultado = pd.DataFrame(
+            {
+                self.group: groups.to_numpy()[positions],
+                self.item: totals.index.to_numpy()[positions],
+                self.value: totals.to_numpy()[positions],
+            }
+        )
+        resultado["Ranking"] = (
+            resultado.groupby(self.group)[self.value]
+            .rank(method="dense", ascending=not self.largest)
+            .astype(int)
         )
+        resultado = resultado.sort_values([self.group, "Ranking"], kind="stable").reset_index(drop=True)
+        resultado.columns = self.labels
+        return resultado
 
-        resultado = ventas.merge(nombres, on="EmployeeID", how="left")
 
-        resultado = resultado[["EmployeeID", "EmployeeName", "ProductID"]]
-        resultado.sort_values(key, ascending=ascending, inplace=True)
-        resultado.columns = [
+class TimeWindowStrategy(RankingStrategy):
+    """
+    Clase base para informes por bucket de tiempo (hora, día o semana) a partir de un TimeBucketState.
+
+    Las ventas deben traer una marca de tiempo real (por defecto "SalesTimestamp", ver
+    src.db.timestamps.normalize_sales). Además de finalize (todos los buckets, incluido el que está en curso),
+    emit_closed devuelve solo las filas de los buckets que se cerraron desde la última emisión,
+    para actualizar el informe de forma incremental a medida que llegan ventas nuevas.
+
+    Ejemplo:
+        >>> strategy = RollingRevenueByEmployee(window=7, bucket="day")
+        >>> state = strategy.create_state()
+        >>> for chunk in nuevas_ventas:
+        ...     strategy.update_state(state, chunk)
+        ...     publicar(strategy.emit_closed(state))
+    """
+
+    labels = None
+
+    def finalize(self, state: TimeBucketState, key=None, ascending=None) -> pd.DataFrame:
+        return self._report(state)
+
+    def emit_closed(self, state: TimeBucketState) -> pd.DataFrame:
+        """
+        Devuelve las filas de los buckets cerrados desde la última emisión (vacío si no se cerró ninguno).
+        """
+        closed = state.pop_closed()
+        if closed is None:
+            return pd.DataFrame(columns=self.labels)
+        return self._report(state, *closed)
+
+    @abstractmethod
+    def _report(self, state: TimeBucketState, start=None, until=None) -> pd.DataFrame:
+        """
+        Arma el informe para los buckets en [start, until) (todos si no se indican).
+        """
+        pass
+
+
+class RollingRevenueByEmployee(TimeWindowStrategy):
+    """
+    Esta clase genera, por vendedor y por bucket de tiempo, las ventas del período y el total
+    de una ventana móvil de los últimos window períodos.
+
+    Las ventas se acumulan en una matriz bucket x vendedor (los períodos sin ventas valen 0) y la ventana
+    se calcula con rolling sobre toda la matriz a la vez. Al emitir buckets cerrados solo se recorren
+    esos buckets y los window - 1 anteriores.
+
+    Args:
+        window (int): Cantidad de períodos de la ventana. Por defecto 7.
+        bucket (str): "hour", "day" o "week". Por defecto "day".
+        column (str): Columna a sumar. Por defecto "TotalPrice".
+        timestamp (str): Columna con la fecha y hora de la venta. Por defecto "SalesTimestamp".
+
+    Returns:
+        pd.DataFrame: "IDVendedor", "Nombre Apellido Vendedor", "Período", "Ventas del período"
+        y "Ventas últimos <window> períodos", ordenado por período y vendedor. Se omiten los vendedores
+        sin ventas en la ventana.
+
+    Ejemplo:
+        >>> RollingRevenueByEmployee(window=7, bucket="day").generate_report(normalize_sales(df_sales))
+    """
+
+    def __init__(self, window: int = 7, bucket: str = "day", column="TotalPrice", timestamp="SalesTimestamp"):
+        if window <= 0:
+            raise ValueError("window debe ser un entero positivo.")
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket debe ser uno de {tuple(BUCKETS)}.")
+        self.window = window
+        self.bucket = bucket
+        self.column = column
+        self.timestamp = timestamp
+        self.labels = [
             "IDVendedor",
             "Nombre Apellido Vendedor",
-            "Cantidad de productos vendidos",
+            "Período",
+            "Ventas del período",
+            f"Ventas últimos {window} períodos",
         ]
 
+    def create_state(self) -> TimeBucketState:
+        return TimeBucketState([self.column], bucket=self.bucket, timestamp=self.timestamp)
+
+    def _report(self, state, start=None, until=None):
+        since = None
+        if start is not None:
+            since = start - (self.window - 1) * pd.tseries.frequencies.to_offset(BUCKETS[self.bucket])
+        ventas = state.matrix(self.column, since=since, until=until)
+        if ventas.empty:
+            return pd.DataFrame(columns=self.labels)
+        ventana = ventas.rolling(self.window, min_periods=1).sum()
+        if start is not None:
+            ventas, ventana = ventas[ventas.index >= start], ventana[ventana.index >= start]
+
+        resultado = pd.DataFrame({"Ventas": ventas.stack(), "Ventana": ventana.stack()})
+        resultado = resultado[resultado["Ventana"] != 0].reset_index()
+        resultado = resultado.merge(state.names, on="EmployeeID", how="left")
+        resultado = resultado[["EmployeeID", "EmployeeName", "Bucket", "Ventas", "Ventana"]]
+        resultado = resultado.sort_values(["Bucket", "EmployeeID"]).reset_index(drop=True)
+        resultado.columns = self.labels
+        return resultado
+
+
+class SalesPerHour(TimeWindowStrategy):
+    """
+    Esta clase genera la cantidad de ventas y el total facturado por hora (o por el bucket indicado),
+    incluyendo las horas sin ventas.
+
+    Args:
+        bucket (str): "hour", "day" o "week". Por defecto "hour".
+        column (str): Columna a sumar. Por defecto "TotalPrice".
+        timestamp (str): Columna con la fecha y hora de la venta. Por defecto "SalesTimestamp".
+
+    Returns:
+        pd.DataFrame: "Período", "Cantidad de ventas" y "TotalVentas", una fila por bucket en orden cronológico.
+
+    Ejemplo:
+        >>> SalesPerHour().generate_report(normalize_sales(df_sales))
+    """
+
+    labels = ["Período", "Cantidad de ventas", "TotalVentas"]
+
+    def __init__(self, bucket: str = "hour", column="TotalPrice", timestamp="SalesTimestamp"):
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket debe ser uno de {tuple(BUCKETS)}.")
+        self.bucket = bucket
+        self.column = column
+        self.timestamp = timestamp
+
+    def create_state(self) -> TimeBucketState:
+        return TimeBucketState([self.column], bucket=self.bucket, timestamp=self.timestamp, key=None)
+
+    def _report(self, state, start=None, until=None):
+        ventas = state.matrix("count", since=start, until=until)
+        if ventas.empty:
+            return pd.DataFrame(columns=self.labels)
+        resultado = pd.DataFrame(
+            {
+                "Período": ventas.index,
+                "Cantidad de ventas": ventas["count"].to_numpy(),
+                "TotalVentas": state.matrix(self.column, since=start, until=until)[self.column].to_numpy(),
+            }
+        )
+        return resultado
+
+
+class SalesByCustomer(RankingStrategy):
+    """
+    Esta clase genera las ventas por cliente (cantidad, total y promedio) sin mantener todos los clientes
+    en memoria: CustomerID tiene mucha más cardinalidad que los vendedores o los productos.
+
+    El estado es un SpillAggregateState: cada bloque se preagrega por cliente y se reparte por hash
+    en particiones que se vuelcan a archivos temporales. Al finalizar, cada partición se agrega por separado
+    y el informe se emite en bloques con iter_finalize / iter_report. Si se indica key, cada partición
+    se ordena y se guarda como corrida en disco, y las corridas se mezclan en orden (merge_sorted_runs).
+
+    Args:
+        column (str): Columna a sumar. Por defecto "TotalPrice".
+        key (str): Columna del cliente. Por defecto "CustomerID".
+        name_column (str, opcional): Columna con el nombre del cliente. Por defecto "CustomerName";
+            None si las ventas no lo traen (por ejemplo, el resultado de FACT_QUERY).
+        partitions (int): Particiones en disco. Por defecto 64.
+        memory_rows (int): Filas preagregadas en memoria antes de volcar a disco. Por defecto 1000000.
+        spill_dir (str, opcional): Directorio para los archivos temporales. Por defecto el del sistema.
+
+    Returns:
+        pd.DataFrame: "IDCliente", "Nombre Cliente", "Cantidad de ventas", "TotalVentas" y "Promedio de ventas".
+        key puede ser una de esas columnas o "CustomerID", "CustomerName" o column; si es None (o no es
+        una de ellas) los clientes quedan ordenados por ID dentro de cada partición.
+
+    Ejemplo:
+        >>> strategy = SalesByCustomer(partitions=128)
+        >>> for bloque in strategy.iter_report(db.execute_query_chunks(query), key="TotalVentas", ascending=False):
+        ...     bloque.to_csv("ventas_por_cliente.csv", mode="a", header=False)
+    """
+
+    labels = ["IDCliente", "Nombre Cliente", "Cantidad de ventas", "TotalVentas", "Promedio de ventas"]
+
+    def __init__(
+        self,
+        column="TotalPrice",
+        key="CustomerID",
+        name_column="CustomerName",
+        partitions=64,
+        memory_rows=1_000_000,
+        spill_dir=None,
+    ):
+        if partitions <= 0 or memory_rows <= 0:
+            raise ValueError("partitions y memory_rows deben ser enteros positivos.")
+        self.column = column
+        self.key = key
+        self.name_column = name_column
+        self.partitions = partitions
+        self.memory_rows = memory_rows
+        self.spill_dir = spill_dir
+
+    def create_state(self) -> SpillAggregateState:
+        return SpillAggregateState(
+            [self.column],
+            key=self.key,
+            name_column=self.name_column,
+            partitions=self.partitions,
+            memory_rows=self.memory_rows,
+            spill_dir=self.spill_dir,
+        )
+
+    def finalize(self, state: SpillAggregateState, key=None, ascending=True) -> pd.DataFrame:
+        bloques = list(self.iter_finalize(state, key, ascending))
+        if not bloques:
+            return pd.DataFrame(columns=self.labels)
+        return pd.concat(bloques, ignore_index=True)
+
+    def iter_finalize(self, state: SpillAggregateState, key=None, ascending=True) -> Iterator[pd.DataFrame]:
+        """
+        Emite el informe en bloques, una partición (o un lote de la mezcla ordenada) a la vez,
+        y borra los archivos temporales del estado al terminar.
+        """
+        sort = self._sort_column(key)
+        ascending = True if ascending is None else ascending
+        try:
+            if sort is None:
+                for partition in state.iter_partitions():
+                    yield self._report(partition)
+                return
+            runs = []
+            for i, partition in enumerate(state.iter_partitions()):
+                path = os.path.join(state.path, f"run-{i:04d}.parquet")
+                self._report(partition).sort_values(sort, ascending=ascending, kind="mergesort").to_parquet(
+                    path, index=False
+                )
+                runs.append(path)
+            for bloque in merge_sorted_runs(runs, sort, ascending):
+                yield bloque.reset_index(drop=True)
+        finally:
+            state.close()
+
+    def iter_report(self, df, key=None, ascending=True) -> Iterator[pd.DataFrame]:
+        """
+        Genera el informe en bloques a partir de un DataFrame o de un iterador de bloques de ventas.
+        """
+        state = self.create_state()
+        for chunk in iter_chunks(df):
+            self.update_state(state, chunk)
+        yield from self.iter_finalize(state, key, ascending)
+
+    def _sort_column(self, key):
+        """
+        Metodo privado que traduce key a la columna del informe por la que se ordena, o None.
+        """
+        if key is None:
+            return None
+        sources = {self.key: self.labels[0], self.name_column: self.labels[1], self.column: self.labels[3]}
+        return sources.get(key, key if key in self.labels else None)
+
+    def _report(self, state: SalesAggregateState) -> pd.DataFrame:
+        """
+        Metodo privado que arma el informe de una partición.
+        """
+        totales = state.sum(self.column)
+        cantidades = state.count(self.column)
+        nombres = None
+        if self.name_column:
+            nombres = state.names.set_index(self.key)[self.name_column].reindex(totales.index).to_numpy()
+        return pd.DataFrame(
+            {
+                self.labels[0]: totales.index.to_numpy(),
+                self.labels[1]: nombres,
+                self.labels[2]: cantidades.to_numpy(),
+                self.labels[3]: totales.to_numpy(),
+                self.labels[4]: (totales / cantidades).astype(float).round(2).to_numpy(),
+            }
+        )
+
+
+class ParetoABCByCategory(RankingStrategy):
+    """
+    Esta clase genera la participación de cada producto en la facturación de su categoría, con el
+    porcentaje acumulado y la clase ABC, para todas las categorías en una pasada (ver ParetoIndex).
+    Equivale a la consulta "porcentaje_categoria" de main.ipynb con dos columnas más.
+
+    Args:
+        thresholds (tuple): Límites de participación acumulada de las clases A y B. Por defecto (0.8, 0.95).
+        value (str): Columna a sumar. Por defecto "TotalPrice".
+
+    Returns:
+        pd.DataFrame: "Categoría", "Producto", "Total Facturado", "Porcentaje en Categoría",
+        "Porcentaje en Total", "Porcentaje Acumulado" y "Clase ABC", ordenado por categoría
+        y por facturación descendente.
+
+    Ejemplo:
+        >>> df = dimensions.enrich(db.execute_query(FACT_QUERY), ["ProductName", "CategoryID", "CategoryName"])
+        >>> ParetoABCByCategory(thresholds=(0.7, 0.9)).generate_report(df)
+    """
+
+    labels = [
+        "Categoría",
+        "Producto",
+        "Total Facturado",
+        "Porcentaje en Categoría",
+        "Porcentaje en Total",
+        "Porcentaje Acumulado",
+        "Clase ABC",
+    ]
+
+    def __init__(self, thresholds=(0.8, 0.95), value="TotalPrice"):
+        if len(thresholds) != 2 or not 0 < thresholds[0] <= thresholds[1] <= 1:
+            raise ValueError("thresholds debe ser (A, B) con 0 < A <= B <= 1.")
+        self.thresholds = tuple(thresholds)
+        self.value = value
+
+    def create_state(self) -> ParetoIndex:
+        return ParetoIndex(value=self.value, thresholds=self.thresholds)
+
+    def finalize(self, state: ParetoIndex, key=None, ascending=None) -> pd.DataFrame:
+        resultado = state.share()[
+            [
+                "CategoryName",
+                "ProductName",
+                "TotalFacturado",
+                "PorcentajeEnCategoria",
+                "PorcentajeEnTotal",
+                "PorcentajeAcumulado",
+                "ClaseABC",
+            ]
+        ]
+        resultado.columns = self.labels
+        return resultado
+
+
+class ApproximateStrategy(RankingStrategy):
+    """
+    Clase base para estrategias aproximadas, pensadas para exploración interactiva: resignan exactitud
+    (con una cota del error) a cambio de velocidad o de un estado de tamaño fijo.
+
+    Su estado es un sketch combinable (merge) que se puede guardar y cargar (save / load) para
+    actualizarlo con ventas nuevas sin recalcular el historial. set_accuracy (o ReportBuilder.set_accuracy)
+    ajusta el compromiso entre precisión y velocidad con un único valor en (0, 1].
+
+    Ejemplo:
+        >>> strategy = DistinctCustomersByEmployee()
+        >>> state = strategy.create_state().update(df_sales)
+        >>> state.save("clientes.npz")
+        >>> state = HyperLogLogState.load("clientes.npz").update(df_ventas_nuevas)
+        >>> strategy.finalize(state)
+    """
+
+    def set_accuracy(self, accuracy: float):
+        """
+        Ajusta la precisión de la estrategia (1 es la máxima) y devuelve la propia estrategia.
+
+        Raises:
+            ValueError: Si accuracy no está en (0, 1].
+        """
+        self._configure(accuracy_settings(accuracy))
+        return self
+
+    @abstractmethod
+    def _configure(self, settings: dict):
+        """
+        Aplica los parámetros de accuracy_settings que correspondan a la estrategia.
+        """
+        pass
+
+
+class SampledSalesByEmployee(ApproximateStrategy):
+    """
+    Esta clase estima el total y la cantidad de ventas por vendedor a partir de una muestra aleatoria
+    de las ventas, con un intervalo de confianza para el total.
+
+    Args:
+        fraction (float): Fracción de ventas muestreadas, en (0, 1]. Por defecto 0.1.
+        confidence (float): Nivel de confianza del intervalo. Por defecto 0.95.
+        column (str): Columna a sumar. Por defecto "TotalPrice".
+        seed (int, opcional): Semilla del muestreo.
+
+    Returns:
+        pd.DataFrame: "IDVendedor", "Nombre Apellido Vendedor", "TotalVentas estimado", "Error ±",
+        "Límite inferior", "Límite superior" y "Cantidad de ventas estimada", ordenado por IDVendedor.
+
+    Ejemplo:
+        >>> SampledSalesByEmployee(fraction=0.05).generate_report(df_sales)
+    """
+
+    labels = [
+        "IDVendedor",
+        "Nombre Apellido Vendedor",
+        "TotalVentas estimado",
+        "Error ±",
+        "Límite inferior",
+        "Límite superior",
+        "Cantidad de ventas estimada",
+    ]
+
+    def __init__(self, fraction: float = 0.1, confidence: float = 0.95, column="TotalPrice", seed=None):
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction debe estar en (0, 1].")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence debe estar en (0, 1).")
+        self.fraction = fraction
+        self.confidence = confidence
+        self.column = column
+        self.seed = seed
+
+    def _configure(self, settings):
+        self.fraction = settings["fraction"]
+
+    def create_state(self) -> SampledAggregateState:
+        return SampledAggregateState([self.column], fraction=self.fraction, seed=self.seed)
+
+    def finalize(self, state: SampledAggregateState, key=None, ascending=None) -> pd.DataFrame:
+        total = state.estimate_total(self.column)
+        error = state.total_error(self.column, self.confidence)
+        resultado = pd.DataFrame(
+            {
+                "EmployeeID": total.index.to_numpy(),
+                "Total": total.to_numpy(dtype=float).round(2),
+                "Error": error.to_numpy().round(2),
+                "Inferior": (total - error).to_numpy(dtype=float).round(2),
+                "Superior": (total + error).to_numpy(dtype=float).round(2),
+                "Cantidad": state.estimate_count(self.column).to_numpy(dtype=float).round(),
+            }
+        )
+        resultado = resultado.merge(state.names, on="EmployeeID", how="left")
+        resultado = resultado[["EmployeeID", "EmployeeName", "Total", "Error", "Inferior", "Superior", "Cantidad"]]
+        resultado = resultado.sort_values("EmployeeID").reset_index(drop=True)
+        resultado.columns = self.labels
+        return resultado
+
+
+class DistinctCustomersByEmployee(ApproximateStrategy):
+    """
+    Esta clase estima la cantidad de clientes distintos de cada vendedor con HyperLogLog, con memoria fija
+    por vendedor (2^precision bytes) en lugar de un conjunto con todos sus clientes.
+
+    Args:
+        precision (int): Precisión de HyperLogLog, entre 4 y 18. Por defecto 12 (error típico 1.6 %).
+        value (str): Columna del cliente. Por defecto "CustomerID".
+
+    Returns:
+        pd.DataFrame: "IDVendedor", "Nombre Apellido Vendedor", "Clientes distintos (aprox.)"
+        y "Error relativo", ordenado por IDVendedor.
+
+    Ejemplo:
+        >>> DistinctCustomersByEmployee(precision=14).generate_report(df_sales)
+    """
+
+    labels = ["IDVendedor", "Nombre Apellido Vendedor", "Clientes distintos (aprox.)", "Error relativo"]
+
+    def __init__(self, precision: int = 12, value="CustomerID"):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision debe estar entre 4 y 18.")
+        self.precision = precision
+        self.value = value
+
+    def _configure(self, settings):
+        self.precision = settings["precision"]
+
+    def create_state(self) -> HyperLogLogState:
+        return HyperLogLogState(value=self.value, precision=self.precision)
+
+    def finalize(self, state: HyperLogLogState, key=None, ascending=None) -> pd.DataFrame:
+        clientes = state.estimate().rename_axis("EmployeeID").to_frame("Clientes").reset_index()
+        resultado = clientes.merge(state.names, on="EmployeeID", how="left")
+        resultado["Error"] = round(state.relative_error, 4)
+        resultado = resultado[["EmployeeID", "EmployeeName", "Clientes", "Error"]]
+        resultado = resultado.sort_values("EmployeeID").reset_index(drop=True)
+        resultado.columns = self.labels
+        return resultado
+
+
+class PriceQuantilesByCategory(ApproximateStrategy):
+    """
+    Esta clase estima cuantiles del importe de las ventas por categoría con t-digest, sin ordenar
+    ni guardar todos los importes.
+
+    Args:
+        quantiles (list[float]): Cuantiles a estimar. Por defecto [0.5, 0.9, 0.99].
+        compression (int): Compresión de t-digest (centroides por categoría). Por defecto 200.
+        value (str): Columna numérica. Por defecto "TotalPrice".
+        group (str): Columna de la categoría. Por defecto "CategoryName".
+
+    Returns:
+        pd.DataFrame: "Categoría", "Cantidad de ventas" y una columna "p<cuantil>" por cuantil
+        (por ejemplo "p50", "p99"), ordenado por categoría.
+
+    Ejemplo:
+        >>> df = dimensions.enrich(db.execute_query(FACT_QUERY), ["CategoryName"])
+        >>> PriceQuantilesByCategory([0.5, 0.95]).generate_report(df)
+    """
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99), compression: int = 200, value="TotalPrice", group="CategoryName"):
+        if not quantiles or not all(0 <= q <= 1 for q in quantiles):
+            raise ValueError("quantiles debe contener valores en [0, 1].")
+        if compression < 10:
+            raise ValueError("compression debe ser al menos 10.")
+        self.quantiles = list(quantiles)
+        self.compression = compression
+        self.value = value
+        self.group = group
+        self.labels = ["Categoría", "Cantidad de ventas"] + [f"p{q * 100:g}" for q in self.quantiles]
+
+    def _configure(self, settings):
+        self.compression = settings["compression"]
+
+    def create_state(self) -> TDigestState:
+        return TDigestState(value=self.value, key=self.group, compression=self.compression)
+
+    def finalize(self, state: TDigestState, key=None, ascending=None) -> pd.DataFrame:
+        if not state.digests:
+            return pd.DataFrame(columns=self.labels)
+        cuantiles = state.quantiles(self.quantiles)
+        resultado = pd.concat([state.counts().astype(np.int64), cuantiles], axis=1).reset_index()
+        resultado.columns = self.labels
         return resultado
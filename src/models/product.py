@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Time
+from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Time, Index
 from sqlalchemy.orm import relationship
 from src.db.database import Base
 
@@ -28,6 +28,11 @@ class Product(Base):
     """
 
     __tablename__ = "products"
+    # Índices administrados por src.db.indexes.IndexManager (ver IndexManager.apply).
+    __table_args__ = (
+        Index("idx_products_category", "CategoryID"),
+        Index("idx_products_name", "ProductName"),
+    )
 
     ProductID = Column(Integer, primary_key=True)
     ProductName = Column(String(45))
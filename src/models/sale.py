@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Time
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Time, DateTime, Index
+from sqlalchemy.orm import deferred, relationship
 from src.db.database import Base
 
 
@@ -17,7 +17,11 @@ class Sale(Base):
         Quantity (int): Cantidad de productos vendidos.
         Discount (Decimal): Descuento aplicado a la venta.
         TotalPrice (Decimal): Precio total de la venta (después de aplicar descuentos).
-        SalesDate (Time): Fecha y hora de la venta.
+        SalesDate (Time): Fecha y hora de la venta, tal como viene en data/sales.csv.
+        SalesTimestamp (DateTime): SalesDate normalizada (ver src.db.timestamps.SalesTimestampPipeline).
+        SalesBucket (DateTime): Inicio del bucket (hora, día o semana) de SalesTimestamp.
+            Ambas se cargan de forma diferida (al accederlas): en una base creada antes de agregarlas,
+            session.query(Sale) sigue funcionando hasta ejecutar SalesTimestampPipeline.migrate.
         TransactionNumber (str): Número de transacción de la venta.
 
     Relaciones:
@@ -30,6 +34,17 @@ class Sale(Base):
         >>> session.commit()
     """
     __tablename__ = "sales"
+    # Índices administrados por src.db.indexes.IndexManager (ver IndexManager.apply).
+    __table_args__ = (
+        # cubre los reportes por producto (SUM(Quantity), SUM(TotalPrice)) sin leer la tabla
+        Index("idx_sales_product_cover", "ProductID", "Quantity", "TotalPrice"),
+        # cubre los reportes por empleado (TotalSalesByEmployee / AverageSalesByEmployee)
+        Index("idx_sales_salesperson_cover", "SalesPersonID", "TotalPrice"),
+        Index("idx_sales_customer", "CustomerID"),
+        # informes por ventana de tiempo (ventas por hora, ventas móviles por empleado);
+        # IndexManager.apply lo omite ("missing_column") hasta que se migra la tabla
+        Index("idx_sales_bucket", "SalesBucket", "SalesPersonID"),
+    )
 
     SalesID = Column(Integer, primary_key=True)
     SalesPersonID = Column(Integer, ForeignKey("employees.EmployeeID"))
@@ -39,6 +54,8 @@ class Sale(Base):
     Discount = Column(DECIMAL(10, 2))
     TotalPrice = Column(DECIMAL(10, 2))
     SalesDate = Column(Time)
+    SalesTimestamp = deferred(Column(DateTime))
+    SalesBucket = deferred(Column(DateTime))
     TransactionNumber = Column(String(20))
 
     employee = relationship("Employee", back_populates="sales")
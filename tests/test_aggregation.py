@@ -0,0 +1,160 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.design_patterns.aggregation import (
+    SalesAggregateState,
+    SpillAggregateState,
+    TimeBucketState,
+    merge_sorted_runs,
+)
+from src.design_patterns.strategy import TotalSalesByEmployee, AverageSalesByEmployee
+
+
+@pytest.fixture
+def sample_sales_data():
+    """
+    Fixture para proporcionar un DataFrame de ventas de ejemplo.
+    """
+    data = {
+        "EmployeeID": [1, 2, 1, 3, 2, 1],
+        "EmployeeName": [
+            "Alice Smith",
+            "Bob Johnson",
+            "Alice Smith",
+            "Charlie Brown",
+            "Bob Johnson",
+            "Alice Smith",
+        ],
+        "TotalPrice": [100, 200, 150, 300, 250, 50],
+        "ProductID": [101, 102, 103, 104, 105, 106],
+    }
+    return pd.DataFrame(data)
+
+
+def test_state_update_por_bloques(sample_sales_data):
+    """
+    Test para verificar que actualizar el estado por bloques da los mismos totales,
+    conteos y varianzas que calcularlos sobre el DataFrame completo.
+    """
+    state = SalesAggregateState(["TotalPrice"])
+    state.update(sample_sales_data.iloc[:3]).update(sample_sales_data.iloc[3:])
+
+    grouped = sample_sales_data.groupby("EmployeeID")["TotalPrice"]
+
+    assert state.sum("TotalPrice").tolist() == grouped.sum().tolist()
+    assert state.count("TotalPrice").tolist() == grouped.count().tolist()
+    pd.testing.assert_series_equal(
+        state.variance("TotalPrice"), grouped.var(), check_names=False
+    )
+
+
+def test_state_merge(sample_sales_data):
+    """
+    Test para verificar que combinar estados calculados por separado equivale
+    a un único estado calculado sobre todas las ventas.
+    """
+    strategy = TotalSalesByEmployee()
+    parte_a = strategy.create_state().update(sample_sales_data.iloc[:2])
+    parte_b = strategy.create_state().update(sample_sales_data.iloc[2:])
+
+    report = strategy.finalize(parte_a.merge(parte_b), key="TotalPrice", ascending=False)
+    expected = strategy.generate_report(sample_sales_data, key="TotalPrice", ascending=False)
+
+    pd.testing.assert_frame_equal(report, expected)
+
+
+def test_state_merge_columnas_distintas():
+    """
+    Test para verificar que no se pueden combinar estados con columnas distintas.
+    """
+    with pytest.raises(ValueError):
+        SalesAggregateState(["TotalPrice"]).merge(SalesAggregateState(["ProductID"]))
+
+
+def test_incremental_average(sample_sales_data):
+    """
+    Test para verificar que el promedio se actualiza incrementalmente al llegar ventas nuevas.
+    """
+    strategy = AverageSalesByEmployee()
+    state = strategy.create_state().update(sample_sales_data.iloc[:5])
+    state.update(sample_sales_data.iloc[5:])
+
+    report = strategy.finalize(state, key="EmployeeName")
+    alice = report.loc[report["IDVendedor"] == 1, "Promedio de ventas"].iloc[0]
+
+    assert alice == 100.0
+
+
+def test_time_bucket_state_cierra_buckets():
+    """
+    Test para verificar que el estado por bucket emite cada bucket cerrado una sola vez,
+    a medida que avanza la marca de agua.
+    """
+    ventas = pd.DataFrame(
+        {
+            "EmployeeID": [1, 2, 1],
+            "EmployeeName": ["Alice Smith", "Bob Johnson", "Alice Smith"],
+            "TotalPrice": [100, 200, 50],
+            "SalesTimestamp": pd.to_datetime(["2024-01-01 10:05", "2024-01-01 10:40", "2024-01-01 12:10"]),
+        }
+    )
+    state = TimeBucketState(["TotalPrice"], bucket="hour").update(ventas.iloc[:2])
+    assert state.pop_closed() is None
+
+    state.update(ventas.iloc[2:])
+    assert state.pop_closed() == (pd.Timestamp("2024-01-01 10:00"), pd.Timestamp("2024-01-01 12:00"))
+    assert state.pop_closed() is None
+    assert state.matrix("TotalPrice")[1].tolist() == [100, 0, 50]
+
+
+def test_spill_state_particiona_en_disco(tmp_path):
+    """
+    Test para verificar que el estado con volcado a disco reparte cada clave en una sola partición,
+    escribe archivos temporales al superar memory_rows y da los mismos totales que el estado en memoria.
+    """
+    rng = np.random.default_rng(0)
+    ventas = pd.DataFrame({"CustomerID": rng.integers(0, 5000, 40000), "TotalPrice": rng.integers(1, 100, 40000)})
+    ventas["CustomerName"] = "Cliente " + ventas["CustomerID"].astype(str)
+
+    state = SpillAggregateState(["TotalPrice"], partitions=8, memory_rows=3000, spill_dir=str(tmp_path))
+    for start in range(0, len(ventas), 4000):
+        state.update(ventas.iloc[start : start + 4000])
+    assert state.spilled_rows > 0 and os.listdir(state.path)
+
+    partes = list(state.iter_partitions())
+    claves = [set(parte.stats.index) for parte in partes]
+    assert sum(len(c) for c in claves) == len(set().union(*claves)) == ventas["CustomerID"].nunique()
+
+    total = pd.concat([parte.sum("TotalPrice") for parte in partes]).sort_index()
+    esperado = SalesAggregateState(["TotalPrice"], key="CustomerID", name_column="CustomerName").update(ventas)
+    pd.testing.assert_series_equal(total, esperado.sum("TotalPrice"), check_dtype=False, check_names=False)
+    assert SalesAggregateState(["TotalPrice"], "CustomerID", "CustomerName").load_aggregates(
+        esperado.to_frame()
+    ).to_frame().equals(esperado.to_frame())
+
+    state.close()
+    assert not os.path.exists(state.path)
+
+
+def test_merge_sorted_runs(tmp_path):
+    """
+    Test para verificar que la mezcla de corridas ordenadas devuelve todas las filas en orden, con los nulos al final.
+    """
+    rng = np.random.default_rng(1)
+    paths = []
+    for i in range(4):
+        run = pd.DataFrame({"v": np.sort(rng.integers(0, 1000, 500)).astype(float)})
+        run.loc[len(run)] = np.nan
+        paths.append(str(tmp_path / f"run{i}.parquet"))
+        run.to_parquet(paths[-1], index=False)
+
+    bloques = list(merge_sorted_runs(paths, "v", batch_size=64))
+    merged = pd.concat(bloques, ignore_index=True)["v"]
+    assert len(bloques) > 4
+    assert merged.iloc[:-4].is_monotonic_increasing and merged.iloc[-4:].isna().all()
+
+    for path in paths:
+        pd.read_parquet(path).sort_values("v", ascending=False).to_parquet(path, index=False)
+    descendente = pd.concat(merge_sorted_runs(paths, "v", ascending=False, batch_size=50))["v"]
+    assert descendente.iloc[:-4].is_monotonic_decreasing and len(descendente) == 2004
@@ -0,0 +1,174 @@
+import importlib.util
+import threading
+import pytest
+from src.db.analytics import AnalyticsBackend
+from src.db.compat import parse_call, to_embedded_sql
+from src.db.database import DBConnection
+
+DIALECTS = [
+    pytest.param(
+        "duckdb",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("duckdb") is None, reason="duckdb no está instalado"
+        ),
+    ),
+    "sqlite",
+]
+
+QUERY_TOP_PRODUCTO = """
+with ranked_products as (
+select c.CategoryName, p.ProductName, sum(Quantity) as total_vendido,
+dense_rank() over (
+partition by c.CategoryName
+order by sum(s.Quantity) desc
+) as ds
+from products p join categories c on p.CategoryID = c.CategoryID
+join sales s on s.ProductID = p.ProductID
+group by c.CategoryName, p.ProductName
+order by c.categoryName, ds)
+select * from ranked_products
+where ds<= 1
+order by categoryname, ds;
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """
+    Fixture que crea una carpeta con CSV chicos de categorías, productos, empleados y ventas.
+    """
+    files = {
+        "categories.csv": "CategoryID,CategoryName\n1,Confections\n2,Poultry\n",
+        "products.csv": "ProductID,ProductName,Price,CategoryID\n10,Flour,1.5,1\n11,Cookie,2.0,1\n12,Chicken,9.0,2\n",
+        "employees.csv": "EmployeeID,FirstName,MiddleInitial,LastName\n1,Nicole,T,Fuller\n2,Ana,,Diaz\n",
+        "sales.csv": (
+            "SalesID,SalesPersonID,CustomerID,ProductID,Quantity,Discount,TotalPrice,SalesDate,TransactionNumber\n"
+            "1,1,5,10,3,0,30,31:24.2,A\n2,2,5,11,1,0,10,54:42.5,B\n3,1,6,12,2,0,60,10:00.0,C\n4,2,6,10,1,0,10,11:00.0,D\n"
+        ),
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_text(content)
+    return str(tmp_path)
+
+
+@pytest.fixture(params=DIALECTS)
+def backend(request, data_dir):
+    """
+    Fixture que crea un motor embebido (DuckDB y SQLite) cargado desde los CSV.
+    """
+    backend = AnalyticsBackend.from_csv(data_dir, request.param)
+    yield backend
+    backend.close()
+
+
+def test_traduccion_mysql():
+    """
+    Test para verificar la traducción de concat, comillas dobles, backticks y JOIN sin condición.
+    """
+    sql = to_embedded_sql(
+        'select coalesce(concat(e.LastName, ", ", concat(e.FirstName, " ")), "O\'Neil") as `Nombre`, '
+        "'concat(a, b)' as texto from employees e join totales t;"
+    )
+    assert sql == (
+        "select coalesce((e.LastName || ', ' || (e.FirstName || ' ')), 'O''Neil') as \"Nombre\", "
+        "'concat(a, b)' as texto from employees e cross join totales t"
+    )
+    joined = "from a join b on a.id = b.id cross join c order by 1"
+    assert to_embedded_sql(joined) == joined
+    with pytest.raises(ValueError):
+        to_embedded_sql("select 1", dialect="oracle")
+
+
+def test_parametros_no_modifican_literales(backend):
+    """
+    Test para verificar que los parámetros :nombre se traducen sin tocar el texto entre comillas.
+    """
+    sql = "select 'a :b' as s, \"x:y\" as t, CategoryName from categories where CategoryID = :id"
+    assert to_embedded_sql(sql, named_params=True) == (
+        "select 'a :b' as s, 'x:y' as t, CategoryName from categories where CategoryID = $id"
+    )
+    assert to_embedded_sql("select 1::int as n, :a", named_params=True) == "select 1::int as n, $a"
+
+    if backend.dialect == "sqlite":
+        # con text() de SQLAlchemy (SQLite, y MySQL en DBConnection) los ":" de los literales se escriben "\\:"
+        sql = sql.replace("'a :b'", "'a \\:b'")
+    df = backend.execute_query(sql, {"id": 2})
+    assert df.values.tolist() == [["a :b", "x:y", "Poultry"]]
+
+
+def test_parse_call():
+    """
+    Test para verificar que se reconocen las sentencias CALL con argumentos literales.
+    """
+    assert parse_call("CALL sp_porcentaje_producto_total(1);") == ("sp_porcentaje_producto_total", [1])
+    assert parse_call("call sp_x('a', 2.5)") == ("sp_x", ["a", 2.5])
+    assert parse_call("select 1") is None
+
+
+def test_consultas_del_notebook(backend):
+    """
+    Test para verificar que la CTE con dense_rank, la vista y el stored procedure devuelven
+    lo mismo que en MySQL.
+    """
+    top = backend.execute_query(QUERY_TOP_PRODUCTO)
+    assert top[["CategoryName", "ProductName"]].values.tolist() == [
+        ["Confections", "Flour"],
+        ["Poultry", "Chicken"],
+    ]
+
+    df = backend.call_procedure("sp_porcentaje_producto_total", [1])
+    assert df["ProductName"].tolist() == ["Flour", "Cookie"]
+    assert df["PorcentajeEnCategoria"].tolist() == [80.0, 20.0]
+    assert df["PorcentajeEnTotal"].tolist() == [36.36, 9.09]
+    assert backend.execute_query("CALL sp_porcentaje_producto_total(2)")["TotalFacturado"].tolist() == [60.0]
+
+    view = backend.query_view("vw_resumen_ventas_producto", where="ProductID = :id", params={"id": 10})
+    assert view["TicketPromedio"].tolist() == [10.0]
+
+
+def test_concat_con_nulos(backend):
+    """
+    Test para verificar que concat devuelve NULL si algún argumento es NULL, como en MySQL.
+    """
+    df = backend.execute_query(
+        'select EmployeeID, coalesce(concat(LastName, ", ", FirstName, " ", MiddleInitial, "."), "Sin nombre") as n '
+        "from employees order by EmployeeID"
+    )
+    assert df["n"].tolist() == ["Fuller, Nicole T.", "Sin nombre"]
+    chunks = list(backend.execute_query_chunks("select * from sales", chunk_size=3))
+    assert [len(c) for c in chunks] == [3, 1]
+    assert backend.execute_query_arrow("select * from sales").num_rows == 4
+
+
+def test_chunks_intercalados_con_otras_consultas(backend):
+    """
+    Test para verificar que una lectura en bloques devuelve todas las filas aunque se ejecuten otras consultas
+    mientras se recorre, y que un consumidor que no termina no bloquea a otros hilos.
+    """
+    sql = "select s.SalesID from sales s cross join products p cross join employees e cross join sales x"
+    chunks = backend.execute_query_chunks(sql, chunk_size=10)
+    primero = next(chunks)
+    assert backend.execute_query("select count(*) as n from products")["n"].iloc[0] == 3
+    assert len(primero) + sum(len(c) for c in chunks) == 96
+
+    pendiente = backend.execute_query_chunks(sql, chunk_size=10)
+    next(pendiente)
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(backend.execute_query("select 1 as n")), daemon=True)
+    hilo.start()
+    hilo.join(timeout=5)
+    assert not hilo.is_alive() and resultado
+    pendiente.close()
+
+
+def test_dbconnection_deriva_al_motor(backend):
+    """
+    Test para verificar que DBConnection deriva las consultas al motor embebido.
+    """
+    db = DBConnection.from_engine(None)
+    db.use_analytics_backend(backend)
+    assert db.execute_query("select count(*) as n from sales")["n"].iloc[0] == 4
+    assert len(db.call_procedure("sp_porcentaje_producto_total", [1])) == 2
+    assert len(db.query_view("vw_resumen_ventas_producto")) == 3
+    with pytest.raises(RuntimeError):
+        db.call_procedure("sp_inexistente")
@@ -0,0 +1,77 @@
+import asyncio
+import pandas as pd
+import pytest
+from src.db.async_database import AsyncDBConnection
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Fixture que crea una AsyncDBConnection sobre SQLite (aiosqlite) con una tabla sales de ejemplo.
+    """
+    db = AsyncDBConnection(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def setup():
+        async with db.engine.begin() as conn:
+            await conn.exec_driver_sql(
+                "CREATE TABLE sales (SalesID INT PRIMARY KEY, SalesPersonID INT, TotalPrice REAL)"
+            )
+            await conn.exec_driver_sql(
+                "INSERT INTO sales VALUES (1, 1, 10.0), (2, 2, 20.0), (3, 1, 5.0)"
+            )
+            await conn.exec_driver_sql(
+                "CREATE VIEW vw_ventas AS SELECT SalesPersonID, SUM(TotalPrice) AS Total "
+                "FROM sales GROUP BY SalesPersonID"
+            )
+
+    asyncio.run(setup())
+    yield db
+    asyncio.run(db.dispose())
+
+
+def test_singleton_por_url(db):
+    """
+    Test para verificar que las instancias con la misma URL comparten el engine.
+    """
+    assert AsyncDBConnection(str(db.engine.url)) is db
+
+
+def test_execute_query_y_query_view(db):
+    """
+    Test para verificar las consultas y vistas asíncronas.
+    """
+    df = asyncio.run(db.execute_query("SELECT * FROM sales WHERE SalesPersonID = :id", {"id": 1}))
+    assert isinstance(df, pd.DataFrame)
+    assert df["SalesID"].tolist() == [1, 3]
+
+    vista = asyncio.run(db.query_view("vw_ventas", "SalesPersonID = :id", {"id": 2}))
+    assert vista["Total"].tolist() == [20.0]
+
+
+def test_gather_queries(db):
+    """
+    Test para verificar que gather_queries ejecuta varias consultas y respeta las claves.
+    """
+    resultados = asyncio.run(
+        db.gather_queries(
+            {
+                "total": "SELECT SUM(TotalPrice) AS total FROM sales",
+                "empleado": ("SELECT * FROM sales WHERE SalesPersonID = :id", {"id": 2}),
+                "vista": "SELECT * FROM vw_ventas",
+            },
+            concurrency=2,
+        )
+    )
+
+    assert list(resultados) == ["total", "empleado", "vista"]
+    assert resultados["total"]["total"].iloc[0] == 35.0
+    assert len(resultados["empleado"]) == 1
+    assert len(resultados["vista"]) == 2
+
+
+def test_execute_query_error(db):
+    """
+    Test para verificar que los errores se informan como RuntimeError.
+    """
+    with pytest.raises(RuntimeError):
+        asyncio.run(db.execute_query("SELECT * FROM tabla_inexistente"))
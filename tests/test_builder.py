@@ -5,6 +5,10 @@ from src.design_patterns.strategy import (
     TotalSalesByEmployee,
     ProductSalesByEmployee,
     AverageSalesByEmployee,
+    TopNEmployeesBySales,
+    TopNProductsPerCategory,
+    SampledSalesByEmployee,
+    DistinctCustomersByEmployee,
 )
 
 
@@ -73,3 +77,233 @@ def test_report_builder_add_report(sample_sales_data):
     assert report_combined["Nombre Apellido Vendedor"].is_monotonic_increasing, (
         "El informe no está ordenado correctamente por nombre de vendedor."
     )
+
+
+def _build(data, fused):
+    return (
+        ReportBuilder()
+        .set_dataframe(data)
+        .set_combined_sorting("EmployeeName", True)
+        .set_fused(fused)
+        .add_report(TotalSalesByEmployee())
+        .add_report(AverageSalesByEmployee())
+        .add_report(ProductSalesByEmployee())
+        .build_all()
+    )
+
+
+def test_report_builder_fused_matches_default(sample_sales_data):
+    """
+    Test para verificar que el modo fusionado produce exactamente los mismos informes
+    que el modo normal.
+    """
+    expected = _build(sample_sales_data, fused=False)
+    reports = _build(sample_sales_data, fused=True)
+
+    assert list(reports) == list(expected)
+    for key in expected:
+        pd.testing.assert_frame_equal(reports[key], expected[key])
+
+
+def test_report_builder_fused_from_chunks(sample_sales_data):
+    """
+    Test para verificar que el modo fusionado acepta un iterador de bloques de ventas.
+    """
+    chunks = iter([sample_sales_data.iloc[:3], sample_sales_data.iloc[3:]])
+
+    expected = _build(sample_sales_data, fused=False)
+    reports = _build(chunks, fused=True)
+
+    pd.testing.assert_frame_equal(
+        reports["CombinedReport"], expected["CombinedReport"]
+    )
+
+
+@pytest.mark.parametrize(
+    "executor, fused", [("thread", False), ("thread", True), ("process", False)]
+)
+def test_report_builder_executors_match_serial(sample_sales_data, executor, fused):
+    """
+    Test para verificar que la ejecución en paralelo (hilos o procesos) produce exactamente
+    los mismos informes, con las mismas claves y en el mismo orden, que la ejecución en serie.
+    """
+    expected = _build(sample_sales_data, fused=False)
+    reports = (
+        ReportBuilder()
+        .set_dataframe(sample_sales_data)
+        .set_combined_sorting("EmployeeName", True)
+        .set_fused(fused)
+        .set_executor(executor, max_workers=2)
+        .add_report(TotalSalesByEmployee())
+        .add_report(AverageSalesByEmployee())
+        .add_report(ProductSalesByEmployee())
+        .build_all()
+    )
+
+    assert list(reports) == list(expected)
+    for key in expected:
+        pd.testing.assert_frame_equal(reports[key], expected[key])
+
+
+@pytest.mark.parametrize(
+    "executor, fused", [("serial", True), ("thread", True), ("process", False)]
+)
+def test_report_builder_top_n_primero_coincide_con_serial(sample_sales_data, executor, fused):
+    """
+    Test para verificar que, con un Top-N cargado antes que las demás estrategias por vendedor,
+    el CombinedReport fusionado o particionado conserva los nombres de los vendedores fuera del Top-N
+    y coincide con el modo normal.
+    """
+
+    def build(fused, executor):
+        return (
+            ReportBuilder()
+            .set_dataframe(sample_sales_data)
+            .set_combined_sorting("EmployeeName", True)
+            .set_fused(fused)
+            .set_executor(executor, max_workers=2)
+            .add_report(TopNEmployeesBySales(n=1))
+            .add_report(TotalSalesByEmployee())
+            .add_report(AverageSalesByEmployee())
+            .build_all()
+        )
+
+    expected = build(False, "serial")
+    reports = build(fused, executor)
+
+    assert list(reports) == list(expected)
+    for key in expected:
+        pd.testing.assert_frame_equal(reports[key], expected[key])
+    assert reports["CombinedReport"]["Nombre Apellido Vendedor"].notna().all()
+
+
+def test_report_builder_executor_invalido():
+    """
+    Test para verificar que se rechaza un executor desconocido.
+    """
+    with pytest.raises(ValueError):
+        ReportBuilder().set_executor("gpu")
+
+
+def test_report_builder_rankings_fused_from_chunks(sample_sales_data):
+    """
+    Test para verificar que las estrategias de ranking se calculan en la misma pasada fusionada
+    sobre bloques, que las que no son por vendedor quedan fuera del CombinedReport
+    y que el resultado coincide con el modo normal.
+    """
+    data = sample_sales_data.assign(CategoryName=["A", "B", "A", "B", "A"])
+
+    def build(source, fused):
+        return (
+            ReportBuilder()
+            .set_dataframe(source)
+            .set_combined_sorting("EmployeeName", True)
+            .set_fused(fused)
+            .add_report(TotalSalesByEmployee())
+            .add_report(TopNProductsPerCategory(n=1))
+            .add_report(TopNEmployeesBySales(n=2))
+            .build_all()
+        )
+
+    expected = build(data, fused=False)
+    reports = build(iter([data.iloc[:2], data.iloc[2:]]), fused=True)
+
+    assert list(reports) == ["TotalSalesByEmployee", "CombinedReport", "TopNProductsPerCategory", "TopNEmployeesBySales"]
+    assert list(reports) == list(expected)
+    for key in expected:
+        pd.testing.assert_frame_equal(reports[key], expected[key])
+    assert "Producto" not in reports["CombinedReport"].columns
+    assert "Top 2 TotalVentas" in reports["CombinedReport"].columns
+    ranking = reports["TopNProductsPerCategory"]
+    assert list(ranking["Categoría"]) == ["A", "A", "A", "B"]
+    assert ranking.iloc[-1]["Producto"] == "Monitor"
+
+
+@pytest.fixture
+def sales_db(sample_sales_data, tmp_path):
+    """
+    Fixture que carga las ventas de ejemplo en una base SQLite y devuelve un DBConnection sobre ella.
+    """
+    from sqlalchemy import create_engine
+    from src.db.database import DBConnection
+
+    db = DBConnection.from_engine(create_engine(f"sqlite:///{tmp_path / 'ventas.db'}"))
+    data = sample_sales_data.assign(CategoryName=["A", "B", "A", "B", "A"])
+    data.to_sql("ventas", db.engine, index=False)
+    yield db
+    db.engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["ventas", "select * from ventas where TotalPrice > 0;"],
+)
+def test_report_builder_lazy_matches_dataframe(sample_sales_data, sales_db, source):
+    """
+    Test para verificar que el modo diferido (set_source) agrega en SQL con un único GROUP BY,
+    resuelve en pandas las estrategias sin traducción y produce los mismos informes que el modo normal.
+    """
+    data = sample_sales_data.assign(CategoryName=["A", "B", "A", "B", "A"])
+
+    def build(builder):
+        return (
+            builder.set_combined_sorting("EmployeeName", True)
+            .add_report(TotalSalesByEmployee())
+            .add_report(AverageSalesByEmployee())
+            .add_report(TopNProductsPerCategory(n=1))
+            .add_report(ProductSalesByEmployee())
+            .build_all()
+        )
+
+    expected = build(ReportBuilder().set_dataframe(data))
+    lazy = ReportBuilder().set_source(sales_db, source)
+    reports = build(lazy)
+
+    assert list(reports) == list(expected)
+    for key in expected:
+        pd.testing.assert_frame_equal(reports[key], expected[key])
+
+    sql = lazy.compile_sql()
+    assert sql.count("group by EmployeeID") == 1
+    assert "sum(TotalPrice)" in sql and "count(ProductID)" in sql
+
+
+def test_report_builder_lazy_sin_origen():
+    """
+    Test para verificar que set_source rechaza un origen vacío y compile_sql exige un origen.
+    """
+    with pytest.raises(ValueError):
+        ReportBuilder().set_source(None, " ")
+    with pytest.raises(ValueError):
+        ReportBuilder().compile_sql()
+
+
+def test_report_builder_accuracy(sample_sales_data):
+    """
+    Test para verificar que set_accuracy ajusta las estrategias aproximadas, que con accuracy=1
+    la muestra es completa (totales exactos) y que se calculan en modo fusionado junto a las exactas.
+    """
+    muestra = SampledSalesByEmployee(fraction=0.1, seed=0)
+    distintos = DistinctCustomersByEmployee()
+    reports = (
+        ReportBuilder()
+        .set_dataframe(iter([sample_sales_data.iloc[:2], sample_sales_data.iloc[2:]]))
+        .set_combined_sorting("EmployeeName", True)
+        .set_fused(True)
+        .set_accuracy(1)
+        .add_report(TotalSalesByEmployee())
+        .add_report(muestra)
+        .add_report(distintos)
+        .build_all()
+    )
+
+    assert muestra.fraction == 1 and distintos.precision == 16
+    exactos = reports["TotalSalesByEmployee"].set_index("IDVendedor")["TotalVentas"].sort_index()
+    estimados = reports["SampledSalesByEmployee"].set_index("IDVendedor")["TotalVentas estimado"]
+    assert estimados.tolist() == exactos.tolist()
+    assert (reports["SampledSalesByEmployee"]["Error ±"] == 0).all()
+    assert reports["DistinctCustomersByEmployee"]["Clientes distintos (aprox.)"].tolist() == [2, 2, 1]
+    assert "TotalVentas estimado" not in reports["CombinedReport"].columns
+
+    with pytest.raises(ValueError):
+        ReportBuilder().set_accuracy(1.5)
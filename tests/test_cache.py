@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+from src.db.cache import QueryCache, normalize_sql, referenced_tables
+
+
+@pytest.fixture
+def sample_df():
+    """
+    Fixture para proporcionar un DataFrame de resultado de consulta de ejemplo.
+    """
+    return pd.DataFrame({"ProductID": [1, 2, 3], "TotalFacturado": [10.5, 20.0, 7.25]})
+
+
+def test_make_key_normaliza_sql():
+    """
+    Test para verificar que consultas iguales salvo espacios y punto y coma final comparten clave,
+    y que los parámetros forman parte de la clave.
+    """
+    assert normalize_sql("select *\n   from sales;") == "select * from sales"
+    assert QueryCache.make_key("select * from sales;") == QueryCache.make_key(
+        "select *\n from   sales"
+    )
+    assert QueryCache.make_key("select * from sales where id = :id", {"id": 1}) != (
+        QueryCache.make_key("select * from sales where id = :id", {"id": 2})
+    )
+
+
+def test_referenced_tables():
+    """
+    Test para verificar la detección de tablas en consultas y DDL.
+    """
+    query = "select * from sales s join products p on s.ProductID = p.ProductID"
+    assert {"sales", "products"} <= referenced_tables(query)
+    assert "products" in referenced_tables("CREATE INDEX idx_products_name ON products(ProductName)")
+    assert "vw_resumen_ventas_producto" in referenced_tables(
+        "create or replace view vw_resumen_ventas_producto AS select 1"
+    )
+
+
+def test_lru_respeta_presupuesto(sample_df):
+    """
+    Test para verificar que el nivel en memoria desaloja la entrada menos usada al superar el presupuesto.
+    """
+    nbytes = int(sample_df.memory_usage(deep=True).sum())
+    cache = QueryCache(max_bytes=nbytes * 2)
+    cache.put("a", sample_df, {"sales"})
+    cache.put("b", sample_df, {"sales"})
+    cache.get("a")
+    cache.put("c", sample_df, {"sales"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.current_bytes <= cache.max_bytes
+
+
+def test_invalidacion_por_tabla_y_ttl(sample_df):
+    """
+    Test para verificar la invalidación por tabla y por vencimiento del TTL.
+    """
+    cache = QueryCache()
+    cache.put("ventas", sample_df, {"sales", "products"})
+    cache.put("clientes", sample_df, {"customers"})
+    cache.invalidate_tables({"PRODUCTS"})
+
+    assert cache.get("ventas") is None
+    pd.testing.assert_frame_equal(cache.get("clientes"), sample_df)
+
+    cache_ttl = QueryCache(ttl=-1)
+    cache_ttl.put("ventas", sample_df, {"sales"})
+    assert cache_ttl.get("ventas") is None
+
+
+def test_invalidacion_por_version(sample_df):
+    """
+    Test para verificar que una entrada se invalida cuando cambia la versión de una de sus tablas.
+    """
+    versions = {"sales": "2025-01-01 10:00:00"}
+    cache = QueryCache(version_provider=lambda tables: {t: versions.get(t) for t in tables})
+    cache.put("ventas", sample_df, {"sales"})
+    assert cache.get("ventas") is not None
+
+    versions["sales"] = "2025-01-02 10:00:00"
+    assert cache.get("ventas") is None
+
+
+def test_nivel_en_disco_sobrevive_reinicio(sample_df, tmp_path):
+    """
+    Test para verificar que una nueva instancia de la caché recupera los resultados guardados en disco.
+    """
+    QueryCache(disk_dir=str(tmp_path)).put("ventas", sample_df, {"sales"})
+
+    cache = QueryCache(disk_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(cache.get("ventas"), sample_df)
+
+    cache.invalidate_tables({"sales"})
+    assert QueryCache(disk_dir=str(tmp_path)).get("ventas") is None
+
+
+def test_entrada_mayor_al_presupuesto_se_sirve_desde_disco(sample_df, tmp_path):
+    """
+    Test para verificar que una entrada mayor que max_bytes no entra al nivel en memoria
+    y se sigue sirviendo desde disco en lecturas repetidas.
+    """
+    cache = QueryCache(max_bytes=1, disk_dir=str(tmp_path))
+    cache.put("ventas", sample_df, {"sales"})
+
+    for _ in range(2):
+        pd.testing.assert_frame_equal(cache.get("ventas"), sample_df)
+    assert cache.current_bytes == 0
+    assert cache.hits == 2
+
+    memory_only = QueryCache(max_bytes=1)
+    memory_only.put("ventas", sample_df, {"sales"})
+    assert memory_only.get("ventas") is None
@@ -0,0 +1,126 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.db.database import Base
+from src.db.dimensions import DimensionCache
+from src.models import Category, City, Country, Customer, Employee, Product
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Fixture que crea las dimensiones en SQLite: 2 países, 3 ciudades, 2 categorías, 4 productos,
+    2 empleados y 3 clientes (uno sin inicial).
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'dimensions.db'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all(
+            [Country(CountryID=1, CountryName="Argentina"), Country(CountryID=2, CountryName="Chile")]
+        )
+        session.add_all(City(CityID=i, CityName=f"Ciudad {i}", CountryID=1 + i % 2) for i in range(3))
+        session.add_all([Category(CategoryID=1, CategoryName="Dairy"), Category(CategoryID=2, CategoryName="Meat")])
+        session.add_all(Product(ProductID=i, ProductName=f"P{i}", CategoryID=1 + i % 2) for i in range(4))
+        session.add_all(
+            [
+                Employee(EmployeeID=1, FirstName="Ana", MiddleInitial="B", LastName="Gómez", CityID=0),
+                Employee(EmployeeID=2, FirstName="Luis", MiddleInitial="C", LastName="Pérez", CityID=1),
+            ]
+        )
+        session.add_all(
+            Customer(CustomerID=i, FirstName="Cliente", MiddleInitial=None if i == 2 else "X", LastName=str(i), CityID=i)
+            for i in range(3)
+        )
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def hechos():
+    """
+    Fixture que devuelve ventas sin nombres, como las de FACT_QUERY, con un producto inexistente (99).
+    """
+    return pd.DataFrame(
+        {
+            "SalesID": [10, 11, 12, 13],
+            "ProductID": [0, 3, 1, 99],
+            "CustomerID": [2, 0, 1, 1],
+            "EmployeeID": [1, 2, 2, 1],
+            "TotalPrice": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+
+def test_enrich_equivale_al_join(engine, hechos):
+    """
+    Test para verificar que enrich agrega los mismos nombres que el JOIN de las consultas de reportes
+    y conserva (con nulos) las ventas cuya clave no existe en la dimensión.
+    """
+    dimensions = DimensionCache(engine=engine)
+    df = dimensions.enrich(hechos, ["ProductName", "CategoryName", "EmployeeName", "CustomerName", "CustomerCountry"])
+
+    assert df.columns[:5].tolist() == hechos.columns.tolist()
+    assert df["ProductName"].tolist()[:3] == ["P0", "P3", "P1"]
+    assert pd.isna(df["ProductName"].iloc[3]) and pd.isna(df["CategoryName"].iloc[3])
+    assert df["CategoryName"].tolist()[:3] == ["Dairy", "Meat", "Meat"]
+    assert df["EmployeeName"].tolist() == ["Gómez, Ana B.", "Pérez, Luis C.", "Pérez, Luis C.", "Gómez, Ana B."]
+    assert df["CustomerName"].tolist() == ["Sin nombre", "0, Cliente X.", "1, Cliente X.", "1, Cliente X."]
+    assert df["CustomerCountry"].tolist() == ["Argentina", "Argentina", "Chile", "Chile"]
+
+    joined = pd.read_sql(
+        text(
+            "select s.SalesID, p.ProductName, c.CategoryName from (select 10 as SalesID, 0 as ProductID "
+            "union all select 11, 3 union all select 12, 1) s join products p on s.ProductID = p.ProductID "
+            "join categories c on p.CategoryID = c.CategoryID order by s.SalesID"
+        ),
+        engine,
+    )
+    pd.testing.assert_frame_equal(
+        df[["SalesID", "ProductName", "CategoryName"]].head(3), joined, check_dtype=False
+    )
+
+    categorias = dimensions.enrich(hechos.rename(columns={"EmployeeID": "SalesPersonID"}), as_category=True)
+    assert isinstance(categorias["ProductName"].dtype, pd.CategoricalDtype)
+    assert categorias["EmployeeName"].iloc[0] == "Gómez, Ana B."
+    with pytest.raises(ValueError):
+        dimensions.enrich(hechos, ["Desconocido"])
+
+
+def test_refresh_por_version(engine, hechos):
+    """
+    Test para verificar que solo se recargan las dimensiones que cambiaron y que, sin verificar
+    la versión (check_interval), la caché no vuelve a la base de datos.
+    """
+    dimensions = DimensionCache(engine=engine, check_interval=0)
+    assert len(dimensions.refresh()) == 6
+    assert dimensions.refresh() == set()
+
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO products (ProductID, ProductName, CategoryID) VALUES (99, 'Nuevo', 2)"))
+    assert dimensions.enrich(hechos)["ProductName"].iloc[3] == "Nuevo"
+    assert dimensions.refresh() == set()
+
+    lento = DimensionCache(engine=engine, check_interval=3600)
+    lento.refresh()
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO products (ProductID, ProductName, CategoryID) VALUES (100, 'Otro', 1)"))
+    assert 100 not in lento.get("products").index
+    assert lento.refresh() == {"products"}
+    assert lento.get("products").loc[100, "ProductName"] == "Otro"
+
+
+def test_dimensiones_desde_csv():
+    """
+    Test para verificar que las dimensiones se cargan desde data/*.csv y que enrich agrega los nombres
+    de empleados y productos a las ventas del CSV.
+    """
+    dimensions = DimensionCache(data_dir="data")
+    ventas = pd.read_csv("data/sales.csv", nrows=1000)
+    df = dimensions.enrich(ventas, ["ProductName", "CategoryName", "EmployeeName", "EmployeeCity"])
+
+    productos = pd.read_csv("data/products.csv").set_index("ProductID")["ProductName"]
+    assert df["ProductName"].tolist() == productos.loc[ventas["ProductID"]].tolist()
+    assert df["EmployeeName"].notna().all()
+    assert df["CategoryName"].notna().all()
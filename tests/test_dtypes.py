@@ -0,0 +1,117 @@
+from decimal import Decimal
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.db.database import DBConnection
+from src.db.dtypes import build_dataframe, model_dtypes, to_arrow_table
+from src.design_patterns.strategy import AverageSalesByEmployee, TotalSalesByEmployee
+
+COLUMNS = ["SalesID", "ProductID", "TotalPrice", "EmployeeID", "EmployeeName", "Promedio"]
+
+
+@pytest.fixture
+def rows():
+    """
+    Fixture con filas como las devuelve el cursor de MySQL: DECIMAL como Decimal y un ProductID nulo.
+    """
+    return [
+        (1, 10, Decimal("20.50"), 1, "Pérez, Ana", Decimal("1.5")),
+        (2, None, Decimal("5.25"), 2, "Gómez, Juan", Decimal("2")),
+        (3, 10, Decimal("100.00"), 1, "Pérez, Ana", Decimal("3.25")),
+        (4, 11, Decimal("7.75"), 1, "Pérez, Ana", None),
+    ]
+
+
+def test_model_dtypes_desde_modelos_orm():
+    """
+    Test para verificar que el mapa de tipos se arma a partir de los modelos ORM.
+    """
+    dtypes = model_dtypes()
+    assert dtypes["TotalPrice"] == "float64"
+    assert dtypes["Discount"] == "float64"
+    assert dtypes["SalesID"] == "int32"
+    assert dtypes["ProductName"] == "string"
+    assert dtypes["HireDate"] == "datetime"
+    assert "SalesDate" not in dtypes  # TIME no tiene equivalente nativo
+
+
+def test_build_dataframe_numpy(rows):
+    """
+    Test para verificar que las columnas se construyen con tipos nativos en lugar de object/Decimal.
+    """
+    df = build_dataframe(rows, COLUMNS)
+
+    assert df["SalesID"].dtype == "int32"
+    assert df["ProductID"].dtype == "Int32"
+    assert df["ProductID"].isna().sum() == 1
+    assert df["TotalPrice"].dtype == "float64"
+    assert df["TotalPrice"].tolist() == [20.5, 5.25, 100.0, 7.75]
+    assert df["EmployeeName"].dtype == "category"
+    assert df["Promedio"].dtype == "float64"  # columna calculada, inferida por sus valores
+
+
+def test_build_dataframe_arrow_y_tabla(rows):
+    """
+    Test para verificar el backend Arrow y la tabla de pyarrow.
+    """
+    df = build_dataframe(rows, COLUMNS, backend="arrow")
+    assert str(df["TotalPrice"].dtype) == "double[pyarrow]"
+    assert str(df["SalesID"].dtype) == "int32[pyarrow]"
+    assert df["ProductID"].isna().sum() == 1
+
+    table = to_arrow_table(rows, COLUMNS)
+    assert str(table.schema.field("EmployeeName").type) == "string"
+    assert table.num_rows == 4
+
+    with pytest.raises(ValueError):
+        build_dataframe(rows, COLUMNS, backend="polars")
+
+
+def test_tipo_del_modelo_incompatible_se_infiere():
+    """
+    Test para verificar que si una columna calculada usa el nombre de una columna entera
+    pero devuelve decimales (por ejemplo AVG(Quantity) AS Quantity), no se trunca.
+    """
+    df = build_dataframe([(Decimal("1.5"),), (Decimal("2.5"),)], ["Quantity"])
+    assert df["Quantity"].tolist() == [1.5, 2.5]
+
+
+def test_estrategias_sobre_columnas_tipadas(rows):
+    """
+    Test para verificar que las estrategias dan los mismos resultados con columnas tipadas.
+    """
+    legacy = pd.DataFrame(rows, columns=COLUMNS)
+    for backend in ("numpy", "arrow"):
+        typed = build_dataframe(rows, COLUMNS, backend=backend)
+        for strategy in (TotalSalesByEmployee(), AverageSalesByEmployee()):
+            expected = strategy.generate_report(legacy, key="EmployeeName")
+            result = strategy.generate_report(typed, key="EmployeeName")
+            assert result.iloc[:, -1].astype(float).tolist() == pytest.approx(
+                expected.iloc[:, -1].astype(float).tolist()
+            )
+            assert result["IDVendedor"].tolist() == expected["IDVendedor"].tolist()
+
+
+def test_execute_query_tipado(tmp_path):
+    """
+    Test para verificar execute_query(typed=...) sobre SQLite y que la caché distingue las variantes.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'dtypes.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE sales (SalesID INT, Quantity INT, TotalPrice DECIMAL(10, 2))"))
+        conn.execute(text("INSERT INTO sales VALUES (1, 2, 20.5), (2, 1, 5.25), (3, 4, 8.0)"))
+    db = DBConnection.from_engine(engine)
+    db.enable_cache()
+
+    legacy = db.execute_query("SELECT * FROM sales")
+    typed = db.execute_query("SELECT * FROM sales", typed="numpy")
+    assert legacy["SalesID"].dtype == "int64"
+    assert typed["SalesID"].dtype == "int32"
+    assert typed["TotalPrice"].dtype == "float64"
+    assert db.execute_query("SELECT * FROM sales", typed="numpy")["SalesID"].dtype == "int32"
+    assert db.execute_query_arrow("SELECT * FROM sales").num_rows == 3
+
+    chunks = list(db.execute_query_chunks("SELECT * FROM sales", chunk_size=2, typed="arrow"))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert str(chunks[0]["Quantity"].dtype) == "int32[pyarrow]"
+    engine.dispose()
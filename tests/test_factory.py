@@ -95,3 +95,46 @@ def test_customer_location_info_missing_columns():
 
     with pytest.raises(KeyError):
         CustomerLocationInfo.from_series(serie)  # Debe lanzar un KeyError por columnas faltantes
+
+
+def test_sales_summary_from_chunks(samples_sales_data_series):
+    """
+    Test para verificar que from_chunks crea una instancia por cada fila de cada bloque.
+    """
+    df = pd.DataFrame([samples_sales_data_series] * 3)
+    chunks = [df.iloc[:2], df.iloc[2:]]
+
+    summaries = list(SalesSummary.from_chunks(chunks))
+
+    assert len(summaries) == 3
+    assert all(isinstance(s, SalesSummary) for s in summaries)
+    assert summaries[2].sale_id == samples_sales_data_series["SalesID"]
+
+
+def test_sales_summary_from_dataframe(samples_sales_data_series):
+    """
+    Test para verificar que from_dataframe construye todos los registros en una sola operación
+    y que cada registro coincide con el creado por from_series.
+    """
+    df = pd.DataFrame([samples_sales_data_series] * 4).reset_index(drop=True)
+    df.loc[3, "SalesID"] = 999
+
+    ventas = SalesSummary.from_dataframe(df)
+    esperado = SalesSummary.from_series(df.iloc[0])
+
+    assert len(ventas) == 4
+    assert ventas[0].as_dict() == esperado.__dict__
+    assert ventas[-1].sale_id == 999
+    assert not hasattr(ventas[0], "__dict__")
+    assert [v.sale_id for v in ventas] == df["SalesID"].tolist()
+    assert ventas.column("total_price").sum() == df["TotalPrice"].sum()
+
+
+def test_customer_location_info_from_dataframe_missing_columns():
+    """
+    Test para verificar que from_dataframe lanza KeyError si faltan columnas necesarias.
+    """
+    df = pd.DataFrame({"CustomerID": [505], "FirstName": ["Luisa"]})
+
+    with pytest.raises(KeyError):
+        CustomerLocationInfo.from_dataframe(df)
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import create_engine, text
+from src.db.indexes import IndexAdvisor, IndexManager, declared_indexes
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Fixture que crea una base SQLite con products y 2000 ventas, sin índices secundarios.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexes.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE categories (CategoryID INT PRIMARY KEY, CategoryName TEXT)"))
+        conn.execute(
+            text("CREATE TABLE products (ProductID INT PRIMARY KEY, ProductName TEXT, CategoryID INT, Price REAL)")
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE sales (SalesID INT PRIMARY KEY, SalesPersonID INT, CustomerID INT, ProductID INT, "
+                "Quantity INT, Discount REAL, TotalPrice REAL, SalesDate TEXT, TransactionNumber TEXT, "
+                "SalesTimestamp DATETIME, SalesBucket DATETIME)"
+            )
+        )
+        conn.execute(text("INSERT INTO products VALUES (1, 'Flour', 1, 1.5), (2, 'Cookie', 1, 2.0)"))
+        conn.execute(
+            text("INSERT INTO sales (SalesID, SalesPersonID, CustomerID, ProductID, Quantity, TotalPrice) "
+                 "VALUES (:id, :emp, :cust, :prod, 1, 10.0)"),
+            [{"id": i, "emp": i % 5, "cust": i % 50, "prod": i % 20} for i in range(2000)],
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_indices_declarados_en_los_modelos():
+    """
+    Test para verificar que los índices se declaran junto a los modelos ORM.
+    """
+    declared = declared_indexes().set_index("name")
+    assert declared.loc["idx_sales_product_cover", "columns"] == ("ProductID", "Quantity", "TotalPrice")
+    assert declared.loc["idx_products_category", "table"] == "products"
+
+
+def test_apply_es_idempotente(engine):
+    """
+    Test para verificar que apply crea los índices faltantes una sola vez, reemplaza los que cambiaron
+    y solo elimina los no declarados si se pide.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX idx_sales_customer ON sales (CustomerID, SalesID)"))
+        conn.execute(text("CREATE INDEX idx_sales_viejo ON sales (Quantity)"))
+    manager = IndexManager(engine)
+
+    diff = manager.diff().set_index("name")
+    assert diff.loc["idx_sales_product_cover", "action"] == "create"
+    assert diff.loc["idx_sales_customer", "action"] == "replace"
+    assert diff.loc["idx_sales_viejo", "action"] == "undeclared"
+
+    assert manager.apply(dry_run=True)["seconds"].sum() == 0
+    applied = manager.apply().set_index("name")
+    assert applied.loc["idx_sales_customer", "ddl"][0].startswith("DROP INDEX")
+    assert set(manager.diff()["action"]) == {"ok", "undeclared"}
+
+    manager.apply(drop_undeclared=True)
+    existing = manager.existing().set_index("name")
+    assert "idx_sales_viejo" not in existing.index
+    assert existing.loc["idx_sales_customer", "columns"] == ("CustomerID",)
+
+
+def test_asesor_sugiere_indices(engine):
+    """
+    Test para verificar que el asesor sugiere un índice para el filtro por ProductID con su ahorro estimado
+    y reconoce los índices declarados que cubren la consulta.
+    """
+    queries = {
+        "por_producto": "select SalesID, TotalPrice from sales where ProductID = :p",
+        "resumen": "select s.ProductID, sum(s.Quantity), sum(s.TotalPrice) from sales s "
+                   "join products p on s.ProductID = p.ProductID group by s.ProductID",
+    }
+    advisor = IndexAdvisor(engine, queries=queries, params={"por_producto": {"p": 3}})
+    suggestions = advisor.suggest().set_index("query")
+
+    filtro = suggestions.loc["por_producto"]
+    assert filtro["columns"][0] == "ProductID"
+    assert filtro["kind"] == "filter"
+    assert filtro["rows_examined"] == 2000
+    assert filtro["estimated_rows"] == 100
+    assert filtro["rows_saved"] == 1900
+
+    resumen = suggestions.loc["resumen"]
+    assert resumen["table"] == "sales"
+    assert resumen["covered_by"] == "idx_sales_product_cover"
+
+    IndexManager(engine).apply()
+    assert "resumen" not in set(advisor.suggest()["query"])
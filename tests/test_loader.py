@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.db.loader import BulkLoader
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Fixture que crea una base SQLite con las tablas countries y cities.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE countries (CountryID INT PRIMARY KEY, CountryName TEXT, CountryCode TEXT)"))
+        conn.execute(text("CREATE TABLE cities (CityID INT PRIMARY KEY, CityName TEXT, Zipcode INT, CountryID INT)"))
+    return engine
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """
+    Fixture que escribe CSVs de ejemplo con el formato de la carpeta data.
+    """
+    folder = tmp_path / "data"
+    folder.mkdir()
+    pd.DataFrame(
+        {"CountryID": [1, 2], "CountryName": ["Armenia", "Canada"], "CountryCode": ["AN", ""]}
+    ).to_csv(folder / "countries.csv", index=False)
+    pd.DataFrame(
+        {
+            "CityID": range(1, 8),
+            "CityName": [f"Ciudad {i}" for i in range(1, 8)],
+            "Zipcode": [80563] * 7,
+            "CountryID": [1, 2, 1, 2, 1, 2, 1],
+        }
+    ).to_csv(folder / "cities.csv", index=False)
+    return folder
+
+
+def test_load_all_en_orden(engine, data_dir):
+    """
+    Test para verificar que se cargan todas las filas, en orden de dependencias,
+    con lotes y bloques más chicos que la tabla, y que se informan las filas por segundo.
+    """
+    loader = BulkLoader(engine=engine, data_dir=str(data_dir), batch_size=2, chunk_size=3)
+    stats = loader.load_all(tables=["cities", "countries"])
+
+    assert stats["table"].tolist() == ["countries", "cities"]
+    assert stats["rows"].tolist() == [2, 7]
+    assert (stats["rows_per_sec"] > 0).all()
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM cities")).scalar() == 7
+        code = conn.execute(text("SELECT CountryCode FROM countries WHERE CountryID = 2")).scalar()
+    assert code is None
+
+
+def test_load_all_truncate(engine, data_dir):
+    """
+    Test para verificar que truncate permite volver a cargar sin duplicar claves primarias.
+    """
+    loader = BulkLoader(engine=engine, data_dir=str(data_dir))
+    loader.load_all(tables=["countries"])
+    loader.load_all(tables=["countries"], truncate=True)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM countries")).scalar() == 2
+
+
+def test_load_elimina_y_recrea_indices(engine, data_dir):
+    """
+    Test para verificar que los índices idx_* de la tabla se eliminan durante la carga y se recrean al terminar,
+    también si la carga falla, y que los demás índices no se tocan.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX idx_cities_country ON cities (CountryID, CityName)"))
+        conn.execute(text("CREATE INDEX cities_zipcode ON cities (Zipcode)"))
+
+    def indices(chunk):
+        with engine.connect() as conn:
+            nombres = [row[1] for row in conn.execute(text("PRAGMA index_list(cities)"))]
+        vistos.append(sorted(n for n in nombres if not n.startswith("sqlite_")))
+        return chunk
+
+    vistos = []
+    loader = BulkLoader(engine=engine, data_dir=str(data_dir), chunk_size=3, transforms={"cities": indices})
+    loader.load_table("cities")
+
+    assert vistos[0] == ["cities_zipcode"]
+    with engine.connect() as conn:
+        columnas = [r[2] for r in conn.execute(text("PRAGMA index_info(idx_cities_country)"))]
+    assert columnas == ["CountryID", "CityName"]
+
+    def falla(chunk):
+        raise ValueError("bloque inválido")
+
+    with pytest.raises(ValueError):
+        BulkLoader(engine=engine, data_dir=str(data_dir), transforms={"cities": falla}).load_table("cities")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_cities_country'")).scalar() == 1
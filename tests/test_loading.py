@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.db.database import Base
+from src.db.loading import LazyLoadDetector, load_options, query_with_profile
+from src.models import Category, City, Country, Customer, Employee, Product, Sale
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Fixture que crea las tablas de los modelos en SQLite con 20 clientes, 5 ciudades y 30 ventas,
+    y cuenta las sentencias enviadas a la base en engine.statements.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'orm.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add(Country(CountryID=1, CountryName="Argentina", CountryCode="AR"))
+        session.add_all(City(CityID=i, CityName=f"Ciudad {i}", CountryID=1) for i in range(5))
+        session.add(Category(CategoryID=1, CategoryName="Dairy"))
+        session.add_all(Product(ProductID=i, ProductName=f"P{i}", CategoryID=1) for i in range(3))
+        session.add(Employee(EmployeeID=1, FirstName="Ana", LastName="Gómez", CityID=0))
+        session.add_all(
+            Customer(CustomerID=i, FirstName="Cliente", LastName=str(i), CityID=i % 5) for i in range(20)
+        )
+        session.add_all(
+            Sale(SalesID=i, SalesPersonID=1, CustomerID=i % 20, ProductID=i % 3, Quantity=1) for i in range(30)
+        )
+        session.commit()
+
+    engine.statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*args):
+        engine.statements += 1
+
+    yield Session
+    engine.dispose()
+
+
+def test_perfil_evita_n_mas_1(session_factory):
+    """
+    Test para verificar que el perfil sale_with_dimensions carga las dimensiones de todas las ventas
+    en una cantidad fija de consultas y que recorrerlas no dispara cargas perezosas.
+    """
+    engine = session_factory.kw["bind"]
+    detector = LazyLoadDetector(session_factory, threshold=3)
+    with session_factory() as session:
+        ventas = query_with_profile(session, "sale_with_dimensions").all()
+        nombres = [(v.product.category.CategoryName, v.customer.city.country.CountryName, v.employee.FirstName)
+                   for v in ventas]
+
+    assert len(nombres) == 30
+    assert engine.statements == 1
+    assert detector.report().empty
+
+
+def test_detector_advierte_n_mas_1(session_factory):
+    """
+    Test para verificar que el detector cuenta las cargas perezosas por relación y marca las sesiones
+    que superan el umbral, y que con load_options la misma navegación no genera cargas perezosas.
+    """
+    detector = LazyLoadDetector(session_factory, threshold=3)
+    with session_factory() as session:
+        [c.city.CityName for c in session.query(Customer).all()]
+
+    report = detector.report().set_index("relationship")
+    assert report.loc["Customer.city", "lazy_loads"] == 5
+    assert report.loc["Customer.city", "flagged_sessions"] == 1
+
+    detector.reset()
+    with session_factory() as session:
+        categoria = session.query(Category).options(*load_options(Category, "products")).one()
+        assert len(categoria.products) == 3
+    assert detector.report().empty
+
+    detector.detach()
+    with session_factory() as session:
+        [c.city.CityName for c in session.query(Customer).all()]
+    assert detector.report().empty
+
+
+def test_load_options_relacion_invalida():
+    """
+    Test para verificar que se rechazan rutas y estrategias desconocidas.
+    """
+    with pytest.raises(ValueError):
+        load_options(Customer, "city.planeta")
+    with pytest.raises(ValueError):
+        load_options(Customer, "city", strategy="subquery")
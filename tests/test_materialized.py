@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.db.materialized import MaterializedSummaries
+
+VIEW_SQL = """
+select
+    p.ProductID,
+    p.ProductName,
+    c.CategoryName,
+    ROUND(AVG(s.TotalPrice / NULLIF(s.Quantity, 0)), 2) AS PrecioUnitarioPromedio,
+    SUM(s.Quantity) AS TotalUnidadesVendidas,
+    SUM(s.TotalPrice) AS TotalFacturado,
+    ROUND(SUM(s.TotalPrice) / NULLIF(SUM(s.Quantity), 0), 2) AS TicketPromedio
+from sales s
+join products p ON s.ProductID = p.ProductID
+join categories c ON p.CategoryID = c.CategoryID
+group by p.ProductID, p.ProductName, c.CategoryName
+"""
+
+
+def _insert_sales(engine, rows):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO sales (SalesID, SalesPersonID, ProductID, Quantity, TotalPrice) "
+                "VALUES (:id, :emp, :prod, :qty, :price)"
+            ),
+            [dict(zip(["id", "emp", "prod", "qty", "price"], row)) for row in rows],
+        )
+
+
+def _read(engine, sql):
+    with engine.connect() as conn:
+        result = conn.execute(text(sql))
+        df = pd.DataFrame(result.fetchall(), columns=result.keys())
+    return df.sort_values("ProductID").reset_index(drop=True).astype(float, errors="ignore")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Fixture que crea una base SQLite con sales, products y categories.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'mv.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE categories (CategoryID INT PRIMARY KEY, CategoryName TEXT)"))
+        conn.execute(text("CREATE TABLE products (ProductID INT PRIMARY KEY, ProductName TEXT, CategoryID INT)"))
+        conn.execute(
+            text(
+                "CREATE TABLE sales (SalesID INT PRIMARY KEY, SalesPersonID INT, ProductID INT, "
+                "Quantity INT, TotalPrice REAL)"
+            )
+        )
+        conn.execute(text("INSERT INTO categories VALUES (1, 'Confections'), (2, 'Shell fish')"))
+        conn.execute(text("INSERT INTO products VALUES (10, 'Flour', 1), (11, 'Cookie', 1), (20, 'Shrimp', 2)"))
+    _insert_sales(engine, [(1, 1, 10, 2, 20.0), (2, 2, 11, 1, 5.0), (3, 1, 20, 4, 100.0)])
+    return engine
+
+
+def test_refresh_incremental_equivale_a_la_vista(engine):
+    """
+    Test para verificar que el resumen materializado, refrescado en dos pasos,
+    devuelve lo mismo que la vista calculada sobre toda la tabla sales.
+    """
+    mv = MaterializedSummaries(engine=engine).create()
+    mv.refresh_all()
+
+    _insert_sales(engine, [(4, 2, 10, 3, 45.0), (5, 1, 20, 0, 7.0)])
+    assert not mv.is_fresh("ventas_producto")
+    assert mv.refresh("ventas_producto") == 2
+    assert mv.watermark("ventas_producto") == 5
+    assert mv.refresh("ventas_producto") == 0
+
+    served = _read(engine, mv.serving_query("vw_resumen_ventas_producto"))
+    expected = _read(engine, VIEW_SQL)
+    pd.testing.assert_frame_equal(served, expected, check_dtype=False)
+
+
+def test_serving_query_desactualizado(engine):
+    """
+    Test para verificar que no se sirve un resumen desactualizado salvo con auto_refresh.
+    """
+    mv = MaterializedSummaries(engine=engine).create()
+    assert mv.serving_query("vw_resumen_ventas_producto") is None
+    assert mv.serving_query("otra_vista") is None
+
+    mv.auto_refresh = True
+    assert mv.serving_query("vw_resumen_ventas_producto") is not None
+    assert mv.is_fresh("ventas_producto")
+
+
+def test_top_products_y_porcentajes(engine):
+    """
+    Test para verificar las consultas de producto más vendido y porcentaje por categoría
+    calculadas desde los resúmenes.
+    """
+    mv = MaterializedSummaries(engine=engine).create()
+    mv.refresh_all()
+
+    top = mv.top_products_by_category()
+    assert top["ProductName"].tolist() == ["Flour", "Shrimp"]
+
+    share = mv.category_share(category_id=1)
+    assert share["ProductName"].tolist() == ["Flour", "Cookie"]
+    assert share["PorcentajeEnCategoria"].tolist() == [80.0, 20.0]
+    assert share["GranTotal"].iloc[0] == 125.0
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.design_patterns.pareto import SHARE_COLUMNS, ParetoIndex, cumulative_share
+
+
+@pytest.fixture
+def ventas():
+    """
+    Fixture con ventas de 2 categorías: en la categoría 1 los productos facturan 50, 30, 15 y 5,
+    en la categoría 2 facturan 60 y 40.
+    """
+    return pd.DataFrame(
+        {
+            "ProductID": [10, 11, 12, 13, 10, 20, 21, 20],
+            "ProductName": ["p10", "p11", "p12", "p13", "p10", "p20", "p21", "p20"],
+            "CategoryID": [1, 1, 1, 1, 1, 2, 2, 2],
+            "CategoryName": ["Dairy", "Dairy", "Dairy", "Dairy", "Dairy", "Beverages", "Beverages", "Beverages"],
+            "TotalPrice": [20.0, 30.0, 15.0, 5.0, 30.0, 25.0, 40.0, 35.0],
+        }
+    )
+
+
+def test_cumulative_share_por_grupo():
+    """
+    Test para verificar que cumulative_share ordena cada grupo de mayor a menor y acumula su participación.
+    """
+    order, starts, cumulative = cumulative_share(["b", "a", "b", "a", "a"], [1, 2, 3, 6, 0])
+
+    assert order.tolist() == [3, 1, 4, 2, 0]
+    assert starts.tolist() == [0, 3]
+    np.testing.assert_allclose(cumulative, [0.75, 1, 1, 0.75, 1])
+
+
+def test_share_equivale_a_porcentaje_categoria(ventas):
+    """
+    Test para verificar que share reproduce los porcentajes de la consulta "porcentaje_categoria"
+    y asigna el porcentaje acumulado y la clase ABC.
+    """
+    resultado = ParetoIndex().update(ventas).share()
+
+    assert resultado.columns.tolist() == SHARE_COLUMNS
+    assert resultado["CategoryName"].tolist() == ["Beverages"] * 2 + ["Dairy"] * 4
+    assert resultado["ProductName"].tolist() == ["p20", "p21", "p10", "p11", "p12", "p13"]
+    assert resultado["PorcentajeEnCategoria"].tolist() == [60, 40, 50, 30, 15, 5]
+    assert resultado["PorcentajeEnTotal"].tolist() == [30, 20, 25, 15, 7.5, 2.5]
+    assert resultado["PorcentajeAcumulado"].tolist() == [60, 100, 50, 80, 95, 100]
+    assert resultado["ClaseABC"].tolist() == ["A", "A", "A", "A", "B", "C"]
+    assert resultado["GranTotal"].unique().tolist() == [200]
+
+
+def test_products_for_share_y_actualizacion_incremental(ventas, tmp_path):
+    """
+    Test para verificar la búsqueda de los productos que forman una participación, que las ventas nuevas
+    solo recalculan su categoría y que el índice se guarda, se carga y se combina.
+    """
+    index = ParetoIndex().update(ventas.iloc[:5]).update(ventas.iloc[5:])
+
+    assert index.products_for_share(1, 0.8)["ProductID"].tolist() == [10, 11]
+    assert index.count_for_share(1, 0.81) == 3
+    assert index.count_for_share(1, 1.0) == 4
+    assert index.products_for_share(2, 0.5)["ProductName"].tolist() == ["p20"]
+
+    nuevas = pd.DataFrame(
+        {"ProductID": [13], "ProductName": ["p13"], "CategoryID": [1], "CategoryName": ["Dairy"], "TotalPrice": [100.0]}
+    )
+    index.update(nuevas)
+    assert index.dirty == {1}
+    assert index.count_for_share(1, 0.5) == 1
+    assert index.share(1)["ProductID"].tolist() == [13, 10, 11, 12]
+    assert index.share(2)["PorcentajeEnTotal"].tolist() == [20, 13.33]
+
+    index.save(tmp_path / "pareto.npz")
+    cargado = ParetoIndex.load(tmp_path / "pareto.npz")
+    pd.testing.assert_frame_equal(cargado.share(), index.share())
+
+    combinado = ParetoIndex().update(ventas).merge(ParetoIndex().update(nuevas))
+    pd.testing.assert_frame_equal(combinado.share(), index.share())
+
+    with pytest.raises(ValueError):
+        index.products_for_share(3)
+    with pytest.raises(ValueError):
+        index.count_for_share(1, 0)
+    with pytest.raises(ValueError):
+        ParetoIndex(thresholds=(0.9, 0.8))
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.db.pool_metrics import InstrumentedQueuePool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Fixture que crea un engine SQLite con un pool instrumentado de 1 conexión y 1 de overflow.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_metricas_de_checkout_y_overflow(engine):
+    """
+    Test para verificar que el pool registra conexiones en uso, creadas y eventos de overflow.
+    """
+    conn1 = engine.connect()
+    conn2 = engine.connect()
+    status = engine.pool.snapshot()
+
+    assert status["checked_out"] == 2
+    assert status["connections_created"] == 2
+    assert status["overflow_events"] == 1
+    assert status["checkouts"] == 2
+
+    conn1.close()
+    conn2.close()
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+
+    status = engine.pool.snapshot()
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 3
+    assert status["connections_created"] == 2
+
+
+def test_metricas_de_timeout(engine):
+    """
+    Test para verificar que se registran los timeouts y el tiempo de espera por una conexión.
+    """
+    conn1 = engine.connect()
+    conn2 = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    status = engine.pool.snapshot()
+    assert status["timeouts"] == 1
+    assert status["wait_time_max"] >= 0.05
+
+    conn1.close()
+    conn2.close()
@@ -0,0 +1,108 @@
+import json
+import pytest
+from sqlalchemy import create_engine, text
+from src.db.database import DBConnection
+from src.db.profiler import QueryProfiler, fingerprint
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Fixture que crea una DBConnection (sin pasar por el Singleton) sobre una base SQLite con ventas.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'profiler.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE sales (SalesID INT PRIMARY KEY, ProductID INT, TotalPrice REAL)"))
+        conn.execute(text("INSERT INTO sales VALUES (1, 10, 20.0), (2, 11, 5.0), (3, 10, 100.0)"))
+    db = DBConnection.from_engine(engine)
+    yield db
+    db.disable_profiling()
+    engine.dispose()
+
+
+def test_fingerprint_reemplaza_literales():
+    """
+    Test para verificar que las consultas que solo difieren en sus valores comparten huella.
+    """
+    a = fingerprint("SELECT * FROM sales WHERE SalesID IN (1, 2, 3) AND Name = 'Ana'")
+    b = fingerprint("select * from sales\n WHERE SalesID IN (7, 8) AND Name = 'O''Neil';")
+    assert a == "SELECT * FROM sales WHERE SalesID IN (?+) AND Name = ?"
+    assert a.lower() == b.lower()
+    assert fingerprint("SELECT * FROM t1 WHERE id = :id") == "SELECT * FROM t1 WHERE id = :id"
+
+
+def test_registra_consultas_y_estadisticas(db):
+    """
+    Test para verificar que se registran duración, filas, bytes y construcción del DataFrame por huella.
+    """
+    profiler = db.enable_profiling(slow_threshold=None)
+    for product in (10, 11, 10):
+        db.execute_query(f"SELECT * FROM sales WHERE ProductID = {product}")
+    db.query_view("sales")
+
+    records = profiler.records()
+    assert list(records["kind"]) == ["execute_query"] * 3 + ["query_view"]
+    assert list(records["rows"]) == [2, 1, 2, 3]
+    assert (records["bytes"] > 0).all()
+    assert records["dataframe_seconds"].notna().all()
+    assert (records["statements"] == 1).all()
+
+    stats = profiler.stats().set_index("fingerprint")
+    row = stats.loc["SELECT * FROM sales WHERE ProductID = ?"]
+    assert row["count"] == 3
+    assert row["p50"] <= row["p95"] <= row["p99"] <= row["max"]
+    assert stats.loc["SELECT * FROM sales", "kind"] == "query_view"
+
+
+def test_consulta_lenta_captura_explain(db, tmp_path):
+    """
+    Test para verificar que las consultas que superan el umbral guardan su plan de ejecución
+    y que las estadísticas se pueden volcar a un archivo.
+    """
+    profiler = db.enable_profiling(slow_threshold=0.0)
+    db.execute_query("SELECT * FROM sales WHERE ProductID = :p", {"p": 10})
+    db.execute_ddl("CREATE INDEX idx_sales_product ON sales(ProductID)")
+
+    slow = profiler.slow_queries()
+    assert len(slow) == 2
+    assert slow["explain"].iloc[0] is not None and not slow["explain"].iloc[0].empty
+    assert slow["explain"].iloc[1] is None
+
+    path = tmp_path / "stats.json"
+    profiler.dump(str(path))
+    payload = json.loads(path.read_text())
+    assert {s["kind"] for s in payload["stats"]} == {"execute_query", "execute_ddl"}
+    assert payload["slow_queries"][0]["explain"]
+
+
+def test_errores_y_desactivacion(db):
+    """
+    Test para verificar que las consultas fallidas se registran con su error
+    y que al desactivar el perfilado no se registra nada más.
+    """
+    profiler = db.enable_profiling(slow_threshold=None)
+    with pytest.raises(RuntimeError):
+        db.execute_query("SELECT * FROM tabla_inexistente")
+    assert profiler.stats()["errors"].iloc[0] == 1
+
+    db.disable_profiling()
+    db.execute_query("SELECT 1")
+    assert len(profiler.records()) == 1
+
+
+def test_perfilador_sobre_engine(db):
+    """
+    Test para verificar que solo se miden las sentencias ejecutadas dentro de track.
+    """
+    profiler = QueryProfiler(db.engine, slow_threshold=None)
+    with db.engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with profiler.track("execute_query", "SELECT 2 ; SELECT 3"):
+            conn.execute(text("SELECT 2"))
+            conn.execute(text("SELECT 3"))
+    profiler.detach()
+
+    records = profiler.records()
+    assert len(records) == 1
+    assert records["statements"].iloc[0] == 2
+    assert records["execute_seconds"].iloc[0] > 0
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.design_patterns.sketches import (
+    HyperLogLogState,
+    MergeableSketch,
+    SampledAggregateState,
+    TDigestState,
+    accuracy_settings,
+)
+
+
+@pytest.fixture
+def ventas():
+    """
+    Fixture con 200000 ventas sintéticas de 4 vendedores, 3 categorías y unos 50000 clientes.
+    """
+    rng = np.random.default_rng(0)
+    n = 200_000
+    df = pd.DataFrame(
+        {
+            "EmployeeID": rng.integers(1, 5, n),
+            "CustomerID": rng.integers(0, 50_000, n),
+            "CategoryName": rng.choice(["Dairy", "Meat", "Snails"], n),
+            "TotalPrice": rng.lognormal(4, 1, n).round(2),
+        }
+    )
+    df["EmployeeName"] = "Vendedor " + df["EmployeeID"].astype(str)
+    return df
+
+
+def test_hyperloglog_estima_distintos_y_combina(ventas, tmp_path):
+    """
+    Test para verificar que HyperLogLog estima los clientes distintos por vendedor dentro de su error,
+    que combinar dos mitades equivale a procesar todo y que el estado se guarda y se carga.
+    """
+    state = HyperLogLogState(precision=12).update(ventas)
+    exact = ventas.groupby("EmployeeID")["CustomerID"].nunique()
+    error = (state.estimate() - exact).abs() / exact
+    assert (error < 4 * state.relative_error).all()
+
+    mitad = len(ventas) // 2
+    parcial = HyperLogLogState(precision=12).update(ventas.iloc[:mitad])
+    parcial.merge(HyperLogLogState(precision=12).update(ventas.iloc[mitad:]))
+    pd.testing.assert_series_equal(parcial.estimate().sort_index(), state.estimate().sort_index())
+
+    state.save(tmp_path / "hll.npz")
+    cargado = HyperLogLogState.load(tmp_path / "hll.npz")
+    pd.testing.assert_series_equal(cargado.estimate(), state.estimate())
+    assert cargado.names.set_index("EmployeeID")["EmployeeName"].loc[3] == "Vendedor 3"
+    with pytest.raises(ValueError):
+        state.merge(HyperLogLogState(precision=10))
+
+
+def test_tdigest_cuantiles(ventas, tmp_path):
+    """
+    Test para verificar que t-digest estima los cuantiles por categoría con error de rango pequeño,
+    también al combinar estados por bloques y después de guardarlo y cargarlo.
+    """
+    state = TDigestState(compression=200)
+    for start in range(0, len(ventas), 50_000):
+        state.merge(TDigestState(compression=200).update(ventas.iloc[start : start + 50_000]))
+    estimados = state.quantiles([0.01, 0.5, 0.9, 0.99])
+
+    for categoria, precios in ventas.groupby("CategoryName")["TotalPrice"]:
+        precios = np.sort(precios.to_numpy())
+        for q in estimados.columns:
+            rango = np.searchsorted(precios, estimados.loc[categoria, q]) / len(precios)
+            assert abs(rango - q) < 0.01
+    assert state.counts().sum() == len(ventas)
+
+    state.save(tmp_path / "tdigest.npz")
+    pd.testing.assert_frame_equal(TDigestState.load(tmp_path / "tdigest.npz").quantiles([0.5]), state.quantiles([0.5]))
+
+
+def test_muestra_con_intervalo_de_confianza(ventas, tmp_path):
+    """
+    Test para verificar que los totales estimados por muestreo quedan dentro de su intervalo de confianza,
+    que con fraction=1 el resultado es exacto y que solo se combinan muestras de la misma fracción.
+    """
+    exact = ventas.groupby("EmployeeID")["TotalPrice"].sum()
+    state = SampledAggregateState(["TotalPrice"], fraction=0.1, seed=1).update(ventas)
+    error = state.total_error("TotalPrice", 0.99)
+    assert ((state.estimate_total("TotalPrice") - exact).abs() <= error).all()
+    assert (error / exact < 0.1).all()
+
+    completo = SampledAggregateState(["TotalPrice"], fraction=1).update(ventas)
+    pd.testing.assert_series_equal(completo.estimate_total("TotalPrice"), exact, check_dtype=False, check_names=False)
+    assert (completo.total_error("TotalPrice") == 0).all()
+
+    state.save(tmp_path / "muestra.npz")
+    cargado = SampledAggregateState.load(tmp_path / "muestra.npz")
+    pd.testing.assert_series_equal(cargado.estimate_total("TotalPrice"), state.estimate_total("TotalPrice"), check_dtype=False)
+    assert cargado.rows_seen == len(ventas)
+    with pytest.raises(ValueError):
+        state.merge(completo)
+
+
+def test_accuracy_settings():
+    """
+    Test para verificar la traducción del nivel de precisión a los parámetros de cada estimación.
+    """
+    assert accuracy_settings(1) == {"fraction": 1, "precision": 16, "compression": 500}
+    assert accuracy_settings(0.25)["precision"] == 7
+    with pytest.raises(ValueError):
+        accuracy_settings(0)
+
+
+def test_mergeable_sketch_es_abstracta():
+    """
+    Test para verificar que un estado que no implementa _dump y _restore falla al crearse, no al guardarse.
+    """
+
+    class Incompleto(MergeableSketch):
+        def _dump(self):
+            return {}, {}
+
+    with pytest.raises(TypeError):
+        Incompleto()
+    with pytest.raises(TypeError):
+        MergeableSketch()
@@ -1,9 +1,21 @@
+import os
+import numpy as np
 import pandas as pd
 import pytest
 from src.design_patterns.strategy import (
     TotalSalesByEmployee,
     ProductSalesByEmployee,
     AverageSalesByEmployee,
+    TopNEmployeesBySales,
+    BottomN,
+    TopNProductsPerCategory,
+    RollingRevenueByEmployee,
+    SalesPerHour,
+    SalesByCustomer,
+    SampledSalesByEmployee,
+    DistinctCustomersByEmployee,
+    PriceQuantilesByCategory,
+    ParetoABCByCategory,
 )
 
 @pytest.fixture
@@ -123,4 +135,225 @@ def test_average_sales_by_employee(sample_sales_data):
 
     assert len(report) == 3, (
         "El informe de ventas promedio debe contener 3 filas, una por cada vendedor."
-    )
\ No newline at end of file
+    )
+
+
+def test_average_sales_by_employee_conserva_decimal(sample_sales_data):
+    """
+    Test para verificar que con TotalPrice Decimal (DECIMAL de MySQL vía execute_query) el promedio
+    conserva el tipo Decimal redondeado a 2 decimales, y que con TotalPrice numérico es float64.
+    """
+    from decimal import Decimal
+
+    data = sample_sales_data.assign(
+        TotalPrice=[Decimal(str(value)) + Decimal("0.005") for value in sample_sales_data["TotalPrice"]]
+    )
+    report = AverageSalesByEmployee().generate_report(data, key="EmployeeName")
+
+    promedio = report["Promedio de ventas"]
+    assert promedio.dtype == object
+    assert all(isinstance(value, Decimal) and value.as_tuple().exponent == -2 for value in promedio)
+
+    report = AverageSalesByEmployee().generate_report(sample_sales_data, key="EmployeeName")
+    assert report["Promedio de ventas"].dtype == np.float64
+
+
+@pytest.mark.parametrize(
+    "strategy, key",
+    [
+        (TotalSalesByEmployee(), "TotalPrice"),
+        (AverageSalesByEmployee(), "TotalPrice"),
+        (ProductSalesByEmployee(), "ProductID"),
+    ],
+)
+def test_report_from_chunks_matches_dataframe(sample_sales_data, strategy, key):
+    """
+    Test para verificar que generar un informe a partir de un iterador de bloques
+    produce el mismo resultado que a partir del DataFrame completo.
+    """
+    chunks = (sample_sales_data.iloc[i : i + 2] for i in range(0, len(sample_sales_data), 2))
+
+    expected = strategy.generate_report(sample_sales_data, key=key, ascending=False)
+    report = strategy.generate_report(chunks, key=key, ascending=False)
+
+    pd.testing.assert_frame_equal(
+        report.reset_index(drop=True), expected.reset_index(drop=True)
+    )
+
+
+def test_top_n_employees_by_sales(sample_sales_data):
+    """
+    Test para verificar que TopNEmployeesBySales y BottomN devuelven los n vendedores
+    en orden de ranking, también a partir de bloques.
+    """
+    top = TopNEmployeesBySales(n=2).generate_report(sample_sales_data)
+    assert list(top["IDVendedor"]) == [2, 3]
+    assert list(top["Top 2 TotalVentas"]) == [450, 300]
+
+    chunks = iter([sample_sales_data.iloc[:2], sample_sales_data.iloc[2:]])
+    pd.testing.assert_frame_equal(TopNEmployeesBySales(n=2).generate_report(chunks), top)
+
+    bottom = BottomN(n=1).generate_report(sample_sales_data)
+    assert list(bottom.columns) == ["IDVendedor", "Nombre Apellido Vendedor", "Bottom 1 TotalVentas"]
+    assert bottom.iloc[0]["Nombre Apellido Vendedor"] == "Alice Smith"
+
+
+def test_top_n_products_per_category():
+    """
+    Test para verificar que TopNProductsPerCategory coincide con el dense_rank() por categoría,
+    conserva los empates con el último puesto y da el mismo resultado por bloques.
+    """
+    df = pd.DataFrame(
+        {
+            "CategoryName": ["A", "A", "A", "B", "B", "A", "B"],
+            "ProductName": ["p1", "p2", "p3", "q1", "q2", "p1", "q3"],
+            "Quantity": [5, 7, 9, 4, 4, 3, 1],
+        }
+    )
+    report = TopNProductsPerCategory(n=1).generate_report(df)
+
+    assert list(report.columns) == ["Categoría", "Producto", "Total Vendido", "Ranking"]
+    assert report.values.tolist() == [["A", "p3", 9, 1], ["B", "q1", 4, 1], ["B", "q2", 4, 1]]
+
+    chunks = iter([df.iloc[:3], df.iloc[3:]])
+    pd.testing.assert_frame_equal(TopNProductsPerCategory(n=1).generate_report(chunks), report)
+
+    with pytest.raises(ValueError):
+        TopNProductsPerCategory(n=0)
+
+
+@pytest.fixture
+def timed_sales_data():
+    """
+    Fixture con ventas que ya tienen marca de tiempo normalizada ("SalesTimestamp").
+    """
+    return pd.DataFrame(
+        {
+            "EmployeeID": [1, 2, 1, 1, 2],
+            "EmployeeName": ["Alice Smith", "Bob Johnson", "Alice Smith", "Alice Smith", "Bob Johnson"],
+            "TotalPrice": [100, 200, 150, 300, 250],
+            "SalesTimestamp": pd.to_datetime(
+                ["2024-01-01 10:05", "2024-01-01 10:30", "2024-01-02 12:00", "2024-01-04 13:10", "2024-01-05 01:00"]
+            ),
+        }
+    )
+
+
+def test_rolling_revenue_by_employee(timed_sales_data):
+    """
+    Test para verificar la ventana móvil por vendedor y que emitir los buckets a medida que se cierran
+    da las mismas filas que el informe completo.
+    """
+    strategy = RollingRevenueByEmployee(window=2, bucket="day")
+    report = strategy.generate_report(timed_sales_data)
+
+    alice = report[report["IDVendedor"] == 1].set_index("Período")
+    assert alice.loc["2024-01-02", "Ventas del período"] == 150
+    assert alice.loc["2024-01-02", "Ventas últimos 2 períodos"] == 250
+    assert alice.loc["2024-01-03", "Ventas últimos 2 períodos"] == 150
+
+    state = strategy.create_state()
+    emitted = []
+    for i in range(len(timed_sales_data)):
+        strategy.update_state(state, timed_sales_data.iloc[[i]])
+        emitted.append(strategy.emit_closed(state))
+    assert emitted[0].empty
+    incremental = pd.concat([part for part in emitted if not part.empty], ignore_index=True)
+
+    closed = report[report["Período"] < pd.Timestamp("2024-01-05")].reset_index(drop=True)
+    pd.testing.assert_frame_equal(incremental, closed, check_dtype=False)
+
+
+def test_sales_per_hour(timed_sales_data):
+    """
+    Test para verificar que SalesPerHour cuenta y suma las ventas por bucket, incluyendo los buckets vacíos.
+    """
+    report = SalesPerHour(bucket="day").generate_report(timed_sales_data)
+
+    assert report["Cantidad de ventas"].tolist() == [2, 1, 0, 1, 1]
+    assert report["TotalVentas"].tolist() == [300, 150, 0, 300, 250]
+    assert len(SalesPerHour().generate_report(timed_sales_data)) == 88
+
+
+def test_sales_by_customer_con_volcado_a_disco(tmp_path):
+    """
+    Test para verificar que el informe por cliente con particiones en disco coincide con el groupby de pandas,
+    tanto por bloques de partición como ordenado por total con la mezcla de corridas.
+    """
+    rng = np.random.default_rng(0)
+    ventas = pd.DataFrame({"CustomerID": rng.integers(0, 3000, 20000), "TotalPrice": rng.integers(1, 500, 20000)})
+    ventas["CustomerName"] = "Cliente " + ventas["CustomerID"].astype(str)
+    chunks = [ventas.iloc[i : i + 2500] for i in range(0, len(ventas), 2500)]
+    strategy = SalesByCustomer(partitions=6, memory_rows=2000, spill_dir=str(tmp_path))
+
+    grouped = ventas.groupby("CustomerID")["TotalPrice"]
+    bloques = list(strategy.iter_report(iter(chunks)))
+    assert len(bloques) == 6
+    report = pd.concat(bloques).sort_values("IDCliente").reset_index(drop=True)
+    assert report["IDCliente"].tolist() == grouped.sum().index.tolist()
+    assert report["TotalVentas"].tolist() == grouped.sum().tolist()
+    assert report["Cantidad de ventas"].tolist() == grouped.count().tolist()
+    assert report["Promedio de ventas"].tolist() == grouped.mean().round(2).tolist()
+    assert report["Nombre Cliente"].iloc[7] == f"Cliente {report['IDCliente'].iloc[7]}"
+
+    ordenado = strategy.generate_report(iter(chunks), key="TotalPrice", ascending=False)
+    assert ordenado["TotalVentas"].is_monotonic_decreasing
+    assert ordenado["TotalVentas"].tolist() == grouped.sum().sort_values(ascending=False).tolist()
+    assert os.listdir(tmp_path) == []
+
+
+def test_estrategias_aproximadas(sample_sales_data):
+    """
+    Test para verificar las columnas de las estrategias aproximadas y que su estado puede actualizarse
+    de forma incremental.
+    """
+    data = sample_sales_data.assign(
+        CustomerID=[1, 2, 1, 3, 3], CategoryName=["A", "B", "A", "A", "B"]
+    )
+
+    muestra = SampledSalesByEmployee(fraction=1).generate_report(data)
+    assert muestra.columns.tolist() == SampledSalesByEmployee.labels
+    assert muestra["TotalVentas estimado"].tolist() == [250, 450, 300]
+
+    distintos = DistinctCustomersByEmployee().generate_report(data)
+    assert distintos["Clientes distintos (aprox.)"].tolist() == [1, 2, 1]
+
+    strategy = PriceQuantilesByCategory([0.5, 1.0])
+    state = strategy.create_state()
+    strategy.update_state(state, data.iloc[:3])
+    strategy.update_state(state, data.iloc[3:])
+    cuantiles = strategy.finalize(state)
+    assert cuantiles.columns.tolist() == ["Categoría", "Cantidad de ventas", "p50", "p100"]
+    assert cuantiles["Cantidad de ventas"].tolist() == [3, 2]
+    assert cuantiles["p100"].tolist() == [300, 250]
+
+    with pytest.raises(ValueError):
+        SampledSalesByEmployee().set_accuracy(0)
+
+
+def test_pareto_abc_by_category():
+    """
+    Test para verificar que ParetoABCByCategory calcula la participación acumulada y la clase ABC
+    por categoría y da el mismo resultado por bloques.
+    """
+    df = pd.DataFrame(
+        {
+            "CategoryID": [1, 1, 1, 2],
+            "CategoryName": ["A", "A", "A", "B"],
+            "ProductID": [1, 2, 3, 4],
+            "ProductName": ["p1", "p2", "p3", "q1"],
+            "TotalPrice": [10.0, 85.0, 5.0, 100.0],
+        }
+    )
+    report = ParetoABCByCategory(thresholds=(0.8, 0.9)).generate_report(df)
+
+    assert report.columns.tolist() == ParetoABCByCategory.labels
+    assert report["Producto"].tolist() == ["p2", "p1", "p3", "q1"]
+    assert report["Porcentaje Acumulado"].tolist() == [85, 95, 100, 100]
+    assert report["Clase ABC"].tolist() == ["A", "B", "C", "A"]
+
+    chunks = iter([df.iloc[:2], df.iloc[2:]])
+    pd.testing.assert_frame_equal(ParetoABCByCategory(thresholds=(0.8, 0.9)).generate_report(chunks), report)
+
+    with pytest.raises(ValueError):
+        ParetoABCByCategory(thresholds=(0, 0.5))
@@ -0,0 +1,136 @@
+from datetime import timedelta
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.db.loader import BulkLoader
+from src.db.timestamps import SalesTimestampPipeline, normalize_sales, parse_sales_dates
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Fixture que crea una base SQLite con la tabla sales original (SalesDate como TIME).
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'timestamps.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text("CREATE TABLE sales (SalesID INT PRIMARY KEY, SalesPersonID INT, TotalPrice REAL, SalesDate TIME)")
+        )
+        conn.execute(
+            text("INSERT INTO sales VALUES (1, 1, 10, '31:24.2'), (2, 1, 20, '2018-02-05 07:38:25'), (3, 2, 5, 'x')")
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_parse_sales_dates():
+    """
+    Test para verificar que se interpretan fechas completas, horas sin fecha (texto o timedelta)
+    y el formato truncado de data/sales.csv, y que sin base_date los valores sin fecha quedan como NaT.
+    """
+    values = ["2018-02-05 07:38:25.4", "31:24.2", "07:31:24.5", None, timedelta(hours=3), "sin fecha"]
+
+    parsed = parse_sales_dates(values, base_date="2018-02-05")
+    assert parsed.tolist()[:3] == [
+        pd.Timestamp("2018-02-05 07:38:25.4"),
+        pd.Timestamp("2018-02-05 00:31:24.2"),
+        pd.Timestamp("2018-02-05 07:31:24.5"),
+    ]
+    assert parsed[4] == pd.Timestamp("2018-02-05 03:00")
+    assert parsed[[3, 5]].isna().all()
+
+    assert parse_sales_dates(values).notna().tolist() == [True, False, False, False, False, False]
+
+
+def test_normalize_sales_buckets():
+    """
+    Test para verificar que normalize_sales agrega la marca de tiempo y el inicio de su bucket.
+    """
+    df = pd.DataFrame({"SalesDate": ["2024-01-03 10:45:00", "2024-01-07 23:10:00"]})
+
+    assert normalize_sales(df, bucket="hour")["SalesBucket"].tolist() == [
+        pd.Timestamp("2024-01-03 10:00"),
+        pd.Timestamp("2024-01-07 23:00"),
+    ]
+    assert normalize_sales(df, bucket="week")["SalesBucket"].nunique() == 1
+    with pytest.raises(ValueError):
+        normalize_sales(df, bucket="month")
+
+
+def test_pipeline_migra_y_completa(engine):
+    """
+    Test para verificar que el pipeline agrega las columnas DATETIME una sola vez y completa
+    las marcas de tiempo, informando las ventas que no se pudieron interpretar.
+    """
+    pipeline = SalesTimestampPipeline(engine=engine, base_date="2018-02-05", chunk_size=2)
+
+    assert len(pipeline.migrate()) == 2
+    assert pipeline.migrate() == []
+
+    stats = pipeline.backfill()
+    assert stats["rows"] == 3
+    assert stats["unparsed"] == 1
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT SalesID, SalesBucket FROM sales ORDER BY SalesID")).fetchall()
+    assert pd.Timestamp(rows[1][1]) == pd.Timestamp("2018-02-05 07:00")
+    assert rows[2][1] is None
+    assert pipeline.backfill()["rows"] == 1
+
+
+def test_loader_transforma_sales(engine, tmp_path):
+    """
+    Test para verificar que BulkLoader aplica la transformación de la tabla al cargar cada bloque.
+    """
+    SalesTimestampPipeline(engine=engine).migrate()
+    folder = tmp_path / "data"
+    folder.mkdir()
+    pd.DataFrame(
+        {"SalesID": [10, 11], "SalesPersonID": [1, 2], "TotalPrice": [1.0, 2.0], "SalesDate": ["54:42.5", "17:08.7"]}
+    ).to_csv(folder / "sales.csv", index=False)
+
+    loader = BulkLoader(
+        engine=engine,
+        data_dir=str(folder),
+        transforms={"sales": lambda chunk: normalize_sales(chunk, base_date="2018-01-01")},
+    )
+    loader.load_table("sales")
+
+    with engine.connect() as conn:
+        value = conn.execute(text("SELECT SalesTimestamp FROM sales WHERE SalesID = 10")).scalar()
+    assert pd.Timestamp(value) == pd.Timestamp("2018-01-01 00:54:42.5")
+
+
+def test_base_sin_migrar(tmp_path):
+    """
+    Test para verificar que, con la tabla sales anterior a SalesTimestamp/SalesBucket, las consultas
+    ORM sobre Sale funcionan, IndexManager.apply omite idx_sales_bucket y, tras migrate,
+    las columnas se leen al accederlas y el índice se crea.
+    """
+    from sqlalchemy.orm import Session
+    from src.db.indexes import IndexManager
+    from src.models.sale import Sale
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'anterior.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE sales (SalesID INT PRIMARY KEY, SalesPersonID INT, CustomerID INT, ProductID INT, "
+                "Quantity INT, Discount DECIMAL(10, 2), TotalPrice DECIMAL(10, 2), SalesDate TIME, "
+                "TransactionNumber VARCHAR(20))"
+            )
+        )
+        conn.execute(text("INSERT INTO sales (SalesID, TotalPrice, SalesDate) VALUES (1, 10, '07:31:24')"))
+
+    with Session(engine) as session:
+        assert [sale.SalesID for sale in session.query(Sale)] == [1]
+    actions = IndexManager(engine=engine).apply().set_index("name")["action"]
+    assert actions["idx_sales_bucket"] == "missing_column"
+
+    pipeline = SalesTimestampPipeline(engine=engine, base_date="2018-02-05")
+    pipeline.migrate()
+    pipeline.backfill()
+    with Session(engine) as session:
+        assert session.get(Sale, 1).SalesTimestamp is not None
+    assert IndexManager(engine=engine).apply().set_index("name")["action"]["idx_sales_bucket"] == "create"
+    engine.dispose()
@@ -0,0 +1,90 @@
+import sqlite3
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from src.db.database import Base, DBConnection
+from src.db.writer import BulkWriter
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Fixture que devuelve un DBConnection sobre una base SQLite con las tablas de los modelos.
+    """
+    db = DBConnection.from_engine(create_engine(f"sqlite:///{tmp_path / 'writer.db'}"))
+    Base.metadata.create_all(db.engine)
+    yield db
+    db.Session.remove()
+    db.engine.dispose()
+
+
+def _ventas(ids, price=10.0):
+    return pd.DataFrame(
+        {
+            "SalesID": list(ids),
+            "SalesPersonID": 1,
+            "CustomerID": 2,
+            "ProductID": 3,
+            "Quantity": 1,
+            "TotalPrice": price,
+            "Extra": "se ignora",
+        }
+    )
+
+
+def test_write_por_lotes_y_transacciones(db):
+    """
+    Test para verificar que las filas se escriben en lotes y transacciones del tamaño configurado,
+    a partir de un iterador de bloques, y que se informa el rendimiento.
+    """
+    writer = BulkWriter(db, batch_size=100, transaction_size=250)
+    stats = writer.write(iter([_ventas(range(0, 600)), _ventas(range(600, 1000))]))
+
+    assert stats["rows"] == 1000
+    assert stats["batches"] == 10
+    assert stats["transactions"] == 4
+    assert stats["rows_per_sec"] > 0
+    with db.engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM sales")).scalar() == 1000
+
+
+def test_upsert_por_sales_id(db):
+    """
+    Test para verificar que upsert actualiza las ventas existentes e inserta las nuevas,
+    y que sin upsert una clave duplicada es un error.
+    """
+    writer = BulkWriter(db, batch_size=50)
+    writer.write(_ventas(range(100)))
+    writer.write(_ventas(range(50, 150), price=99.0), upsert=True)
+
+    with db.engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM sales")).scalar() == 150
+        assert conn.execute(text("SELECT TotalPrice FROM sales WHERE SalesID = 60")).scalar() == 99.0
+        assert conn.execute(text("SELECT TotalPrice FROM sales WHERE SalesID = 10")).scalar() == 10.0
+
+    with pytest.raises(RuntimeError):
+        writer.write([{"SalesID": 1, "Quantity": 5}])
+
+
+def test_reintenta_ante_deadlock(db):
+    """
+    Test para verificar que una transacción que falla por un bloqueo transitorio se reintenta completa
+    sin duplicar filas, y que se abandona después de max_retries.
+    """
+    failures = {"left": 2}
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def lock(conn, cursor, statement, *args):
+        if statement.startswith("INSERT") and failures["left"]:
+            failures["left"] -= 1
+            raise OperationalError(statement, {}, sqlite3.OperationalError("database is locked"))
+
+    stats = BulkWriter(db, batch_size=10, max_retries=3, retry_backoff=0).write(_ventas(range(30)))
+    assert stats["retries"] == 2
+    with db.engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM sales")).scalar() == 30
+
+    failures["left"] = 5
+    with pytest.raises(RuntimeError):
+        BulkWriter(db, max_retries=1, retry_backoff=0).write(_ventas(range(30, 40)))